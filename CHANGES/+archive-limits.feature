@@ -0,0 +1 @@
+Add the MAX_ARCHIVE_MEMBERS, MAX_ARCHIVE_SIZE, MAX_ARCHIVE_FILE_SIZE and MAX_ARCHIVE_COMPRESSION_RATIO config options to abort extraction of oversized artifacts.
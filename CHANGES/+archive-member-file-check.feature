@@ -0,0 +1 @@
+Check for files missing from FILES.json against the archive member names instead of walking the extracted collection.
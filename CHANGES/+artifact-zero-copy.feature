@@ -0,0 +1 @@
+Link the artifact into the ansible-test image build context, and copy uploads for runners in the kernel when possible.
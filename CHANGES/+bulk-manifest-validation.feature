@@ -0,0 +1 @@
+Add manifest_validation.validate_artifacts() to validate the MANIFEST.json and FILES.json of many collection artifacts in a process pool, without extracting them.
@@ -0,0 +1 @@
+Add `ANSIBLE_DOC_CHUNK_SIZE` and `ANSIBLE_DOC_WORKERS` config options to run `ansible-doc` on chunks of plugins in parallel, splitting chunks it fails on so only the failing plugins lose their docs.
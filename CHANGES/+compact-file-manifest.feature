@@ -0,0 +1 @@
+Keep `FILES.json` entries in a compact `CollectionArtifactFileList`, creating `CollectionArtifactFile` objects only when entries are accessed.
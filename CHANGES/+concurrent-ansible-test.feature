@@ -0,0 +1 @@
+Add the `CONCURRENT_ANSIBLE_TEST` option to start `ansible-test` as soon as the artifact files are verified, running alongside the rest of collection loading.
@@ -0,0 +1 @@
+Reuse the doc strings and rendered html of files unchanged since the `previous_result` import, when it includes a `file_manifest`. Doc strings are reused only when `meta/runtime.yml` is unchanged and the previous import used the same ansible-core version, now recorded as `ansible_core_version` in the import result.
@@ -0,0 +1 @@
+Transform ansible-doc options and return tables without deep copying each row, reusing the parsed ansible-doc output.
@@ -0,0 +1 @@
+Add `import_collection_dir()` and a `--collection-dir` command line option, to import a collection dir in place without building or extracting an artifact.
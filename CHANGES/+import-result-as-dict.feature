@@ -0,0 +1 @@
+Add an `as_dict` parameter to `import_collection` and `import_collection_dir` to return the `ImportResult` rather than a dict copy of it, used by `galaxy_importer.main` to write the result without copying it.
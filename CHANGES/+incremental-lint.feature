@@ -0,0 +1 @@
+Add a `previous_result` parameter to `import_collection`, used to run `ansible-lint` only on roles and files changed since the previous version, reusing its findings for the rest.
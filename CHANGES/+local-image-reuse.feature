@@ -0,0 +1 @@
+Add the LOCAL_IMAGE_REUSE config option to build the local ansible-test image once and mount the artifact at runtime.
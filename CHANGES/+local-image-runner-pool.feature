@@ -0,0 +1 @@
+Add LocalImageTestRunnerPool and the LOCAL_IMAGE_MAX_CONTAINERS, LOCAL_IMAGE_CPUS and LOCAL_IMAGE_MEMORY config options to run ansible-test containers in parallel.
@@ -0,0 +1 @@
+Add the MEMORY_TMP_ROOT_DIR and MEMORY_TMP_MAX_SIZE config options to extract small artifacts to a memory backed filesystem.
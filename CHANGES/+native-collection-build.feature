@@ -0,0 +1 @@
+Add a `native_collection_build` option to build collections imported from a `git_clone_path` in-process, computing `FILES.json` checksums while writing the artifact and linking the source files into the import dir instead of extracting them.
@@ -0,0 +1 @@
+Reuse one connection to the OpenShift API for each ansible-test job, retry transient API errors with jittered backoff, and time out each job step separately.
@@ -0,0 +1 @@
+Add the PIPELINED_EXTRACTION config option to extract artifacts with decompression, tar parsing and file writes on separate threads.
@@ -0,0 +1 @@
+Add the `RESULT_CACHE_DIR` option to cache import results by artifact sha256, importer setup and config, so re-imports of an identical artifact return the cached result.
@@ -0,0 +1 @@
+Serialize the importer result once, streaming it to `importer_result.json` and to stdout with `--print-result`, and add `--compact-result` and `--compress-result` (gzip or zstd) options to `galaxy_importer.main`.
@@ -0,0 +1 @@
+Add the SELECTIVE_EXTRACTION config option to only checksum files under tests/integration/ and tests/unit/ instead of writing them to disk.
@@ -0,0 +1 @@
+Check SPDX license IDs against a frozenset of valid IDs generated by `scripts/update_spdx.py`, instead of parsing `spdx_licenses.json` in each process.
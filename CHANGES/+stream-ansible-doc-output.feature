@@ -0,0 +1 @@
+Parse ansible-doc output one plugin at a time as it is read, transforming each plugin's doc strings as it arrives instead of loading the whole output first.
@@ -0,0 +1 @@
+Import a collection artifact streamed from `file_url` when no `file` is given, resuming interrupted downloads with Range requests and computing the artifact sha256 as it is extracted.
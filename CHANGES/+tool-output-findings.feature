@@ -0,0 +1 @@
+Add `ansible-lint` and `ansible-test sanity` findings to the import result as `lint_report` and `ansible_test_report`, and add the `LOG_TOOL_OUTPUT_LINES` option to log a summary instead of every finding.
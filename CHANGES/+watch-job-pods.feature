@@ -0,0 +1 @@
+Follow the ansible-test job's pods with the OpenShift watch API, falling back to polling when watching is not allowed.
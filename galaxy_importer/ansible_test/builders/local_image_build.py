@@ -15,19 +15,27 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import hashlib
 import logging
 import os
 import shutil
 import tempfile
 
 from galaxy_importer import exceptions
-from shutil import copy
 from subprocess import Popen, PIPE, STDOUT, run, CalledProcessError
 
+from galaxy_importer.utils.archive import link_or_copy
 from galaxy_importer.utils.resource_access import resource_filename_compat
 
 default_logger = logging.getLogger(__name__)
 
+BASE_IMAGE_NAME = "localhost/galaxy-importer-ansible-test"
+CONTAINER_FILES = [
+    "ansible_test/container/Dockerfile",
+    "ansible_test/container/entrypoint.sh",
+    "ansible_test/container/eda/tox.ini",
+]
+
 
 class Build:
     """Use docker/podman to build ansible-test image with artifact inside."""
@@ -38,6 +46,7 @@ class Build:
         self.filepath = filepath
         self.log = logger or default_logger
         self.image = ""
+        self.keep_image = False
         self.working_dir = tempfile.TemporaryDirectory()
 
     def build_image(self):
@@ -54,7 +63,54 @@ class Build:
         )
         return self.image
 
+    def build_base_image(self):
+        """Build the ansible-test image without the artifact, reusing it when cached.
+
+        The image is tagged with a digest of the container files, so it is rebuilt
+        only when they change. The artifact is mounted when the image is run.
+        """
+        self.image = f"{BASE_IMAGE_NAME}:{Build.get_base_image_digest()}"
+        self.keep_image = True
+
+        if Build._image_exists(self.container_engine, self.image):
+            self.log.info(f"Using cached image {self.image}")
+            return self.image
+
+        self.log.info(f"Building image {self.image}...")
+        with resource_filename_compat(
+            "galaxy_importer", "ansible_test/container/Dockerfile"
+        ) as pkg_dockerfile:
+            shutil.copyfile(pkg_dockerfile, os.path.join(self.working_dir.name, "Dockerfile"))
+        Build._build_image_with_artifact(
+            container_engine=self.container_engine,
+            dirname=self.working_dir.name,
+            tag=self.image,
+        )
+        return self.image
+
+    @staticmethod
+    def get_base_image_digest():
+        sha256 = hashlib.sha256()
+        for resource_name in CONTAINER_FILES:
+            with (
+                resource_filename_compat("galaxy_importer", resource_name) as file_path,
+                open(file_path, "rb") as f,
+            ):
+                sha256.update(resource_name.encode())
+                sha256.update(f.read())
+        return sha256.hexdigest()[:16]
+
+    @staticmethod
+    def _image_exists(container_engine, image):
+        cmd = [container_engine, "image", "inspect", image]
+        return run(cmd, capture_output=True).returncode == 0
+
     def cleanup(self):
+        if self.keep_image:
+            self.log.info("Removing temporary files")
+            self.working_dir.cleanup()
+            return
+
         self.log.info("Removing temporary files, image and container")
         self.working_dir.cleanup()
 
@@ -92,7 +148,7 @@ class Build:
             f.writelines(lines)
 
     @staticmethod
-    def _build_image_with_artifact(container_engine, dirname):
+    def _build_image_with_artifact(container_engine, dirname, tag=None):
         with resource_filename_compat(
             "galaxy_importer", "ansible_test/container/entrypoint.sh"
         ) as pkg_entrypoint:
@@ -105,6 +161,8 @@ class Build:
             shutil.copyfile(eda_linting, os.path.join(dirname, "eda", "tox.ini"))
 
         cmd = [container_engine, "build", ".", "--quiet"]
+        if tag:
+            cmd += ["--tag", tag]
         proc = Popen(
             cmd,
             cwd=dirname,
@@ -129,4 +187,4 @@ class Build:
     @staticmethod
     def _copy_collection_file(dir, filepath):
         path = os.path.join(dir, "archive.tar.gz")
-        copy(filepath, path)
+        link_or_copy(filepath, path)
@@ -17,10 +17,20 @@
 
 import logging
 
+from .background import BackgroundTestRun
 from .local_ansible_test import LocalAnsibleTestRunner
-from .local_image import LocalImageTestRunner
+from .local_image import LocalImageTestRunner, LocalImageTestRunnerPool
 from .openshift_job import OpenshiftJobTestRunner
 
+__all__ = (
+    "BackgroundTestRun",
+    "LocalAnsibleTestRunner",
+    "LocalImageTestRunner",
+    "LocalImageTestRunnerPool",
+    "OpenshiftJobTestRunner",
+    "get_runner",
+)
+
 default_logger = logging.getLogger(__name__)
 
 
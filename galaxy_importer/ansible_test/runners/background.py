@@ -0,0 +1,77 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+import logging
+import sys
+import threading
+
+# How long cancel() waits for a runner to stop, before leaving it to finish alone
+CANCEL_TIMEOUT_SECONDS = 30
+
+
+class BackgroundTestRun:
+    """Run a test runner on its own thread, started when constructed.
+
+    Log records of the runner are held until join(), so in the import log they
+    follow the records of collection loading instead of interleaving with them.
+    """
+
+    def __init__(self, runner):
+        self.runner = runner
+        self.log = runner.log
+        self._records = _RecordingLoggerAdapter(self.log)
+        runner.log = self._records
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="ansible-test", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            self.runner.run()
+        except Exception as e:
+            self._error = e
+
+    def join(self):
+        """Wait for the run to finish, log its records, and raise its error if any."""
+        self._thread.join()
+        self._records.replay()
+        if self._error:
+            raise self._error
+
+    def cancel(self, timeout=CANCEL_TIMEOUT_SECONDS):
+        """Cancel the run and wait up to timeout for it to stop, dropping its records."""
+        self.runner.cancel()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            self.log.warning("ansible-test did not stop after it was cancelled")
+
+
+class _RecordingLoggerAdapter(logging.LoggerAdapter):
+    def __init__(self, logger):
+        super().__init__(logger, {})
+        self.records = []
+
+    def log(self, level, msg, *args, **kwargs):
+        if not self.isEnabledFor(level):
+            return
+        if kwargs.get("exc_info") is True:
+            kwargs["exc_info"] = sys.exc_info()
+        self.records.append((level, msg, args, kwargs))
+
+    def replay(self):
+        records, self.records = self.records, []
+        for level, msg, args, kwargs in records:
+            self.logger.log(level, msg, *args, **kwargs)
@@ -17,6 +17,9 @@
 
 import abc
 import logging
+import threading
+
+from galaxy_importer.utils import tool_output
 
 default_logger = logging.getLogger(__name__)
 
@@ -26,16 +29,57 @@ class BaseTestRunner:
     :param dir: Dir where collection is extracted, used by local runner.
     :param metadata: Collection metadata, used by local runner.
     :param filepath: Path where archive file is located.
+    :param log_output_lines: Log every line of ansible-test output, otherwise lines
+        with findings are only summarized.
     """
 
-    def __init__(self, dir="", metadata="", file=None, filepath=None, logger=None, file_url=None):
+    # Runners that read the collection from dir need every archive file extracted
+    uses_extracted_dir = False
+    # Runners that read the artifact from file or filepath, rather than from file_url
+    uses_archive_file = True
+
+    def __init__(
+        self,
+        dir="",
+        metadata="",
+        file=None,
+        filepath=None,
+        logger=None,
+        file_url=None,
+        log_output_lines=True,
+    ):
         self.log = logger or default_logger
         self.dir = dir
         self.filepath = filepath
         self.metadata = metadata
         self.file = file
         self.file_url = file_url
+        self.log_output_lines = log_output_lines
+        self.output_parser = tool_output.AnsibleTestOutputParser()
+        self._cancelled = threading.Event()
 
     @abc.abstractmethod
     def run(self):
         pass
+
+    @property
+    def report(self):
+        """ToolReport of the ansible-test findings in the output logged so far."""
+        return tool_output.build_report(self.output_parser.findings)
+
+    def _log_output_line(self, line):
+        finding = self.output_parser.feed(line)
+        if finding is None or self.log_output_lines:
+            self.log.info(line.strip())
+
+    def _log_output_summary(self):
+        if not self.log_output_lines and self.output_parser.findings:
+            self.log.warning(tool_output.format_summary("ansible-test sanity", self.report))
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Stop run() in progress on another thread, along with anything it started."""
+        self._cancelled.set()
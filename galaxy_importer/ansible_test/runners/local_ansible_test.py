@@ -30,6 +30,8 @@ cfg = config.Config(config_data=config_data)
 class LocalAnsibleTestRunner(BaseTestRunner):
     """Run ansible-test locally with --docker or using venv."""
 
+    uses_extracted_dir = True
+
     def run(self):
         if not shutil.which("ansible"):
             self.log.error("ansible not found, skipping ansible-test")
@@ -76,7 +78,8 @@ class LocalAnsibleTestRunner(BaseTestRunner):
         )
 
         for line in proc.stdout:
-            self.log.info(line.strip())
+            self._log_output_line(line)
+        self._log_output_summary()
 
         return_code = proc.wait()
         if return_code != 0:
@@ -15,18 +15,45 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import collections
+import concurrent.futures
+import itertools
+import logging
+import os
 import shutil
+import tempfile
+import threading
 from subprocess import Popen, PIPE, STDOUT
 
 from galaxy_importer import config
 from galaxy_importer import exceptions
 from galaxy_importer.ansible_test.builders.local_image_build import Build
 from galaxy_importer.ansible_test.runners.base import BaseTestRunner
+from galaxy_importer.utils import archive
+
+# Bounds containers run by the LocalImageTestRunner instances in this process that
+# are not run by a LocalImageTestRunnerPool
+_container_slots = None
+_container_slots_lock = threading.Lock()
+# Only one thread builds the cached base image, the others then find it
+_base_image_lock = threading.Lock()
+
+
+def _get_container_slots(max_containers):
+    global _container_slots
+    with _container_slots_lock:
+        if _container_slots is None:
+            _container_slots = threading.BoundedSemaphore(max(int(max_containers), 1))
+        return _container_slots
 
 
 class LocalImageTestRunner(BaseTestRunner):
     """Run image locally with docker or podman."""
 
+    _proc = None
+    # Semaphore bounding the containers run at once, the process-wide one when None
+    container_slots = None
+
     def run(self):
         cfg = config.Config(config_data=config.ConfigFile.load())
 
@@ -43,16 +70,45 @@ class LocalImageTestRunner(BaseTestRunner):
             self.log.warning(f'"{container_engine}" not found, skipping ansible-test sanity')
             return
 
-        image_id = build.build_image()
+        with tempfile.TemporaryDirectory(dir=cfg.tmp_root_dir) as archive_dir:
+            if cfg.local_image_reuse:
+                with _base_image_lock:
+                    image_id = build.build_base_image()
+                archive_path = _copy_archive(self.filepath, archive_dir)
+            else:
+                image_id = build.build_image()
+                archive_path = None
 
-        self.log.info("Running image...")
-        self._run_image(image_id=image_id, container_engine=container_engine)
+            container_slots = self.container_slots
+            if container_slots is None:
+                container_slots = _get_container_slots(cfg.local_image_max_containers)
+            with container_slots:
+                if self.cancelled:
+                    build.cleanup()
+                    return
+                self.log.info("Running image...")
+                self._run_image(
+                    image_id=image_id,
+                    container_engine=container_engine,
+                    archive_path=archive_path,
+                    cpus=cfg.local_image_cpus,
+                    memory=cfg.local_image_memory,
+                )
 
         build.cleanup()
 
-    def _run_image(self, image_id, container_engine):
-        cmd = [container_engine, "run", image_id, "LOCAL_IMAGE_RUNNER"]
-        proc = Popen(
+    def _run_image(self, image_id, container_engine, archive_path=None, cpus=None, memory=None):
+        """Run image, with archive_path mounted read-only when it is not built in."""
+        cmd = [container_engine, "run"]
+        if archive_path:
+            volume = f"{os.path.abspath(archive_path)}:/archive/archive.tar.gz:ro,Z"
+            cmd += ["--rm", "--volume", volume]
+        if cpus:
+            cmd += ["--cpus", str(cpus)]
+        if memory:
+            cmd += ["--memory", str(memory)]
+        cmd += [image_id, "LOCAL_IMAGE_RUNNER"]
+        self._proc = proc = Popen(
             cmd,
             stdout=PIPE,
             stderr=STDOUT,
@@ -60,10 +116,101 @@ class LocalImageTestRunner(BaseTestRunner):
         )
 
         for line in proc.stdout:
-            self.log.info(line.strip())
+            self._log_output_line(line)
+        self._log_output_summary()
 
         return_code = proc.wait()
-        if return_code != 0:
+        if return_code != 0 and not self.cancelled:
             raise exceptions.AnsibleTestError(
                 "An exception occurred in {}, returncode={}".format(" ".join(cmd), return_code)
             )
+
+    def cancel(self):
+        """Stop the run, terminating its container if it has started."""
+        super().cancel()
+        if self._proc:
+            self._proc.terminate()
+
+
+def _copy_archive(filepath, archive_dir):
+    """Copy the artifact at filepath into archive_dir to mount it into a container.
+
+    The :Z mount relabels the copy for the container, not the caller's artifact,
+    which filepath may be or be hardlinked to. The copy is readable by the
+    non-root user of the image.
+    """
+    archive_path = os.path.join(archive_dir, "archive.tar.gz")
+    with open(filepath, "rb") as f:
+        archive.copy_fileobj(f, archive_path)
+    os.chmod(archive_path, 0o644)
+    return archive_path
+
+
+class LocalImageTestRunnerPool:
+    """Run LocalImageTestRunner for many collections, with at most max_containers at once.
+
+    Jobs log to one logger through a LoggerAdapter tagging records with the job, and
+    the records of a job are the result of its future.
+    """
+
+    def __init__(self, max_containers=None, logger=None):
+        cfg = config.Config(config_data=config.ConfigFile.load())
+        self.max_containers = int(max_containers or cfg.local_image_max_containers)
+        self.log = logger or logging.getLogger(__name__)
+        self._container_slots = threading.BoundedSemaphore(self.max_containers)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_containers, thread_name_prefix="ansible-test"
+        )
+
+    def submit(self, filepath, metadata):
+        """Queue ansible-test for the artifact at filepath.
+
+        :return: Future of the list of logging.LogRecord for the job.
+        """
+        return self._executor.submit(self._run_job, filepath, metadata)
+
+    def _run_job(self, filepath, metadata):
+        name = f"{metadata.namespace}-{metadata.name}-{metadata.version}"
+        job_id = next(_job_ids)
+        job_log = logging.LoggerAdapter(_job_logger, {"job_id": job_id})
+        runner = LocalImageTestRunner(metadata=metadata, filepath=filepath, logger=job_log)
+        runner.container_slots = self._container_slots
+
+        self.log.info(f"Starting ansible-test for {name}")
+        try:
+            runner.run()
+        except exceptions.AnsibleTestError as e:
+            job_log.error(str(e))
+        finally:
+            records = _job_records.pop(job_id, [])
+        self.log.info(f"Finished ansible-test for {name}")
+        return records
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+class _JobRecordHandler(logging.Handler):
+    """Collect records into a list per job, by the job_id of the record."""
+
+    def __init__(self, job_records):
+        super().__init__()
+        self.job_records = job_records
+
+    def emit(self, record):
+        self.job_records[record.job_id].append(record)
+
+
+# Records of the running LocalImageTestRunnerPool jobs, by job_id
+_job_records = collections.defaultdict(list)
+_job_ids = itertools.count()
+_job_logger = logging.getLogger(f"{__name__}.jobs")
+_job_logger.setLevel(logging.DEBUG)
+_job_logger.propagate = False
+_job_logger.addHandler(_JobRecordHandler(_job_records))
@@ -16,9 +16,12 @@
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
 
+import json
 import logging
 import os
+import random
 import requests
+import threading
 import time
 import uuid
 import yaml
@@ -31,9 +34,23 @@ from galaxy_importer.utils.resource_access import resource_filename_compat
 default_logger = logging.getLogger(__name__)
 
 cfg = config.Config()
-# TODO(cutwater): Implement individual timeouts for each step.
 API_CHECK_RETRIES = int(os.environ.get("IMPORTER_JOB_API_CHECK_RETRIES", "300"))
 API_CHECK_DELAY_SECONDS = int(os.environ.get("IMPORTER_JOB_API_CHECK_DELAY_SECONDS", "3"))
+API_CHECK_MAX_DELAY_SECONDS = int(os.environ.get("IMPORTER_JOB_API_CHECK_MAX_DELAY_SECONDS", "30"))
+API_REQUEST_TIMEOUT_SECONDS = int(os.environ.get("IMPORTER_JOB_API_REQUEST_TIMEOUT_SECONDS", "30"))
+API_REQUEST_RETRIES = int(os.environ.get("IMPORTER_JOB_API_REQUEST_RETRIES", "3"))
+# Step timeouts default to the time the former fixed-delay polling allowed per step
+POD_CREATE_TIMEOUT_SECONDS = int(
+    os.environ.get(
+        "IMPORTER_JOB_POD_CREATE_TIMEOUT_SECONDS", API_CHECK_RETRIES * API_CHECK_DELAY_SECONDS
+    )
+)
+POD_START_TIMEOUT_SECONDS = int(
+    os.environ.get(
+        "IMPORTER_JOB_POD_START_TIMEOUT_SECONDS", API_CHECK_RETRIES * API_CHECK_DELAY_SECONDS
+    )
+)
+RETRY_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
 OCP_SERVICEACCOUNT_PATH = "/var/run/secrets/kubernetes.io/serviceaccount/"
 IMAGE_BASE_NAME = "ansible-test"
 
@@ -41,6 +58,9 @@ IMAGE_BASE_NAME = "ansible-test"
 class OpenshiftJobTestRunner(BaseTestRunner):
     """Run image as an openshift job."""
 
+    uses_archive_file = False
+    _job = None
+
     def run(self):
         self.log.info("Preparing job pod to run ansible-test sanity")
 
@@ -52,18 +72,28 @@ class OpenshiftJobTestRunner(BaseTestRunner):
             archive_url=self.file_url,
             job_template=OpenshiftJobTestRunner._get_job_template(),
             logger=self.log,
+            cancelled=self._cancelled,
         )
-        job.create()
-        job.wait_on_pod_ready()
-        iter_logs = job.get_logs()
+        self._job = job
+        with job:
+            job.create()
+            job.wait_on_pod_ready()
+            iter_logs = job.get_logs()
+
+            for line in iter_logs:
+                if isinstance(line, bytes):
+                    self.log.error("Unexpected bytes in logs: {}".format(str(line)))
+                    continue
+                self._log_output_line(line)
+            self._log_output_summary()
 
-        for line in iter_logs:
-            if isinstance(line, bytes):
-                self.log.error("Unexpected bytes in logs: {}".format(str(line)))
-                continue
-            self.log.info(line)
+            job.cleanup()
 
-        job.cleanup()
+    def cancel(self):
+        """Stop the run and delete its job, which ends the pod and its log stream."""
+        super().cancel()
+        if self._job:
+            self._job.delete()
 
     @staticmethod
     def _get_token():
@@ -88,7 +118,11 @@ class OpenshiftJobTestRunner(BaseTestRunner):
 
 
 class Job:
-    """Interact with Openshift Job via REST API."""
+    """Interact with Openshift Job via REST API.
+
+    Requests share a keep-alive session, so the TLS handshake with the cluster is
+    made once per job rather than once per request.
+    """
 
     def __init__(
         self,
@@ -99,10 +133,14 @@ class Job:
         job_template,
         archive_url,
         logger,
+        cancelled=None,
     ):
         self.name = "ansible-test-" + str(uuid.uuid4())
         self.auth_header = {"Authorization": f"Bearer {session_token}"}
         self.ca_path = ca_path
+        self.session = requests.Session()
+        self.session.headers.update(self.auth_header)
+        self.session.verify = ca_path
         self.jobs_url = f"{ocp_domain}/apis/batch/v1/namespaces/{namespace}/jobs"
         self.job_name_url = f"{self.jobs_url}/{self.name}"
         self.pods_url = f"{ocp_domain}/api/v1/namespaces/{namespace}/pods"
@@ -123,16 +161,47 @@ class Job:
             ),
         )
         self.log = logger or default_logger
+        self.cancelled = cancelled or threading.Event()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the connections of the job's session."""
+        self.session.close()
+
+    def _request(self, method, url, retry=True, **kwargs):
+        """Send a request, retrying connection errors and transient statuses.
+
+        Retries are only made when retry is True, for requests safe to repeat.
+        """
+        kwargs.setdefault("timeout", API_REQUEST_TIMEOUT_SECONDS)
+        delays = _backoff_delays(API_CHECK_DELAY_SECONDS / 3)
+        for attempt in range(API_REQUEST_RETRIES + 1):
+            last_attempt = not retry or attempt == API_REQUEST_RETRIES
+            try:
+                r = self.session.request(method, url, **kwargs)
+            except requests.ConnectionError:
+                if last_attempt:
+                    raise
+            else:
+                if last_attempt or r.status_code not in RETRY_STATUS_CODES:
+                    return r
+                r.close()
+            time.sleep(next(delays))
 
     def create(self):
         """Create the job."""
 
         self.log.info(f"Creating job {self.name}")
-        r = requests.post(
+        r = self._request(
+            "POST",
             self.jobs_url,
-            headers=self.auth_header,
+            retry=False,
             json=yaml.safe_load(self.job_yaml),
-            verify=self.ca_path,
         )
         if r.status_code != requests.codes.created:
             raise exceptions.AnsibleTestError(
@@ -140,43 +209,143 @@ class Job:
             )
 
     def wait_on_pod_ready(self):
-        """Wait until job's pod initializes, pulls image, and starts running."""
+        """Wait until job's pod initializes, pulls image, and starts running.
+
+        Follows the job's pods with the watch API, and falls back to polling
+        when the API server does not allow watching.
+        """
 
         self.log.info("Creating pod...")
-        for _ in range(API_CHECK_RETRIES):
-            pods = self.get_pods()
-            if len(pods) < 1:
-                time.sleep(API_CHECK_DELAY_SECONDS)
-                continue
-            break
+        try:
+            self._watch_pod_ready()
+        except _WatchUnavailableError as e:
+            self.log.debug(f"Could not watch pods, polling instead: {e}")
+            self._poll_pod_ready()
 
-        if len(pods) < 1:
+    def _watch_pod_ready(self):
+        deadline = time.monotonic() + POD_CREATE_TIMEOUT_SECONDS
+        try:
+            pods, resource_version = self._list_pods()
+        except requests.RequestException as e:
+            raise _WatchUnavailableError(e)
+        pod_found = False
+
+        while True:
+            self._check_cancelled()
+            if pods and not pod_found:
+                pod_found = True
+                deadline = time.monotonic() + POD_START_TIMEOUT_SECONDS
+                self.log.info("Scheduling pod and waiting until it is running...")
+            if any(pod["status"]["phase"] != "Pending" for pod in pods):
+                return
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            pods, resource_version = self._watch_pods(resource_version, remaining)
+
+        self.cleanup()
+        if not pod_found:
+            raise exceptions.AnsibleTestError("Could not create pod associated with job")
+        raise exceptions.AnsibleTestError("Could not start pod associated with job")
+
+    def _watch_pods(self, resource_version, timeout):
+        """Return (pods, resource_version) on the next pod change or end of the watch.
+
+        A watch that ends early is resumed from resource_version by the caller. When
+        resource_version is too old to resume from, pods are listed again.
+        """
+        timeout = max(int(timeout), 1)
+        params = {
+            "labelSelector": f"job-name={self.name}",
+            "watch": "true",
+            "allowWatchBookmarks": "true",
+            "resourceVersion": resource_version,
+            "timeoutSeconds": timeout,
+        }
+        try:
+            r = self._request(
+                "GET",
+                self.pods_url,
+                params=params,
+                stream=True,
+                timeout=(API_REQUEST_TIMEOUT_SECONDS, timeout + API_REQUEST_TIMEOUT_SECONDS),
+            )
+        except requests.RequestException as e:
+            raise _WatchUnavailableError(e)
+        if r.status_code != requests.codes.ok:
+            raise _WatchUnavailableError(f"{r.status_code} {r.reason}")
+
+        with r:
+            try:
+                for line in r.iter_lines(decode_unicode=True):
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    obj = event["object"]
+                    if event["type"] == "ERROR":
+                        if obj.get("code") == requests.codes.gone:
+                            return self._list_pods()
+                        raise _WatchUnavailableError(obj.get("message"))
+                    resource_version = obj["metadata"]["resourceVersion"]
+                    if event["type"] in ("ADDED", "MODIFIED"):
+                        return [obj], resource_version
+                    if event["type"] == "DELETED":
+                        return [], resource_version
+            except (requests.RequestException, ValueError, KeyError) as e:
+                self.log.debug(f"Pod watch interrupted, resuming: {e}")
+        return [], resource_version
+
+    def _poll_pod_ready(self):
+        pods = self._poll_pods(lambda pods: len(pods) > 0, POD_CREATE_TIMEOUT_SECONDS)
+        if not pods:
             self.cleanup()
             raise exceptions.AnsibleTestError("Could not create pod associated with job")
 
         self.log.info("Scheduling pod and waiting until it is running...")
-        for _ in range(API_CHECK_RETRIES):
-            pods = self.get_pods()
-            pod_phase = pods[0]["status"]["phase"]
-            if pod_phase != "Pending":
-                return
-            time.sleep(API_CHECK_DELAY_SECONDS)
+        pods = self._poll_pods(
+            lambda pods: pods and pods[0]["status"]["phase"] != "Pending",
+            POD_START_TIMEOUT_SECONDS,
+        )
+        if pods and pods[0]["status"]["phase"] != "Pending":
+            return
 
-        self.log.debug(pods[0]["status"])
+        if pods:
+            self.log.debug(pods[0]["status"])
         self.cleanup()
         raise exceptions.AnsibleTestError("Could not start pod associated with job")
 
+    def _poll_pods(self, is_done, timeout):
+        """Get pods until is_done(pods) or timeout, backing off between checks."""
+        deadline = time.monotonic() + timeout
+        delays = _backoff_delays(API_CHECK_DELAY_SECONDS)
+        while True:
+            self._check_cancelled()
+            pods = self.get_pods()
+            remaining = deadline - time.monotonic()
+            if is_done(pods) or remaining <= 0:
+                return pods
+            time.sleep(min(next(delays), remaining))
+
+    def _check_cancelled(self):
+        if self.cancelled.is_set():
+            self.cleanup()
+            raise exceptions.AnsibleTestError("ansible-test job was cancelled")
+
     def get_pods(self):
         """Get pods associated with job."""
+        return self._list_pods()[0]
+
+    def _list_pods(self):
+        """Return pods associated with job, and the resourceVersion of the list."""
         params = {"labelSelector": f"job-name={self.name}"}
-        r = requests.get(
-            self.pods_url, headers=self.auth_header, params=params, verify=self.ca_path
-        )
+        r = self._request("GET", self.pods_url, params=params)
         try:
-            pods = r.json()["items"]
+            data = r.json()
+            pods = data["items"]
         except (KeyError, ValueError):
             raise exceptions.AnsibleTestError("Could not access pod assocated with job")
-        return pods
+        return pods, data.get("metadata", {}).get("resourceVersion")
 
     @staticmethod
     def get_pod_name(pod):
@@ -186,32 +355,48 @@ class Job:
         """Returns stream of lines from the logs of the pod."""
         pod = self.get_pods()[0]
         pod_name = self.get_pod_name(pod)
-        r = requests.get(
-            url=f"{self.pods_url}/{pod_name}/log",
-            headers=self.auth_header,
+        # ansible-test may not log for a while, so only the connect is timed
+        r = self._request(
+            "GET",
+            f"{self.pods_url}/{pod_name}/log",
             params={"follow": "true"},
-            verify=self.ca_path,
             stream=True,
+            timeout=(API_REQUEST_TIMEOUT_SECONDS, None),
         )
         return r.iter_lines(decode_unicode=True)
 
-    def cleanup(self):
-        """Deletes job and any pods associated to it."""
-        requests.delete(self.job_name_url, headers=self.auth_header, verify=self.ca_path)
+    def delete(self):
+        """Delete job, leaving the garbage collector to delete its pods."""
+        self._request("DELETE", self.job_name_url, params={"propagationPolicy": "Background"})
         self.log.debug(f"Deleted job {self.name}")
 
-        for pod in self.get_pods():
-            pod_name = self.get_pod_name(pod)
-            requests.delete(
-                f"{self.pods_url}/{pod_name}",
-                headers=self.auth_header,
-                verify=self.ca_path,
-            )
-            self.log.debug(f"Deleted pod {pod_name}")
+    def cleanup(self):
+        """Deletes job, raising if its pod failed."""
+        # pod status is read before the delete removes the pods, the delete runs even
+        # when reading it fails so the job does not leak
+        try:
+            pods = self.get_pods()
+        finally:
+            self.delete()
 
+        for pod in pods:
             status = pod["status"]["phase"]
             if status == "Failed":
                 reason = pod["status"]["containerStatuses"][0]["state"]["terminated"]["reason"]
                 raise exceptions.AnsibleTestError(
                     f'Pod terminated with status: "{status}" and reason: "{reason}"'
                 )
+
+
+def _backoff_delays(base, maximum=None):
+    """Yield exponentially growing delays from base, jittered by up to half."""
+    maximum = API_CHECK_MAX_DELAY_SECONDS if maximum is None else maximum
+    attempt = 0
+    while True:
+        delay = min(maximum, base * 2**attempt)
+        yield delay / 2 + random.uniform(0, delay / 2)
+        attempt += 1
+
+
+class _WatchUnavailableError(Exception):
+    """The pods watch API could not be used."""
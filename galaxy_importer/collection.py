@@ -15,6 +15,8 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import contextlib
+import hashlib
 import logging
 import os
 import shutil
@@ -26,9 +28,11 @@ from typing import NamedTuple
 import attr
 
 from galaxy_importer import config
+from galaxy_importer import constants
 from galaxy_importer import exceptions as exc
 from galaxy_importer.loaders import CollectionLoader
 from galaxy_importer.ansible_test import runners
+from galaxy_importer.utils import archive, chksums, collection_build, http_reader, result_cache
 from galaxy_importer import __version__
 
 default_logger = logging.getLogger(__name__)
@@ -40,6 +44,31 @@ class CollectionFilename(NamedTuple):
     version: str
 
 
+class ExtractedArchive(NamedTuple):
+    member_names: set
+    skipped_files: dict
+    # sha256 of regular files that were hashed during extraction
+    chksums: dict
+
+
+class ArchiveLimits(NamedTuple):
+    """Bounds on archive contents, a value of 0 disables that limit."""
+
+    max_members: int = 0
+    max_size: int = 0
+    max_file_size: int = 0
+    max_compression_ratio: int = 0
+
+    @classmethod
+    def from_config(cls, cfg):
+        return cls(
+            max_members=int(cfg.max_archive_members),
+            max_size=int(cfg.max_archive_size),
+            max_file_size=int(cfg.max_archive_file_size),
+            max_compression_ratio=int(cfg.max_archive_compression_ratio),
+        )
+
+
 def import_collection(
     file=None,
     filename=None,
@@ -48,16 +77,30 @@ def import_collection(
     output_path=None,
     logger=None,
     cfg=None,
+    previous_result=None,
+    fetcher=None,
+    as_dict=True,
 ):
     """Process import on collection artifact file object.
 
-    :param file: file handle of collection artifact.
+    :param file: file handle of collection artifact, or a forward-only stream of it
+        such as a http_reader.HttpArtifactReader.
     :param filename: namedtuple of CollectionFilename.
-    :param file_url: storage url of collection artifact.
+    :param file_url: storage url of collection artifact. Without `file`, the artifact
+        is streamed from file_url into extraction, without a local copy unless a
+        local ansible-test runner needs one.
     :param git_clone_path: path to git repo directory of collection pre artifact build.
     :param output_path: path where collection build tarball file will be written.
     :param logger: Optional logger instance.
     :param cfg: Optional config.
+    :param previous_result: Optional metadata returned by the import of a previous
+        version of the collection, to reuse its results for unchanged files. Add the
+        previous artifact's FILES.json data as "file_manifest" to also reuse its doc
+        strings and rendered documentation.
+    :param fetcher: Optional fetcher of file_url, see http_reader.HttpArtifactReader.
+    :param as_dict: With False, metadata is the ImportResult rather than a dict copy
+        of it, for callers that write it with utils.result_writer. Results of the
+        result cache and of `git_clone_path` imports are dicts regardless.
 
     :raises exc.ImporterError: On errors that fail the import process.
 
@@ -70,16 +113,86 @@ def import_collection(
         config_data = config.ConfigFile.load()
         cfg = config.Config(config_data=config_data)
 
-    if (file and git_clone_path) or not (file or git_clone_path):
-        raise exc.ImporterError("Expected either 'file' or 'git_clone_path' to be populated")
+    if (file and git_clone_path) or not (file or file_url or git_clone_path):
+        raise exc.ImporterError(
+            "Expected either 'file', 'file_url' or 'git_clone_path' to be populated"
+        )
 
     if git_clone_path:
-        filepath = _build_collection(git_clone_path, output_path, logger)
-        with open(filepath, "rb") as fh:
-            metadata = _import_collection(fh, filename=None, file_url=None, logger=logger, cfg=cfg)
-        return (metadata, filepath)
+        return _import_git_clone(git_clone_path, output_path, logger, cfg, previous_result)
 
-    return _import_collection(file, filename, file_url, logger, cfg)
+    if not file:
+        with http_reader.HttpArtifactReader(file_url, fetcher=fetcher, logger=logger) as reader:
+            metadata = _import_collection(
+                reader, filename, file_url, logger, cfg, previous_result, as_dict=as_dict
+            )
+        logger.info(f"Imported artifact with sha256 {reader.sha256}")
+        return metadata
+
+    cache = result_cache.get_result_cache(cfg, logger=logger)
+    if cache:
+        cache_key = result_cache.get_cache_key(file, filename, cfg)
+        metadata = cache.get(cache_key)
+        if metadata is not None:
+            logger.info("Using the result of a previous import of this artifact")
+            return metadata
+
+    metadata = _import_collection(
+        file, filename, file_url, logger, cfg, previous_result, as_dict=as_dict or cache is not None
+    )
+    if cache:
+        metadata = cache.set(cache_key, metadata)
+    return metadata
+
+
+def import_collection_dir(
+    path, logger=None, cfg=None, verify_files=True, previous_result=None, as_dict=True
+):
+    """Process import on a collection dir, without building or extracting an artifact.
+
+    ansible-test is not run, as the runners take a collection artifact.
+
+    :param path: path to an `ansible_collections/<namespace>/<name>` dir with the
+        collection's MANIFEST.json and FILES.json, such as an installed collection.
+    :param logger: Optional logger instance.
+    :param cfg: Optional config.
+    :param verify_files: Check the files in path against the checksums in FILES.json,
+        and for files missing from FILES.json.
+    :param previous_result: Optional metadata returned by the import of a previous
+        version of the collection, see import_collection().
+    :param as_dict: With False, metadata is the ImportResult rather than a dict copy
+        of it, see import_collection().
+
+    :raises exc.ImporterError: On errors that fail the import process.
+
+    :return: metadata
+    """
+
+    logger = logger or default_logger
+    logger.info(f"Importing with galaxy-importer {__version__}")
+    if not cfg:
+        config_data = config.ConfigFile.load()
+        cfg = config.Config(config_data=config_data)
+
+    path = os.path.abspath(path)
+    if os.path.basename(os.path.dirname(os.path.dirname(path))) != "ansible_collections":
+        raise exc.ImporterError(
+            f"Expected a collection dir of the form ansible_collections/<namespace>/<name>: {path}"
+        )
+    if cfg.run_ansible_test:
+        logger.info("Skipping ansible-test, it requires a collection artifact")
+
+    data = CollectionLoader(
+        path,
+        filename=None,
+        cfg=cfg,
+        logger=logger,
+        previous_result=previous_result,
+        rename_path=False,
+        verify_file_manifest=verify_files,
+    ).load()
+    logger.info("Collection loading complete")
+    return attr.asdict(data) if as_dict else data
 
 
 def sync_collection(git_clone_path, output_path, logger=None, cfg=None):
@@ -98,9 +211,34 @@ def sync_collection(git_clone_path, output_path, logger=None, cfg=None):
     cfg.run_ansible_lint = False
     cfg.run_flake8 = False
 
-    filepath = _build_collection(git_clone_path, output_path, logger)
+    return _import_git_clone(git_clone_path, output_path, logger, cfg)
+
+
+def _import_git_clone(git_clone_path, output_path, logger, cfg, previous_result=None):
+    """Build the collection in git_clone_path and import it, returning (metadata, filepath).
+
+    With native_collection_build, the collection is built in-process and its files
+    are linked into the import dir instead of being extracted from the artifact.
+    """
+    built = None
+    if cfg.native_collection_build:
+        logger.info("Building collection tarball")
+        try:
+            built = collection_build.build_collection(git_clone_path, output_path)
+        except collection_build.UnsupportedBuildError as e:
+            logger.info(f"{e}, falling back to ansible-galaxy collection build")
+    filepath = built.filepath if built else _build_collection(git_clone_path, output_path, logger)
+
     with open(filepath, "rb") as fh:
-        metadata = _import_collection(fh, filename=None, file_url=None, logger=logger, cfg=cfg)
+        metadata = _import_collection(
+            fh,
+            filename=None,
+            file_url=None,
+            logger=logger,
+            cfg=cfg,
+            previous_result=previous_result,
+            built=built,
+        )
     return (metadata, filepath)
 
 
@@ -128,42 +266,352 @@ def _build_collection(git_clone_path, output_path, logger=None):
     return filepath
 
 
-def _import_collection(file, filename, file_url, logger, cfg):
-    """Returns collection version metadata."""
+def _import_collection(
+    file, filename, file_url, logger, cfg, previous_result=None, built=None, as_dict=True
+):
+    """Returns collection version metadata.
+
+    :param built: Optional BuiltCollection of file, whose source files are linked into
+        the import dir instead of extracting file.
+    :param as_dict: Return the metadata as a dict rather than the ImportResult.
+
+    A file that is not seekable is extracted as it is read, by the pipelined extractor.
+    """
+
+    ansible_test_runner = runners.get_runner(cfg=cfg)
+    with (
+        tempfile.TemporaryDirectory(dir=_get_tmp_root_dir(file, cfg)) as tmp_dir,
+        contextlib.ExitStack() as stack,
+    ):
+        if not _is_seekable(file) and ansible_test_runner and ansible_test_runner.uses_archive_file:
+            file = stack.enter_context(_download_archive(file, tmp_dir))
 
-    with tempfile.TemporaryDirectory(dir=cfg.tmp_root_dir) as tmp_dir:
         sub_path = "ansible_collections/placeholder_namespace/placeholder_name"
         extract_dir = os.path.join(tmp_dir, sub_path)
         os.makedirs(extract_dir)
-        _extract_archive(fileobj=file, extract_dir=extract_dir)
+        if built:
+            extracted = _link_built_collection(built, extract_dir)
+        else:
+            skip_dirs = constants.UNLOADED_COLLECTION_DIRS if cfg.selective_extraction else ()
+            extract_archive = (
+                _extract_archive_pipelined
+                if cfg.pipelined_extraction or not _is_seekable(file)
+                else _extract_archive
+            )
+            extracted = extract_archive(
+                fileobj=file,
+                extract_dir=extract_dir,
+                skip_dirs=skip_dirs,
+                limits=ArchiveLimits.from_config(cfg),
+            )
 
-        data = CollectionLoader(extract_dir, filename, cfg=cfg, logger=logger).load()
+        concurrent_test = (
+            ansible_test_runner
+            and cfg.concurrent_ansible_test
+            and not ansible_test_runner.uses_extracted_dir
+        )
+        background_test = None
+
+        def start_ansible_test(metadata):
+            nonlocal background_test
+            logger.info("Starting ansible-test alongside collection loading")
+            background_test = runners.BackgroundTestRun(
+                ansible_test_runner(
+                    dir=tmp_dir,
+                    metadata=metadata,
+                    file=file,
+                    filepath=(
+                        _get_archive_path(file, tmp_dir)
+                        if ansible_test_runner.uses_archive_file
+                        else None
+                    ),
+                    file_url=file_url,
+                    logger=logger,
+                    log_output_lines=cfg.log_tool_output_lines,
+                )
+            )
+
+        try:
+            data = CollectionLoader(
+                extract_dir,
+                filename,
+                cfg=cfg,
+                logger=logger,
+                archive_members=extracted.member_names,
+                file_chksums=extracted.chksums,
+                on_metadata_loaded=start_ansible_test if concurrent_test else None,
+                previous_result=previous_result,
+            ).load()
+        except Exception:
+            if background_test:
+                background_test.cancel()
+            raise
         logger.info("Collection loading complete")
 
-        ansible_test_runner = runners.get_runner(cfg=cfg)
-        if ansible_test_runner:
-            filepath = file.name
-            if not os.path.exists(filepath):
-                filepath = os.path.join(tmp_dir, "archive.tar.gz")
-                file.seek(0)
-                with open(filepath, "wb") as newfile:
-                    shutil.copyfileobj(file, newfile)
+        if background_test:
+            background_test.join()
+            data = attr.evolve(data, ansible_test_report=background_test.runner.report)
+        elif ansible_test_runner:
+            if ansible_test_runner.uses_extracted_dir and extracted.skipped_files:
+                collection_dir = os.path.join(
+                    tmp_dir, "ansible_collections", data.metadata.namespace, data.metadata.name
+                )
+                _extract_archive_files(file, collection_dir, extracted.skipped_files)
 
-            file.seek(0)
-            ansible_test_runner(
+            # a runner using file_url may get a stream that extraction has consumed
+            filepath = None
+            if ansible_test_runner.uses_archive_file:
+                filepath = _get_archive_path(file, tmp_dir)
+                file.seek(0)
+            runner = ansible_test_runner(
                 dir=tmp_dir,
                 metadata=data.metadata,
                 file=file,
                 filepath=filepath,
                 file_url=file_url,
                 logger=logger,
-            ).run()
+                log_output_lines=cfg.log_tool_output_lines,
+            )
+            runner.run()
+            data = attr.evolve(data, ansible_test_report=runner.report)
+
+    return attr.asdict(data) if as_dict else data
+
+
+def _get_archive_path(fileobj, tmp_dir):
+    """Return the path of the artifact file, copying it into tmp_dir if it has none."""
+    filepath = getattr(fileobj, "name", None)
+    if not isinstance(filepath, str) or not os.path.exists(filepath):
+        filepath = os.path.join(tmp_dir, "archive.tar.gz")
+        archive.copy_fileobj(fileobj, filepath)
+    return filepath
+
+
+def _download_archive(fileobj, tmp_dir):
+    """Save a forward-only artifact stream to tmp_dir, returning the saved file opened."""
+    filepath = os.path.join(tmp_dir, "archive.tar.gz")
+    with open(filepath, "wb") as f:
+        shutil.copyfileobj(fileobj, f, archive.READ_SIZE)
+    return open(filepath, "rb")
+
+
+def _is_seekable(fileobj):
+    """Return False for a forward-only stream.
+
+    File objects without seekable() are assumed to be seekable, as callers passed
+    before streams were supported.
+    """
+    seekable = getattr(fileobj, "seekable", None)
+    return seekable() if seekable else True
 
-    return attr.asdict(data)
 
+def _get_archive_size(fileobj):
+    """Return the artifact size, which may be None for a stream without a known size.
 
-def _extract_archive(fileobj, extract_dir):
+    A stream's size is its size attribute when it has one, like HttpArtifactReader.
+    """
+    if not _is_seekable(fileobj):
+        return getattr(fileobj, "size", None)
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
     fileobj.seek(0)
+    return size
+
+
+def _get_tmp_root_dir(fileobj, cfg):
+    """Return memory_tmp_root_dir for artifacts whose contents are up to
+    memory_tmp_max_size, else tmp_root_dir.
+
+    Small artifacts are extracted to a memory backed filesystem (e.g. /dev/shm), so
+    extraction, renames and cleanup avoid disk I/O. Loaders and external tools such
+    as ansible-doc and ansible-lint still get real paths.
+
+    The contents size is the sum of the member sizes in the tar headers, as a small
+    compressed artifact can inflate to far more. Streams, whose headers can't be read
+    ahead of extraction, use tmp_root_dir.
+    """
+    if not cfg.memory_tmp_root_dir or not os.path.isdir(cfg.memory_tmp_root_dir):
+        return cfg.tmp_root_dir
+
+    max_size = int(cfg.memory_tmp_max_size)
+    size = _get_archive_size(fileobj)
+    if size is None or size > max_size or not _is_seekable(fileobj):
+        return cfg.tmp_root_dir
+    contents_size = _get_archive_contents_size(fileobj, max_size)
+    if contents_size is None or contents_size > max_size:
+        return cfg.tmp_root_dir
+    return cfg.memory_tmp_root_dir
+
+
+def _get_archive_contents_size(fileobj, max_size):
+    """Return the sum of the archive member sizes, from their tar headers.
+
+    Reading stops once the sum is larger than max_size, so little more than max_size
+    is inflated. Returns None when the archive can't be read, for extraction to report.
+    """
+    size = 0
+    try:
+        with tarfile.open(fileobj=fileobj, mode="r|*") as tf:
+            for item in tf:
+                size += item.size
+                if size > max_size:
+                    break
+    except (tarfile.TarError, OSError, EOFError):
+        size = None
+    fileobj.seek(0)
+    return size
+
+
+def _extract_archive(fileobj, extract_dir, skip_dirs=(), limits=None):
+    """Extract archive into extract_dir.
+
+    Regular files under any of skip_dirs are not written to extract_dir, their
+    contents are only streamed through sha256 so they can be checked against FILES.json.
+
+    limits are checked as each member header is read, before anything is written.
+
+    :return: ExtractedArchive, where member_names are paths relative to extract_dir
+        and include parent directories that are only implied by member names, so they
+        match what a walk of extract_dir would find.
+    """
+    member_names = set()
+    skipped_files = {}
+    check_member = _get_member_checker(fileobj, extract_dir, limits, member_names)
+    fileobj.seek(0)
+    with tarfile.open(fileobj=fileobj, mode="r") as tf:
+        for item in tf:
+            check_member(item)
+
+        def members_to_extract():
+            # extractall() consumes members in archive order, so skipped files are
+            # hashed in the same forward pass over the compressed stream
+            for item in tf.getmembers():
+                name = os.path.normpath(item.name)
+                if item.isfile() and name.startswith(tuple(skip_dirs)):
+                    skipped_files[name] = chksums.sha256sum_from_fo(tf.extractfile(item))
+                    continue
+                yield item
+
+        tf.extractall(extract_dir, members=members_to_extract(), **_get_extract_kwargs())
+    return ExtractedArchive(member_names, skipped_files, dict(skipped_files))
+
+
+def _extract_archive_pipelined(fileobj, extract_dir, skip_dirs=(), limits=None):
+    """Extract archive into extract_dir in a single pass with PipelinedExtractor.
+
+    Same as _extract_archive, except that members are written as their headers are
+    read, so files may be written before a later member fails a check. Every regular
+    file is hashed as it is written.
+    """
+    member_names = set()
+    extractor = archive.PipelinedExtractor(
+        check_member=_get_member_checker(fileobj, extract_dir, limits, member_names),
+        skip_member=lambda item: os.path.normpath(item.name).startswith(tuple(skip_dirs)),
+    )
+    if _is_seekable(fileobj):
+        fileobj.seek(0)
+    try:
+        extractor.extract(fileobj, extract_dir)
+    except (tarfile.TarError, OSError) as e:
+        raise exc.ImporterError(f"Could not extract archive: {e}")
+    return ExtractedArchive(member_names, extractor.skipped_files, extractor.chksums)
+
+
+def _get_member_checker(fileobj, extract_dir, limits, member_names):
+    """Return a callable that validates each archive member and adds it to member_names."""
+    archive_size = _get_archive_size(fileobj)
+    limits = limits or ArchiveLimits()
+    counts = {"members": 0, "size": 0}
+
+    def check_member(item):
+        counts["members"] += 1
+        counts["size"] += item.size
+        _check_archive_limits(limits, counts["members"], item, counts["size"], archive_size)
+        if item.name.startswith("/") or "../" in item.name:
+            raise exc.ImporterError("Invalid file paths detected.")
+        if item.linkname:
+            # Ensure the link target is within the extraction root
+            link_target = os.path.normpath(
+                os.path.join(extract_dir, os.path.dirname(item.name), item.linkname)
+            )
+            if not link_target.startswith(os.path.abspath(extract_dir)):
+                raise exc.ImporterError("Invalid link target detected.")
+        _add_member_name(member_names, item.name)
+
+    return check_member
+
+
+def _check_archive_limits(limits, member_count, item, total_size, archive_size):
+    if limits.max_members and member_count > limits.max_members:
+        raise exc.ArchiveLimitError(
+            f"Archive has more than the maximum of {limits.max_members} files"
+        )
+    if limits.max_file_size and item.size > limits.max_file_size:
+        raise exc.ArchiveLimitError(
+            f"Archive file {item.name} is larger than the maximum of "
+            f"{limits.max_file_size} bytes"
+        )
+    if limits.max_size and total_size > limits.max_size:
+        raise exc.ArchiveLimitError(
+            f"Archive contents are larger than the maximum of {limits.max_size} bytes"
+        )
+    # the compression ratio is not checked for a stream without a known size
+    if (
+        limits.max_compression_ratio
+        and archive_size is not None
+        and (total_size > limits.max_compression_ratio * max(archive_size, 1))
+    ):
+        raise exc.ArchiveLimitError(
+            f"Archive compression ratio is larger than the maximum of "
+            f"{limits.max_compression_ratio}"
+        )
+
+
+def _link_built_collection(built, extract_dir):
+    """Populate extract_dir with the files of a BuiltCollection, as in its artifact.
+
+    Files are hardlinked, or copied, from the collection source dir. Links within
+    the collection are recreated as links. Only the chksums of MANIFEST.json and
+    FILES.json are returned, so the linked files are hashed when FILES.json is
+    verified, and a source file changed since the build fails the import.
+    """
+    member_names = set()
+    file_chksums = {}
+    for name, data in (
+        ("MANIFEST.json", built.manifest_json),
+        ("FILES.json", built.file_manifest_json),
+    ):
+        with open(os.path.join(extract_dir, name), "wb") as f:
+            f.write(data)
+        _add_member_name(member_names, name)
+        file_chksums[name] = hashlib.sha256(data).hexdigest()
+
+    for entry in built.file_manifest["files"]:
+        name = entry["name"]
+        if name == ".":
+            continue
+        src = os.path.join(built.path, name)
+        dst = os.path.join(extract_dir, name)
+        link_target = os.path.realpath(src)
+        if os.path.islink(src) and link_target.startswith(built.path + os.sep):
+            os.symlink(os.path.relpath(link_target, os.path.dirname(src)), dst)
+        elif entry["ftype"] == "dir":
+            os.makedirs(dst, exist_ok=True)
+        else:
+            archive.link_or_copy(link_target, dst)
+        _add_member_name(member_names, name)
+    return ExtractedArchive(member_names, {}, file_chksums)
+
+
+def _extract_archive_files(fileobj, extract_dir, names):
+    """Extract only the archive members in names, after a selective _extract_archive."""
+    fileobj.seek(0)
+    with tarfile.open(fileobj=fileobj, mode="r") as tf:
+        members = [item for item in tf.getmembers() if os.path.normpath(item.name) in names]
+        tf.extractall(extract_dir, members=members, **_get_extract_kwargs())
+
+
+def _get_extract_kwargs():
     _extract_kwargs = {}
     if hasattr(tarfile, "data_filter"):
         # Python added support for tarfile extraction filtering (PEP706) in
@@ -171,15 +619,12 @@ def _extract_archive(fileobj, extract_dir):
         # backported to other some earlier versions, and the default behavior
         # will change in Python 3.14
         _extract_kwargs["filter"] = "data"
-    with tarfile.open(fileobj=fileobj, mode="r") as tf:
-        for item in tf.getmembers():
-            if item.name.startswith("/") or "../" in item.name:
-                raise exc.ImporterError("Invalid file paths detected.")
-            if item.linkname:
-                # Ensure the link target is within the extraction root
-                link_target = os.path.normpath(
-                    os.path.join(extract_dir, os.path.dirname(item.name), item.linkname)
-                )
-                if not link_target.startswith(os.path.abspath(extract_dir)):
-                    raise exc.ImporterError("Invalid link target detected.")
-        tf.extractall(extract_dir, **_extract_kwargs)
+    return _extract_kwargs
+
+
+def _add_member_name(member_names, name):
+    """Add normalized tar member name and its parent dirs to member_names."""
+    name = os.path.normpath(name)
+    while name not in ("", ".") and name not in member_names:
+        member_names.add(name)
+        name = os.path.dirname(name)
@@ -40,19 +40,38 @@ class Config:
     """Configuration for galaxy-importer."""
 
     DEFAULTS = {
+        "ansible_doc_chunk_size": 0,
+        "ansible_doc_workers": 4,
         "ansible_local_tmp": "~/.ansible/tmp",
         "ansible_test_local_image": False,
         "check_changelog": True,
         "check_required_tags": False,
+        "concurrent_ansible_test": False,
         "infra_osd": False,
+        "local_image_cpus": None,
         "local_image_docker": False,
+        "local_image_max_containers": 1,
+        "local_image_memory": None,
+        "local_image_reuse": False,
         "log_level_main": "INFO",
+        "log_tool_output_lines": True,
+        "max_archive_compression_ratio": 100,
+        "max_archive_file_size": 512 * 1024 * 1024,
+        "max_archive_members": 250000,
+        "max_archive_size": 2 * 1024 * 1024 * 1024,
+        "memory_tmp_max_size": 10 * 1024 * 1024,
+        "memory_tmp_root_dir": None,
         "require_v1_or_greater": False,
+        "result_cache_dir": None,
+        "result_cache_max_size": 1024 * 1024 * 1024,
         "run_ansible_doc": True,
         "run_ansible_lint": True,
+        "native_collection_build": False,
         "offline_ansible_lint": True,
+        "pipelined_extraction": False,
         "run_ansible_test": False,
         "run_flake8": False,
+        "selective_extraction": False,
         "tmp_root_dir": None,
     }
 
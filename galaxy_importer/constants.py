@@ -46,6 +46,9 @@ MAX_LENGTH_REQUIRES_ANSIBLE = 255
 MAX_TAGS_COUNT = 20
 NAME_REGEXP = re.compile(r"^(?!.*__)[a-z][0-9a-z_]*$")
 
+# Collection dirs that no loader reads and that ansible-lint excludes
+UNLOADED_COLLECTION_DIRS = ("tests/integration/", "tests/unit/")
+
 # For these extensions we support listing them in the galaxy contents list
 # In the future we may allow any extension to be listed, and call ansible-doc on it
 EDA_EVENT_SOURCE_NAME = "eda/plugins/event_source"
@@ -24,6 +24,10 @@ class AnsibleTestError(ImporterError):
     """Exception when running ansible-test."""
 
 
+class ArchiveLimitError(ImporterError):
+    """Archive exceeds a configured member count, size or compression ratio limit."""
+
+
 class ManifestNotFound(ImporterError):
     pass
 
@@ -33,27 +33,67 @@ from galaxy_importer import loaders, file_parser, schema
 from galaxy_importer.utils.lint_version import get_version_from_metadata, is_lint_patterns_supported
 from galaxy_importer.utils import markup as markup_utils
 from galaxy_importer.utils import chksums
+from galaxy_importer.utils import tool_output
 
 default_logger = logging.getLogger(__name__)
 
 DOCUMENTATION_DIR = "docs"
+DOC_FRAGMENTS_DIR = "plugins/doc_fragments/"
+RUNTIME_FILE_STEM = "meta/runtime"
+LINTED_FILE_EXTENSIONS = (".yml", ".yaml")
+# ansible-lint config and ignore files, a change to any of them may change every finding
+LINT_CONFIG_FILES = (
+    ".ansible-lint",
+    ".ansible-lint-ignore",
+    ".config/ansible-lint.yml",
+    ".config/ansible-lint.yaml",
+    ".config/ansible-lint-ignore.txt",
+)
 
 
 class CollectionLoader:
     """Loads collection and content info."""
 
-    def __init__(self, path, filename, cfg=None, logger=None):
+    def __init__(
+        self,
+        path,
+        filename,
+        cfg=None,
+        logger=None,
+        archive_members=None,
+        file_chksums=None,
+        on_metadata_loaded=None,
+        previous_result=None,
+        rename_path=True,
+        verify_file_manifest=True,
+    ):
         self.log = logger or default_logger
         self.path = path
         self.filename = filename
         self.cfg = cfg
+        # set of paths relative to path, as listed in the artifact tar headers
+        self.archive_members = archive_members
+        # mapping of path to sha256 for archive files hashed during extraction
+        self.file_chksums = file_chksums or {}
+        # called with the collection metadata once the artifact files are verified
+        self.on_metadata_loaded = on_metadata_loaded
+        # import result of a previous version, to reuse results for unchanged files
+        self.previous_result = previous_result or {}
+        # False for an existing collection dir, which must already be named after the
+        # collection, instead of a placeholder extract dir
+        self.rename_path = rename_path
+        self.verify_file_manifest = verify_file_manifest
+        self.rendered_html = None
 
         self.content_objs = None
         self.metadata = None
         self.file_manifest_file = None
+        self.file_manifest = None
         self.docs_blob = None
         self.contents = None
         self.omit_patterns = False
+        self.lint_report = None
+        self.ansible_core_version = None
 
         # build the collections path for lint's module resolution
         self.collections_path = self.path
@@ -82,19 +122,31 @@ class CollectionLoader:
 
         # check chksum for each file in FILES.json
         # Note: Will raise exceptions on file_manifest / FILES.json errors
-        self._check_file_manifest(self.path, self.file_manifest, self.file_manifest_file.name)
+        if self.verify_file_manifest:
+            self._check_file_manifest(self.path, self.file_manifest, self.file_manifest_file.name)
 
-        self._rename_extract_path()
+        if self.rename_path:
+            self._rename_extract_path()
+        else:
+            self._check_path_matches_manifest()
         self._check_filename_matches_manifest()
         self._check_metadata_filepaths()
+        if self.on_metadata_loaded:
+            self.on_metadata_loaded(self.metadata)
+
+        reusable_doc_strings = {}
+        if self._is_previous_version():
+            reusable_doc_strings, self.rendered_html = self._get_reusable_docs()
 
         self.doc_strings = {}
         if self.cfg.run_ansible_doc:
+            self.ansible_core_version = get_version_from_metadata("ansible-core")
             self.doc_strings = loaders.DocStringLoader(
                 path=self.path,
                 fq_collection_name="{}.{}".format(self.metadata.namespace, self.metadata.name),
                 logger=self.log,
                 cfg=self.cfg,
+                reusable_doc_strings=reusable_doc_strings,
             ).load()
 
         self.content_objs = list(self._load_contents())
@@ -123,13 +175,20 @@ class CollectionLoader:
             contents=self.contents,
             requires_ansible=self.requires_ansible,
             patterns=meta_patterns,
+            lint_report=self.lint_report,
+            ansible_core_version=self.ansible_core_version,
         )
 
     def _lint_collection(self):
         """Log ansible-lint output.
 
-        ansible-lint stdout are linter violations, they are logged as warnings and errors,
-        depending on the rule level.
+        ansible-lint stdout are linter violations, they are collected as findings in
+        lint_report. They are logged as warnings, one record per violation when the
+        log_tool_output_lines option is set, otherwise as a single summary record.
+
+        When previous_result has a lint_report from the same ansible-lint version, only
+        roles and files whose sha256 changed are linted, and the previous findings for
+        the rest are reused.
 
         ansible-lint stderr includes info about vars, file discovery,
         summary of linter violations, config suggestions, and raised errors.
@@ -151,10 +210,10 @@ class CollectionLoader:
             "ansible-lint",
             "--profile",
             "production",
-            "--exclude",
-            "tests/integration/",
-            "--exclude",
-            "tests/unit/",
+        ]
+        for exclude_dir in constants.UNLOADED_COLLECTION_DIRS:
+            cmd.extend(["--exclude", exclude_dir])
+        cmd += [
             "--format=pep8",
             "--nocolor",
             "-x",
@@ -163,6 +222,24 @@ class CollectionLoader:
         if self.cfg.offline_ansible_lint:
             cmd.append("--offline")
 
+        file_chksums = self._get_lint_file_chksums()
+        lint_targets, reused_findings = _plan_incremental_lint(
+            self.previous_result.get("lint_report"), lint_version, file_chksums
+        )
+        if lint_targets is not None:
+            self.log.info(
+                f"Reusing ansible-lint findings of unchanged files, linting "
+                f"{len(lint_targets)} changed role(s) and file(s)"
+            )
+            for finding in reused_findings:
+                if self.cfg.log_tool_output_lines:
+                    self.log.warning(tool_output.format_ansible_lint_finding(finding))
+            if not lint_targets:
+                self._set_lint_report(reused_findings, lint_version, file_chksums)
+                self.log.info("...ansible-lint run complete")
+                return
+            cmd += lint_targets
+
         self.log.debug("CMD: " + " ".join(cmd))
         proc = Popen(
             cmd,
@@ -181,8 +258,14 @@ class CollectionLoader:
             proc.kill()
             outs, errs = proc.communicate()
 
+        findings = list(reused_findings)
         for line in outs.splitlines():
-            self.log.warning(line.strip())
+            finding = tool_output.parse_ansible_lint_line(line)
+            if finding:
+                findings.append(finding)
+            if finding is None or self.cfg.log_tool_output_lines:
+                self.log.warning(line.strip())
+        self._set_lint_report(findings, lint_version, file_chksums)
 
         for line in errs.splitlines():
             if line.startswith(constants.ANSIBLE_LINT_ERROR_PREFIXES):
@@ -196,6 +279,28 @@ class CollectionLoader:
 
         self.log.info("...ansible-lint run complete")
 
+    def _set_lint_report(self, findings, lint_version, file_chksums):
+        self.lint_report = tool_output.build_report(
+            findings, version=lint_version, file_chksums=file_chksums
+        )
+        if findings and not self.cfg.log_tool_output_lines:
+            self.log.warning(tool_output.format_summary("ansible-lint", self.lint_report))
+
+    def _get_lint_file_chksums(self):
+        """Return {path: sha256} of the files in FILES.json that ansible-lint checks or
+        reads its config from."""
+        if not self.file_manifest:
+            return {}
+        return {
+            name: chksum
+            for name, chksum in self.file_manifest.files.get_file_chksums().items()
+            if name in LINT_CONFIG_FILES
+            or (
+                name.endswith(LINTED_FILE_EXTENSIONS)
+                and not name.startswith(constants.UNLOADED_COLLECTION_DIRS)
+            )
+        }
+
     def _check_ansible_test_ignore_files(self):  # pragma: no cover
         """Log a warning when ansible test sanity ignore files are present.
         Method excluded from pytest coverage, test exist outside repo via iqe.
@@ -312,6 +417,9 @@ class CollectionLoader:
         Check for any missing files.
         Check for any missing dirs.
 
+        Extra files are found from the archive member names when they were collected
+        during extraction, otherwise by walking path_prefix.
+
         Args:
             path_prefix (str): Any file path prefix we need to add to file paths in the
                 CollectionArtifactFile artifact_file
@@ -333,14 +441,21 @@ class CollectionLoader:
             if artifact_file.ftype != "file":
                 continue
 
-            chksums.check_artifact_file(path_prefix=path_prefix, artifact_file=artifact_file)
+            chksums.check_artifact_file(
+                path_prefix=path_prefix,
+                artifact_file=artifact_file,
+                chksum=self.file_chksums.get(artifact_file.name),
+            )
 
         # check the extract archive for any extra files.
-        filewalker = FileWalker(collection_path=path_prefix)
-        prefix = path_prefix + "/"
-        found_file_set = {fp.removeprefix(prefix) for fp in filewalker.walk()}
-
-        file_manifest_file_set = {artifact_file.name for artifact_file in file_manifest.files}
+        if self.archive_members is not None:
+            found_file_set = set(self.archive_members)
+        else:
+            filewalker = FileWalker(collection_path=path_prefix)
+            prefix = path_prefix + "/"
+            found_file_set = {fp.removeprefix(prefix) for fp in filewalker.walk()}
+
+        file_manifest_file_set = set(file_manifest.files.names)
         # The artifact contains MANIFEST.json and FILES.JSON, but they aren't
         # in file list in FILES.json so add them so we match expected.
         file_manifest_file_set.add("MANIFEST.json")
@@ -366,6 +481,14 @@ class CollectionLoader:
         self.path = new_name_dir
         self.log.debug(f"Renamed extract dir to: {self.path}")
 
+    def _check_path_matches_manifest(self):
+        ns_dir, name_dir = self.path.rstrip(os.sep).split(os.sep)[-2:]
+        if (ns_dir, name_dir) != (self.metadata.namespace, self.metadata.name):
+            raise exc.ManifestValidationError(
+                f'Collection dir "{ns_dir}/{name_dir}" did not match metadata '
+                f'"{self.metadata.namespace}/{self.metadata.name}"'
+            )
+
     def _check_filename_matches_manifest(self):
         if not self.filename:
             return
@@ -409,7 +532,13 @@ class CollectionLoader:
         for content_type, rel_path in sorted(found_contents):
             loader_cls = loaders.get_loader_cls(content_type)
             loader = loader_cls(
-                content_type, rel_path, self.path, self.doc_strings, self.cfg, self.log
+                content_type,
+                rel_path,
+                self.path,
+                self.doc_strings,
+                self.cfg,
+                self.log,
+                rendered_html=self.rendered_html,
             )
             content_obj = loader.load()
 
@@ -455,14 +584,16 @@ class CollectionLoader:
         if not readme:
             raise exc.ImporterError("No collection readme found")
         rendered_readme = schema.RenderedDocFile(
-            name=readme.name, html=markup_utils.get_html(readme)
+            name=readme.name, html=markup_utils.get_html(readme, self.rendered_html)
         )
 
         rendered_doc_files = []
         doc_files = markup_utils.get_doc_files(os.path.join(self.path, DOCUMENTATION_DIR))
         if doc_files:
             rendered_doc_files = [
-                schema.RenderedDocFile(name=f.name, html=markup_utils.get_html(f))
+                schema.RenderedDocFile(
+                    name=f.name, html=markup_utils.get_html(f, self.rendered_html)
+                )
                 for f in doc_files
             ]
 
@@ -472,6 +603,79 @@ class CollectionLoader:
             contents=contents,
         )
 
+    def _is_previous_version(self):
+        """Return True when previous_result is of this collection, with its FILES.json."""
+        previous_metadata = self.previous_result.get("metadata") or {}
+        return (
+            bool(self.previous_result.get("file_manifest"))
+            and previous_metadata.get("namespace") == self.metadata.namespace
+            and previous_metadata.get("name") == self.metadata.name
+        )
+
+    def _get_reusable_docs(self):
+        """Return (doc strings by plugin type and name, html by sha256) of previous_result.
+
+        Doc strings are reused for plugins whose files, and files next to them with the
+        same name such as sidecar docs, are unchanged. None are reused when a doc
+        fragment or meta/runtime.yml changed, or when the previous doc strings were not
+        loaded by this version of ansible-core. Rendered html is reused for
+        documentation files with the same sha256 as before.
+        """
+        previous_chksums = {
+            f["name"]: f.get("chksum_sha256")
+            for f in self.previous_result["file_manifest"].get("files", [])
+            if f.get("ftype") == "file"
+        }
+        chksums = self.file_manifest.files.get_file_chksums()
+        changed_stems = {
+            os.path.splitext(path)[0]
+            for path in chksums.keys() | previous_chksums.keys()
+            if chksums.get(path) != previous_chksums.get(path)
+        }
+        docs_blob = self.previous_result.get("docs_blob") or {}
+
+        reusable_doc_strings = {}
+        fq_collection_name = f"{self.metadata.namespace}.{self.metadata.name}"
+        reuse_doc_strings = (
+            self.previous_result.get("ansible_core_version")
+            == get_version_from_metadata("ansible-core")
+            and RUNTIME_FILE_STEM not in changed_stems
+            and not any(stem.startswith(DOC_FRAGMENTS_DIR) for stem in changed_stems)
+        )
+        for item in docs_blob.get("contents", []) if reuse_doc_strings else []:
+            doc_strings = item.get("doc_strings") or {}
+            rel_path = _get_collection_rel_path((doc_strings.get("doc") or {}).get("filename"))
+            if not rel_path or os.path.splitext(rel_path)[0] in changed_stems:
+                continue
+            doc = {**doc_strings["doc"], "filename": os.path.join(self.path, rel_path)}
+            reusable_doc_strings.setdefault(item["content_type"], {})[
+                f"{fq_collection_name}.{item['content_name']}"
+            ] = {**doc_strings, "doc": doc}
+
+        previous_html = [
+            (self.previous_result["metadata"].get("readme"), docs_blob.get("collection_readme"))
+        ]
+        previous_html += [
+            (f"{DOCUMENTATION_DIR}/{f.get('name')}", f)
+            for f in docs_blob.get("documentation_files") or []
+        ]
+        previous_html += [
+            (
+                "roles/{}/{}".format(
+                    item["content_name"].replace(".", "/"), item.get("readme_file")
+                ),
+                {"html": item.get("readme_html")},
+            )
+            for item in docs_blob.get("contents", [])
+            if item.get("content_type") == constants.ContentType.ROLE.value
+        ]
+        rendered_html = {
+            previous_chksums[path]: rendered["html"]
+            for path, rendered in previous_html
+            if rendered and rendered.get("html") is not None and previous_chksums.get(path)
+        }
+        return reusable_doc_strings, rendered_html
+
     def _check_metadata_filepaths(self):
         # NOTE: This may be redundant if _check_file_manifest() looks for missing files
         paths = []
@@ -481,3 +685,49 @@ class CollectionLoader:
         for path in paths:
             if not os.path.exists(path):
                 raise exc.ManifestValidationError(f"Could not find file {os.path.basename(path)}")
+
+
+def _get_collection_rel_path(filename):
+    """Return filename relative to the collection dir under ansible_collections, or None."""
+    if not filename:
+        return None
+    parts = filename.split("/")
+    if "ansible_collections" not in parts:
+        return None
+    ix = parts.index("ansible_collections")
+    return "/".join(parts[ix + 3 :]) or None
+
+
+def _get_lint_target(path):
+    """Return the role dir of path when in a role, as roles are linted as a whole."""
+    parts = path.split("/")
+    if parts[0] == "roles" and len(parts) > 2:
+        return "/".join(parts[:2])
+    return path
+
+
+def _plan_incremental_lint(previous_report, lint_version, file_chksums):
+    """Return (lint targets, reused findings) when the previous report can be reused.
+
+    Returns (None, []) when the whole collection needs linting, such as when the
+    ansible-lint config changed.
+    """
+    if not previous_report or not file_chksums or previous_report.get("version") != lint_version:
+        return None, []
+
+    previous_chksums = previous_report.get("file_chksums") or {}
+    if any(file_chksums.get(path) != previous_chksums.get(path) for path in LINT_CONFIG_FILES):
+        return None, []
+
+    targets = {_get_lint_target(path) for path in file_chksums if path not in LINT_CONFIG_FILES}
+    changed_targets = {
+        _get_lint_target(path)
+        for path in file_chksums.keys() | previous_chksums.keys()
+        if file_chksums.get(path) != previous_chksums.get(path)
+    }
+    reused_findings = [
+        schema.Finding(**finding)
+        for finding in previous_report.get("findings", [])
+        if _get_lint_target(finding["path"]) in targets - changed_targets
+    ]
+    return sorted(changed_targets & targets), reused_findings
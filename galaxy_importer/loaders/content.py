@@ -34,13 +34,23 @@ default_logger = logging.getLogger(__name__)
 
 
 class ContentLoader(metaclass=abc.ABCMeta):
-    def __init__(self, content_type, rel_path, root, doc_strings=None, cfg=None, logger=None):
+    def __init__(
+        self,
+        content_type,
+        rel_path,
+        root,
+        doc_strings=None,
+        cfg=None,
+        logger=None,
+        rendered_html=None,
+    ):
         """
         :param content_type: Content type.
         :param rel_path: Path to content file or dir, relative to root path.
         :param root: Collection root path.
         :param doc_strings: ansible-doc output for all plugins in collection
         :param logger: Optional logger instance.
+        :param rendered_html: Optional dict of html already rendered, by sha256 of the file.
 
         ==Example==
         Given:
@@ -63,6 +73,7 @@ class ContentLoader(metaclass=abc.ABCMeta):
         self.doc_strings = doc_strings or {}
         self.cfg = cfg
         self.log = logger or default_logger
+        self.rendered_html = rendered_html
 
     @abc.abstractmethod
     def load(self):
@@ -257,7 +268,7 @@ class RoleLoader(ContentLoader):
             content_type=self.content_type,
             description=description,
             readme_file=readme.name,
-            readme_html=markup_utils.get_html(readme),
+            readme_html=markup_utils.get_html(readme, self.rendered_html),
         )
 
     @staticmethod
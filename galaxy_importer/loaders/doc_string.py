@@ -15,14 +15,16 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
-from copy import deepcopy
+import concurrent.futures
 import json
 import logging
 import os
 import shutil
+import tempfile
 from subprocess import Popen, PIPE
 
 from galaxy_importer import constants
+from galaxy_importer.utils import json_stream
 
 default_logger = logging.getLogger(__name__)
 
@@ -30,10 +32,20 @@ default_logger = logging.getLogger(__name__)
 class DocStringLoader:
     """Process ansible-doc doc strings for entire collection.
 
-    Load by calling ansible-doc once in batch for each plugin type."""
+    Load by calling ansible-doc once in batch for each plugin type, or on chunks of
+    ansible_doc_chunk_size plugins in parallel when it is set. Plugins found in
+    reusable_doc_strings, by plugin type and fully qualified name, are not passed to
+    ansible-doc, and their given doc strings are used."""
 
     def __init__(
-        self, path, fq_collection_name, cfg, logger=None, plugin_types=None, module_path=None
+        self,
+        path,
+        fq_collection_name,
+        cfg,
+        logger=None,
+        plugin_types=None,
+        module_path=None,
+        reusable_doc_strings=None,
     ):
         self.path = path
         self.fq_collection_name = fq_collection_name
@@ -41,6 +53,7 @@ class DocStringLoader:
         self.log = logger or default_logger
         self.plugin_types = plugin_types
         self.module_path = module_path
+        self.reusable_doc_strings = reusable_doc_strings or {}
 
     def load(self):
         self.log.info("Getting doc strings via ansible-doc")
@@ -59,8 +72,17 @@ class DocStringLoader:
             if not plugins:
                 continue
 
-            data = self._run_ansible_doc(plugin_type, plugins)
-            data = self._process_doc_strings(data)
+            reusable = self.reusable_doc_strings.get(plugin_type, {})
+            plugins_to_load = [plugin for plugin in plugins if plugin not in reusable]
+            data = {}
+            if plugins_to_load:
+                data = self._load_doc_strings(plugin_type, plugins_to_load)
+            if len(plugins_to_load) < len(plugins):
+                self.log.info(
+                    f"Reusing doc strings of {len(plugins) - len(plugins_to_load)} "
+                    f"unchanged {plugin_type} plugins"
+                )
+                data.update({plugin: reusable[plugin] for plugin in plugins if plugin in reusable})
             docs[plugin_type] = data
 
         return docs
@@ -125,7 +147,78 @@ class DocStringLoader:
             return {}
         return json.loads(stdout)
 
+    def _load_doc_strings(self, plugin_type, plugins):
+        """Return the transformed doc strings of plugins.
+
+        With ansible_doc_chunk_size set, ansible-doc is run on chunks of plugins in
+        parallel, and chunks it fails on are split to skip only the failing plugins.
+        """
+        chunk_size = int(self.cfg.ansible_doc_chunk_size or 0)
+        if chunk_size <= 0:
+            return self._run_ansible_doc(plugin_type, plugins)
+
+        chunks = [plugins[ix : ix + chunk_size] for ix in range(0, len(plugins), chunk_size)]
+        workers = min(max(int(self.cfg.ansible_doc_workers), 1), len(chunks))
+        doc_strings = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._run_ansible_doc_bisect, plugin_type, chunk)
+                for chunk in chunks
+            ]
+            for future in futures:
+                doc_strings.update(future.result())
+        return doc_strings
+
     def _run_ansible_doc(self, plugin_type, plugins):
+        """Run ansible-doc for plugins, returning their doc strings transformed for the UI.
+
+        The output is parsed one plugin at a time as it is read, and each plugin is
+        transformed as it arrives, so the whole output is never held in memory.
+        """
+        doc_strings, error = self._exec_ansible_doc(plugin_type, plugins)
+        if error:
+            self.log.error(error)
+            return {}
+        return doc_strings
+
+    def _run_ansible_doc_bisect(self, plugin_type, plugins, result=None, split=False):
+        """Run ansible-doc for plugins, running it again on each half when it fails.
+
+        When both halves of the first split fail too, the failure is taken to not
+        be caused by single plugins (e.g. a broken ansible-core or a timeout), and
+        the plugins are skipped rather than bisected down one by one.
+
+        :param result: (doc strings, error) of ansible-doc already run on plugins.
+        :param split: Whether plugins is a half of a split chunk.
+        """
+        doc_strings, error = result or self._exec_ansible_doc(plugin_type, plugins)
+        if not error:
+            return doc_strings
+        if len(plugins) == 1:
+            self.log.error(error)
+            return {}
+
+        self.log.debug(
+            f"ansible-doc failed on {len(plugins)} {plugin_type} plugins, running it on each half"
+        )
+        middle = len(plugins) // 2
+        halves = [plugins[:middle], plugins[middle:]]
+        results = [self._exec_ansible_doc(plugin_type, half) for half in halves]
+        if not split and all(half_error for _, half_error in results):
+            self.log.error(
+                f"ansible-doc failed on both halves of the plugins, skipping them: {error}"
+            )
+            return {}
+
+        doc_strings = {}
+        for half, half_result in zip(halves, results):  # noqa: B905
+            doc_strings.update(
+                self._run_ansible_doc_bisect(plugin_type, half, half_result, split=True)
+            )
+        return doc_strings
+
+    def _exec_ansible_doc(self, plugin_type, plugins):
+        """Run ansible-doc for plugins, returning (doc strings, error message or None)."""
         if self.module_path:
             # Use of -M allows us to get docs from any plugin type by treating
             # it as a module, by telling ansible-doc to look at a specific
@@ -140,20 +233,31 @@ class DocStringLoader:
             *plugins,
         ]
         self.log.debug("CMD: {}".format(" ".join(cmd)))
-        proc = Popen(cmd, cwd=self._collections_path, stdout=PIPE, stderr=PIPE)
-        stdout, stderr = proc.communicate()
-        if proc.returncode != 0:
-            self.log.error(
-                'Error running ansible-doc: cmd="{cmd}" returncode="{rc}" {err}'.format(
-                    cmd=" ".join(cmd), rc=proc.returncode, err=stderr
+        # stderr goes to a file, so ansible-doc does not block on it while stdout is read
+        with tempfile.TemporaryFile() as stderr_file:
+            proc = Popen(cmd, cwd=self._collections_path, stdout=PIPE, stderr=stderr_file)
+            try:
+                with proc.stdout:
+                    doc_strings = self._process_doc_strings(
+                        json_stream.iter_object_items(proc.stdout)
+                    )
+            except ValueError:
+                if proc.wait() == 0:
+                    raise
+            if proc.wait() != 0:
+                stderr_file.seek(0)
+                error = 'Error running ansible-doc: cmd="{cmd}" returncode="{rc}" {err}'.format(
+                    cmd=" ".join(cmd), rc=proc.returncode, err=stderr_file.read()
                 )
-            )
-            return {}
-        return json.loads(stdout)
+                return {}, error
+        return doc_strings, None
 
     def _process_doc_strings(self, doc_strings):
+        """Transform doc strings, given as a dict or an iterable of (plugin, doc) items."""
+        if isinstance(doc_strings, dict):
+            doc_strings = doc_strings.items()
         processed_doc_strings = {}
-        for plugin_key, value in doc_strings.items():
+        for plugin_key, value in doc_strings:
             processed_doc_strings[plugin_key] = self._transform_doc_strings(value, self.log)
         return processed_doc_strings
 
@@ -162,16 +266,16 @@ class DocStringLoader:
         """Transform data meant for UI tables into format suitable for UI."""
 
         def dict_to_named_list(dict_of_dict):
-            """Return new list of dicts for given dict of dicts."""
+            """Return new list of dicts for given dict of dicts.
+
+            Each row is a shallow copy of its dict with the name added, so the
+            values of the parsed ansible-doc output are reused rather than copied.
+            """
             try:
-                return [{"name": key, **deepcopy(dict_of_dict[key])} for key in dict_of_dict]
+                return [{"name": key, **value} for key, value in dict_of_dict.items()]
             except TypeError:
                 logger.warning(f"Expected this to be a dictionary of dictionaries: {dict_of_dict}")
-                return [
-                    {"name": key, **deepcopy(dict_of_dict[key])}
-                    for key in dict_of_dict
-                    if isinstance(key, dict)
-                ]
+                return []
 
         def handle_nested_tables(obj, table_key):
             """Recurse over dict to replace nested tables with updated format."""
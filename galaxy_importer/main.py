@@ -16,7 +16,7 @@
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
 import argparse
-import json
+import contextlib
 import logging
 import os
 import re
@@ -25,10 +25,12 @@ import sys
 from galaxy_importer import collection, legacy_role, markdown
 from galaxy_importer import config
 from galaxy_importer.exceptions import ImporterError
+from galaxy_importer.utils import result_writer
 
 FILENAME_REGEXP = re.compile(
     r"^(?P<namespace>\w+)-(?P<name>\w+)-(?P<version>[0-9a-zA-Z.+-]+)\.tar\.gz$"
 )
+OUTPUT_FILENAME = "importer_result.json"
 logger = logging.getLogger(__name__)
 
 
@@ -42,10 +44,12 @@ def main(args=None):
     if not data:
         return 1
 
-    if args.print_result:
-        print(json.dumps(data, indent=4))
-
-    write_output_file(data)
+    write_output_file(
+        data,
+        print_result=args.print_result,
+        indent=None if args.compact_result else 4,
+        compression=args.compress_result,
+    )
 
 
 def setup_logger(cfg):
@@ -82,12 +86,35 @@ def parse_args(args):
         dest="output_path",
         help="path where built collection will be stored",
     )
+    parser.add_argument(
+        "--collection-dir",
+        dest="collection_dir",
+        help="ansible_collections/<namespace>/<name> dir of a collection to import in place",
+    )
+    parser.add_argument(
+        "--no-verify-files",
+        dest="verify_files",
+        action="store_false",
+        help="do not check --collection-dir files against FILES.json",
+    )
     parser.add_argument(
         "--print-result",
         dest="print_result",
         action="store_true",
         help="print importer result to console",
     )
+    parser.add_argument(
+        "--compact-result",
+        dest="compact_result",
+        action="store_true",
+        help="write importer result as JSON without indentation",
+    )
+    parser.add_argument(
+        "--compress-result",
+        dest="compress_result",
+        choices=result_writer.COMPRESSIONS,
+        help="compress the importer result file",
+    )
     parser.add_argument(
         "--legacy-role",
         dest="legacy_role",
@@ -109,6 +136,9 @@ def parse_args(args):
 def call_importer(args, cfg):  # pragma: no cover
     """Returns result of galaxy_importer import process.
 
+    Collection imports return the ImportResult rather than a dict copy of it, as
+    write_output_file() serializes it as it is.
+
     :param file: Artifact file to import.
 
     Method excluded from pytest unit test coverage, tests exist in tests/integration
@@ -139,6 +169,21 @@ def call_importer(args, cfg):  # pragma: no cover
             return None
         except Exception as e:
             logger.exception(f"Unexpected error occurred: {e}")
+    elif args.collection_dir:
+        try:
+            data = collection.import_collection_dir(
+                args.collection_dir,
+                logger=logger,
+                cfg=cfg,
+                verify_files=args.verify_files,
+                as_dict=False,
+            )
+        except ImporterError as e:
+            logger.error(f"The import failed for the following reason: {e!s}")
+            return None
+        except Exception as e:
+            logger.exception(f"Unexpected error occurred: {e!s}")
+            return None
     else:
         if not args.file:
             return collection.import_collection(
@@ -154,7 +199,9 @@ def call_importer(args, cfg):  # pragma: no cover
 
         with open(args.file, "rb") as fh:
             try:
-                data = collection.import_collection(fh, filename, logger=logger, cfg=cfg)
+                data = collection.import_collection(
+                    fh, filename, logger=logger, cfg=cfg, as_dict=False
+                )
             except ImporterError as e:
                 logger.error(f"The import failed for the following reason: {e!s}")
                 return None
@@ -166,9 +213,30 @@ def call_importer(args, cfg):  # pragma: no cover
     return data
 
 
-def write_output_file(data):
-    with open("importer_result.json", "w") as output_file:
-        output_file.write(json.dumps(data, indent=4))
+def write_output_file(
+    data, print_result=False, indent=4, compression=None, output_file_path=OUTPUT_FILENAME
+):
+    """Write data to importer_result.json, also printing it when print_result is set.
+
+    The result is serialized once, and written to the file and stdout as it is.
+    With compression, the file name has the suffix of the compression, like .gz.
+    The file is written under a temporary name and renamed once complete, so an
+    error while serializing data does not leave a truncated result file.
+    """
+    filename = output_file_path + result_writer.FILE_SUFFIXES[compression]
+    dirname, basename = os.path.split(filename)
+    tmp_filename = os.path.join(dirname, f".{basename}.{os.getpid()}.tmp")
+    streams = [sys.stdout] if print_result else []
+    try:
+        with result_writer.open_result_file(tmp_filename, compression) as output_file:
+            result_writer.write_result(data, output_file, *streams, indent=indent)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_filename)
+        raise
+    if print_result:
+        print()
 
 
 if __name__ == "__main__":
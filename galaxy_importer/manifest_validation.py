@@ -0,0 +1,173 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Validate the MANIFEST.json and FILES.json of many collection artifacts.
+
+Artifacts are not extracted: each one is read as a tar stream up to the last
+manifest member needed, which is near the start of artifacts built by
+`ansible-galaxy collection build`.
+"""
+
+import concurrent.futures
+import hashlib
+import tarfile
+from typing import NamedTuple
+
+from galaxy_importer import config, schema
+from galaxy_importer import exceptions as exc
+from galaxy_importer.utils import chksums
+
+MANIFEST_FILENAME = "MANIFEST.json"
+DEFAULT_FILE_MANIFEST_FILENAME = "FILES.json"
+CHUNKSIZE = 16
+
+# config of the worker process, set by _init_worker()
+_worker_config = None
+
+
+class ManifestValidationResult(NamedTuple):
+    path: str
+    collection_info: schema.CollectionInfo = None
+    # number of entries in FILES.json
+    file_count: int = None
+    error: str = None
+
+    @property
+    def valid(self):
+        return self.error is None
+
+
+def validate_artifacts(paths, cfg=None, processes=None, chunksize=CHUNKSIZE):
+    """Validate the manifests of the collection artifacts in paths in a process pool.
+
+    The config is loaded once, and set once per worker process.
+
+    :param paths: Iterable of collection artifact paths.
+    :param processes: Number of worker processes, defaults to the number of CPUs.
+        With 1, artifacts are validated in this process.
+    :param chunksize: Number of paths sent to a worker at a time.
+
+    :return: Iterator of ManifestValidationResult, in the order of paths.
+    """
+    if not cfg:
+        config_data = config.ConfigFile.load()
+        cfg = config.Config(config_data=config_data)
+
+    if processes == 1:
+        return _validate_in_process(paths, cfg)
+    return _validate_in_pool(paths, cfg, processes, chunksize)
+
+
+def _validate_in_process(paths, cfg):
+    global _worker_config
+    previous_config = _worker_config
+    _worker_config = cfg
+    try:
+        with schema.validation_config(cfg):
+            for path in paths:
+                yield _validate_artifact(path)
+    finally:
+        _worker_config = previous_config
+
+
+def _validate_in_pool(paths, cfg, processes, chunksize):
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_worker, initargs=(cfg,)
+    ) as executor:
+        yield from executor.map(_validate_artifact, paths, chunksize=chunksize)
+
+
+def _init_worker(cfg):
+    global _worker_config
+    _worker_config = cfg
+    schema.set_validation_config(cfg)
+
+
+def _validate_artifact(path):
+    try:
+        manifest, file_manifest = _load_manifests(path, _worker_config.max_archive_file_size)
+    except (
+        exc.ImporterError,
+        ValueError,
+        TypeError,
+        KeyError,
+        OSError,
+        EOFError,
+        tarfile.TarError,
+    ) as e:
+        return ManifestValidationResult(path=path, error=str(e) or e.__class__.__name__)
+
+    return ManifestValidationResult(
+        path=path,
+        collection_info=manifest.collection_info,
+        file_count=len(file_manifest.files),
+    )
+
+
+def _load_manifests(path, max_member_size):
+    """Return the CollectionArtifactManifest and CollectionArtifactFileManifest of path.
+
+    :raises exc.ManifestNotFound: When the artifact has no MANIFEST.json.
+    :raises exc.ManifestValidationError: When the manifests are invalid.
+    """
+    manifest = None
+    file_manifest_name = DEFAULT_FILE_MANIFEST_FILENAME
+    file_manifest_data = None
+
+    with tarfile.open(path, "r|*") as tf:
+        for member in tf:
+            if member.name not in (MANIFEST_FILENAME, file_manifest_name):
+                continue
+            if not member.isfile():
+                raise exc.ManifestValidationError(f"{member.name} is not a regular file")
+            if member.size > max_member_size:
+                raise exc.ArchiveLimitError(
+                    f"{member.name} is larger than the maximum file size of {max_member_size} bytes"
+                )
+            data = tf.extractfile(member).read()
+
+            if member.name == MANIFEST_FILENAME:
+                try:
+                    manifest = schema.CollectionArtifactManifest.parse(data)
+                except ValueError as e:
+                    raise exc.ManifestValidationError(str(e)) from e
+                file_manifest_name = manifest.file_manifest_file.name
+                if file_manifest_name != DEFAULT_FILE_MANIFEST_FILENAME:
+                    file_manifest_data = None
+            else:
+                file_manifest_data = data
+
+            if manifest and file_manifest_data is not None:
+                break
+
+    if manifest is None:
+        raise exc.ManifestNotFound("No manifest found in collection")
+    if file_manifest_data is None:
+        msg = f"The file ({file_manifest_name}) was not found"
+        raise exc.CollectionArtifactFileNotFound(missing_file=file_manifest_name, msg=msg)
+
+    chksums.check_artifact_file(
+        path_prefix=None,
+        artifact_file=manifest.file_manifest_file,
+        chksum=hashlib.sha256(file_manifest_data).hexdigest(),
+    )
+
+    try:
+        file_manifest = schema.CollectionArtifactFileManifest.parse(file_manifest_data)
+    except ValueError as e:
+        raise exc.ManifestValidationError(str(e)) from e
+    return manifest, file_manifest
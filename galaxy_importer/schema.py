@@ -15,6 +15,8 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import collections.abc
+import contextlib
 import json
 import re
 
@@ -41,6 +43,10 @@ MAX_LEGACY_ROLE_LENGTH_LICENSE = 50
 MAX_LEGACY_ROLE_LENGTH_DESCRIPTION = 255
 
 SHA1_LEN = 40
+
+# config used by CollectionInfo validators, see set_validation_config()
+_validation_config = None
+
 REQUIRED_TAG_LIST = [
     "ai",
     "application",
@@ -68,6 +74,33 @@ def convert_none_to_empty_dict(val):
     return val
 
 
+def set_validation_config(cfg):
+    """Use cfg for CollectionInfo validation in this process.
+
+    With None, the config file is loaded again for each validation.
+    """
+    global _validation_config
+    _validation_config = cfg
+
+
+@contextlib.contextmanager
+def validation_config(cfg):
+    """Use cfg for CollectionInfo validation in this process within the context,
+    restoring the previous config on exit."""
+    previous = _validation_config
+    set_validation_config(cfg)
+    try:
+        yield
+    finally:
+        set_validation_config(previous)
+
+
+def _get_validation_config():
+    if _validation_config is not None:
+        return _validation_config
+    return config.Config(config_data=config.ConfigFile.load())
+
+
 _FILENAME_RE = re.compile(
     r"^(?P<namespace>\w+)-(?P<name>\w+)-(?P<version>[0-9a-zA-Z.+-]+)\.tar\.gz$"
 )
@@ -164,8 +197,7 @@ class CollectionInfo:
         if len(value) > MAX_LENGTH_VERSION:
             self.value_error(f"'version' must not be greater than {MAX_LENGTH_VERSION} characters")
 
-        config_data = config.ConfigFile.load()
-        cfg = config.Config(config_data=config_data)
+        cfg = _get_validation_config()
         if cfg.require_v1_or_greater and semantic_version.Version(value) < semantic_version.Version(
             "1.0.0"
         ):
@@ -241,8 +273,7 @@ class CollectionInfo:
         """
         no_req_tag_err = f"At least one tag required from tag list: {', '.join(REQUIRED_TAG_LIST)}"
 
-        config_data = config.ConfigFile.load()
-        cfg = config.Config(config_data=config_data)
+        cfg = _get_validation_config()
         if cfg.check_required_tags and not value:
             self.value_error(no_req_tag_err)
 
@@ -316,7 +347,7 @@ class CollectionInfo:
         )
 
 
-@attr.s(frozen=True)
+@attr.s(frozen=True, slots=True)
 class CollectionArtifactFile:
     name = attr.ib()
     ftype = attr.ib()
@@ -354,23 +385,137 @@ class CollectionArtifactManifest:
         return cls(**meta)
 
 
-def convert_list_to_artifact_file_list(val):
-    """Convert a list of dicts with file info into list of CollectionArtifactFile"""
-
-    new_list = []
-    for file_item in val:
-        if isinstance(file_item, CollectionArtifactFile):
-            new_list.append(file_item)
+class CollectionArtifactFileList(collections.abc.Sequence):
+    """Compact, read-only list of FILES.json entries.
+
+    Entries are kept in parallel arrays: names, a byte per entry indexing its
+    (ftype, chksum_type, has digest) kind, and 32 bytes of sha256 digest per entry.
+    A CollectionArtifactFile is created only when an entry is accessed. Entries
+    that do not fit the arrays, such as a chksum_sha256 that is not a lowercase
+    sha256 hex digest, are kept as CollectionArtifactFile in overrides.
+    """
+
+    __slots__ = ("_codes", "_digests", "_kind_codes", "_kinds", "_overrides", "names")
+
+    DIGEST_SIZE = 32
+    MAX_KINDS = 255
+    # code of entries kept in overrides
+    OVERRIDE_CODE = 255
+
+    def __init__(self, entries=()):
+        self.names = []
+        self._kinds = []
+        self._kind_codes = {}
+        self._codes = bytearray()
+        self._digests = bytearray()
+        self._overrides = {}
+        for entry in entries:
+            self._append(entry)
+
+    def _append(self, entry):
+        if isinstance(entry, CollectionArtifactFile):
+            name, ftype, chksum_type, chksum = (
+                entry.name,
+                entry.ftype,
+                entry.chksum_type,
+                entry.chksum_sha256,
+            )
+            fits = entry.src_name is None and entry.format == 1
         else:
-            artifact_file = CollectionArtifactFile(
-                name=file_item["name"],
-                ftype=file_item["ftype"],
-                chksum_type=file_item.get("chksum_type"),
-                chksum_sha256=file_item.get("chksum_sha256"),
+            name, ftype = entry["name"], entry["ftype"]
+            chksum_type, chksum = entry.get("chksum_type"), entry.get("chksum_sha256")
+            fits = True
+            entry = None
+
+        digest = _sha256_digest(chksum) if fits and chksum is not None else None
+        kind = (ftype, chksum_type, chksum is not None)
+        try:
+            code = self._kind_codes.get(kind)
+        except TypeError as e:
+            raise exc.ManifestValidationError(
+                f"Invalid ftype or chksum_type of file manifest entry {name!r}: {e}"
+            ) from e
+        if code is None and fits and len(self._kinds) < self.MAX_KINDS:
+            code = self._kind_codes[kind] = len(self._kinds)
+            self._kinds.append(kind)
+        if code is None or (chksum is not None and digest is None) or not isinstance(name, str):
+            code = self.OVERRIDE_CODE
+            self._overrides[len(self.names)] = entry or CollectionArtifactFile(
+                name=name, ftype=ftype, chksum_type=chksum_type, chksum_sha256=chksum
             )
-            new_list.append(artifact_file)
 
-    return new_list
+        self.names.append(name)
+        self._codes.append(code)
+        self._digests += digest or bytes(self.DIGEST_SIZE)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[ix] for ix in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("file list index out of range")
+        code = self._codes[index]
+        if code == self.OVERRIDE_CODE:
+            return self._overrides[index]
+        ftype, chksum_type, has_digest = self._kinds[code]
+        return CollectionArtifactFile(
+            name=self.names[index],
+            ftype=ftype,
+            chksum_type=chksum_type,
+            chksum_sha256=self._get_chksum(index) if has_digest else None,
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, CollectionArtifactFileList)):
+            if len(self) != len(other):
+                return False
+            # zip(strict=True) needs python 3.10, the lengths are equal here
+            return all(a == b for a, b in zip(self, other))  # noqa: B905
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CollectionArtifactFileList({list(self)!r})"
+
+    def _get_chksum(self, index):
+        start = index * self.DIGEST_SIZE
+        return self._digests[start : start + self.DIGEST_SIZE].hex()
+
+    def get_file_chksums(self):
+        """Return {name: chksum_sha256} of the entries with ftype file, without views."""
+        chksums = {}
+        # names and _codes have an entry per file, zip(strict=True) needs python 3.10
+        for index, (name, code) in enumerate(zip(self.names, self._codes)):  # noqa: B905
+            if code == self.OVERRIDE_CODE:
+                entry = self._overrides[index]
+                if entry.ftype == "file":
+                    chksums[name] = entry.chksum_sha256
+                continue
+            ftype, _, has_digest = self._kinds[code]
+            if ftype == "file":
+                chksums[name] = self._get_chksum(index) if has_digest else None
+        return chksums
+
+
+def _sha256_digest(chksum):
+    """Return the bytes of a lowercase sha256 hex digest, None for other values."""
+    if not isinstance(chksum, str) or len(chksum) != 64:
+        return None
+    try:
+        digest = bytes.fromhex(chksum)
+    except ValueError:
+        return None
+    return digest if digest.hex() == chksum else None
+
+
+def convert_list_to_artifact_file_list(val):
+    """Convert a list of dicts with file info into a CollectionArtifactFileList"""
+    if isinstance(val, CollectionArtifactFileList):
+        return val
+    return CollectionArtifactFileList(val)
 
 
 @attr.s(frozen=True)
@@ -583,6 +728,31 @@ class PatternsMetadata:
     aap_resources = attr.ib(factory=dict)
 
 
+@attr.s(frozen=True)
+class Finding:
+    """A problem reported by ansible-lint or ansible-test sanity."""
+
+    rule = attr.ib()
+    path = attr.ib(default=None)
+    line = attr.ib(default=None)
+    severity = attr.ib(default="error")
+    message = attr.ib(default="")
+
+
+@attr.s(frozen=True)
+class ToolReport:
+    """Findings of a tool run, and their counts by severity and rule.
+
+    version and file_chksums record the tool version and the sha256 of the files it
+    checked, so findings for unchanged files can be reused by a later import.
+    """
+
+    findings = attr.ib(factory=list, type=Finding)
+    summary = attr.ib(factory=dict)
+    version = attr.ib(default=None)
+    file_chksums = attr.ib(factory=dict)
+
+
 @attr.s(frozen=True)
 class ImportResult:
     """Result of the import process, collection metadata, and contents."""
@@ -593,6 +763,10 @@ class ImportResult:
     custom_license = attr.ib(default=None)
     requires_ansible = attr.ib(default=None)
     patterns = attr.ib(factory=list, type=PatternsMetadata)
+    lint_report = attr.ib(default=None, type=ToolReport)
+    ansible_test_report = attr.ib(default=None, type=ToolReport)
+    # version of ansible-core that loaded the doc strings, None when not loaded
+    ansible_core_version = attr.ib(default=None)
 
 
 @attr.s(frozen=True)
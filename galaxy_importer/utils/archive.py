@@ -0,0 +1,357 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Collection artifact archive utilities.
+
+PipelinedExtractor splits extraction into stages that run on separate threads:
+
+* inflate: read compressed bytes and inflate them into a bounded queue of chunks
+* parse: read tar headers and member data from the queue (the calling thread)
+* write: hash and write member files from a bounded pool of writer threads
+
+zlib and hashlib release the GIL on large buffers, so the stages overlap on
+multi-core hosts.
+
+link_or_copy and copy_fileobj hand an artifact to another path without passing its
+contents through Python, when the filesystem and platform allow it.
+"""
+
+import concurrent.futures
+import errno
+import hashlib
+import os
+import queue
+import shutil
+import tarfile
+import threading
+import zlib
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+GZIP_MAGIC = b"\x1f\x8b"
+READ_SIZE = 256 * 1024
+QUEUE_MAX_CHUNKS = 64
+# members larger than this are written by the parse thread in blocks,
+# instead of being held in memory for a writer thread
+MAX_BUFFERED_FILE_SIZE = 1024 * 1024
+# small files are handed to writer threads in batches
+BATCH_MAX_FILES = 64
+DEFAULT_WRITER_THREADS = min(4, os.cpu_count() or 1)
+
+# ioctl to clone a file's extents (reflink) on btrfs, xfs and other Linux filesystems
+FICLONE = 0x40049409
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+
+_EOF = object()
+
+
+class InflateReader:
+    """File-like reader of inflated chunks, produced by a background thread."""
+
+    def __init__(self, fileobj, read_size=READ_SIZE, max_chunks=QUEUE_MAX_CHUNKS):
+        self._fileobj = fileobj
+        self._read_size = read_size
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._buffer = b""
+        self._pos = 0
+        self._error = None
+        self._done = False
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._inflate, daemon=True)
+        self._thread.start()
+
+    def _inflate(self):
+        try:
+            first = self._fileobj.read(self._read_size)
+            decompressor = zlib.decompressobj(wbits=31) if first[:2] == GZIP_MAGIC else None
+            data = first
+            while data and not self._closed.is_set():
+                if decompressor:
+                    self._put(decompressor.decompress(data))
+                    # concatenated gzip members
+                    while decompressor.eof and decompressor.unused_data:
+                        unused = decompressor.unused_data
+                        decompressor = zlib.decompressobj(wbits=31)
+                        self._put(decompressor.decompress(unused))
+                else:
+                    self._put(data)
+                data = self._fileobj.read(self._read_size)
+            if decompressor:
+                self._put(decompressor.flush())
+        except Exception as e:
+            self._error = e
+        finally:
+            self._put(_EOF)
+
+    def _put(self, chunk):
+        if chunk is not _EOF and not chunk:
+            return
+        while not self._closed.is_set():
+            try:
+                self._queue.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def read(self, size=-1):
+        parts = []
+        while size != 0:
+            if self._pos >= len(self._buffer) and not self._next_chunk():
+                break
+            end = len(self._buffer) if size < 0 else min(len(self._buffer), self._pos + size)
+            parts.append(self._buffer[self._pos : end])
+            if size > 0:
+                size -= end - self._pos
+            self._pos = end
+        return b"".join(parts)
+
+    def _next_chunk(self):
+        if self._done:
+            return False
+        chunk = self._queue.get()
+        if chunk is _EOF:
+            self._done = True
+            if self._error:
+                raise tarfile.ReadError(f"Could not read archive: {self._error}")
+            return False
+        self._buffer = chunk
+        self._pos = 0
+        return True
+
+    def close(self):
+        self._closed.set()
+        self._thread.join()
+
+
+class PipelinedExtractor:
+    """Extract a tar archive with inflate, parse and write on separate threads.
+
+    :param check_member: callable run on each TarInfo before it is extracted, it
+        raises to abort extraction.
+    :param skip_member: callable returning True for regular files that are hashed
+        but not written.
+    """
+
+    def __init__(self, check_member=None, skip_member=None, writer_threads=None):
+        self.check_member = check_member or (lambda item: None)
+        self.skip_member = skip_member or (lambda item: False)
+        self.writer_threads = writer_threads or DEFAULT_WRITER_THREADS
+        self.chksums = {}
+        self.skipped_files = {}
+
+    def extract(self, fileobj, extract_dir):
+        """Extract fileobj into extract_dir, returning the TarInfo of every member."""
+        extract_dir = os.path.abspath(extract_dir)
+        members = []
+        dirs = []
+        links = []
+        batch = []
+        batch_size = 0
+        futures = []
+        # names of the files written, or being written
+        written = set()
+        reader = InflateReader(fileobj)
+        pending = threading.BoundedSemaphore(self.writer_threads * 2)
+
+        def submit_batch():
+            pending.acquire()
+            future = pool.submit(_write_batch, batch, extract_dir)
+            future.add_done_callback(lambda _: pending.release())
+            futures.append(future)
+
+        def wait_for_writes():
+            for future in futures:
+                self.chksums.update(future.result())
+            futures.clear()
+
+        try:
+            with (
+                concurrent.futures.ThreadPoolExecutor(self.writer_threads) as pool,
+                tarfile.open(fileobj=reader, mode="r|") as tf,
+            ):
+                for item in tf:
+                    self.check_member(item)
+                    members.append(item)
+                    name = os.path.normpath(item.name)
+                    if item.isdir():
+                        item = _filter_member(item, extract_dir)
+                        os.makedirs(os.path.join(extract_dir, name), exist_ok=True)
+                        dirs.append(item)
+                    elif item.issym() or item.islnk():
+                        links.append(item)
+                    elif item.isfile() and self.skip_member(item):
+                        self.skipped_files[name] = _sha256_blocks(tf.extractfile(item))
+                        self.chksums[name] = self.skipped_files[name]
+                    elif item.isfile() and (name in written or item.size > MAX_BUFFERED_FILE_SIZE):
+                        if name in written:
+                            # a duplicate member overwrites the earlier one as with
+                            # extractall(), so let that write finish first to keep
+                            # the file and its checksum from the last member
+                            if batch:
+                                submit_batch()
+                                batch, batch_size = [], 0
+                            wait_for_writes()
+                        written.add(name)
+                        item = _filter_member(item, extract_dir)
+                        path = os.path.join(extract_dir, name)
+                        self.chksums[name] = _write_blocks(tf.extractfile(item), path, item.mode)
+                    elif item.isfile():
+                        written.add(name)
+                        batch.append((item, tf.extractfile(item).read()))
+                        batch_size += item.size
+                        if len(batch) >= BATCH_MAX_FILES or batch_size >= MAX_BUFFERED_FILE_SIZE:
+                            submit_batch()
+                            batch, batch_size = [], 0
+                if batch:
+                    submit_batch()
+                wait_for_writes()
+        finally:
+            reader.close()
+
+        for item in links:
+            _make_link(_filter_member(item, extract_dir), extract_dir)
+        # as extractall() does, set directory modes last, deepest first, so they
+        # don't stop files being written into them
+        for item in sorted(dirs, key=lambda item: item.name, reverse=True):
+            if item.mode is not None:
+                os.chmod(os.path.join(extract_dir, os.path.normpath(item.name)), item.mode)
+        return members
+
+
+def _filter_member(item, extract_dir):
+    if hasattr(tarfile, "data_filter"):
+        return tarfile.data_filter(item, extract_dir)
+    return item
+
+
+def _write_batch(batch, extract_dir):
+    """Filter, write and hash a batch of (TarInfo, bytes), returning {name: sha256}."""
+    chksums = {}
+    for item, data in batch:
+        item = _filter_member(item, extract_dir)
+        name = os.path.normpath(item.name)
+        with _open_for_write(os.path.join(extract_dir, name), item.mode) as f:
+            f.write(data)
+        chksums[name] = hashlib.sha256(data).hexdigest()
+    return chksums
+
+
+def _sha256_blocks(fo):
+    sha256 = hashlib.sha256()
+    for block in iter(lambda: fo.read(READ_SIZE), b""):
+        sha256.update(block)
+    return sha256.hexdigest()
+
+
+def _open_for_write(path, mode):
+    dirname = os.path.dirname(path)
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    if mode is not None:
+        os.fchmod(fd, mode & 0o755)
+    return os.fdopen(fd, "wb")
+
+
+def _write_blocks(fo, path, mode):
+    sha256 = hashlib.sha256()
+    with _open_for_write(path, mode) as f:
+        for block in iter(lambda: fo.read(READ_SIZE), b""):
+            sha256.update(block)
+            f.write(block)
+    return sha256.hexdigest()
+
+
+def _make_link(item, extract_dir):
+    path = os.path.join(extract_dir, os.path.normpath(item.name))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # a later member replaces an earlier one of the same name, as with extractall()
+    if os.path.lexists(path):
+        os.unlink(path)
+    if item.issym():
+        os.symlink(item.linkname, path)
+    else:
+        os.link(os.path.join(extract_dir, os.path.normpath(item.linkname)), path)
+
+
+def link_or_copy(src, dst):
+    """Make dst have the contents of src, as cheaply as the filesystem allows.
+
+    Tries a hardlink, then a reflink, then an in-kernel copy.
+    """
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    with open(src, "rb") as fsrc:
+        copy_fileobj(fsrc, dst)
+
+
+def copy_fileobj(fileobj, dst):
+    """Copy the contents of fileobj, from its start, to the new file dst."""
+    fileobj.seek(0)
+    try:
+        src_fd = fileobj.fileno()
+    except (AttributeError, OSError, ValueError):
+        src_fd = None
+
+    with open(dst, "wb") as fdst:
+        if src_fd is None or not _copy_fd(src_fd, fdst.fileno()):
+            fileobj.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fileobj, fdst)
+    fileobj.seek(0)
+
+
+def _copy_fd(src_fd, dst_fd):
+    """Copy src_fd to dst_fd in the kernel, returning False if not supported."""
+    if fcntl is not None:
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            return True
+        except OSError:
+            pass
+
+    size = os.fstat(src_fd).st_size
+    for copy_func in (
+        getattr(os, "copy_file_range", None),
+        lambda src, dst, count, offset: os.sendfile(dst, src, offset, count),
+    ):
+        if copy_func is None:
+            continue
+        offset = 0
+        try:
+            while offset < size:
+                sent = copy_func(src_fd, dst_fd, min(COPY_CHUNK_SIZE, size - offset), offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF, errno.ENOTSUP):
+                raise
+        else:
+            if offset == size:
+                return True
+        # the copy failed or stopped short, start the next method from an empty file
+        os.lseek(dst_fd, 0, os.SEEK_SET)
+        os.ftruncate(dst_fd, 0)
+    return False
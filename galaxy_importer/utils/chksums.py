@@ -21,7 +21,7 @@ def sha256sum_from_path(filename):
         return sha256sum_from_fo(fo)
 
 
-def check_artifact_file(path_prefix, artifact_file):
+def check_artifact_file(path_prefix, artifact_file, chksum=None):
     """Check existences of artifact_file on fs and check the chksum matches
 
     Args:
@@ -30,6 +30,8 @@ def check_artifact_file(path_prefix, artifact_file):
         artifact_file (CollectionArtifactFile): object with the expected info about
             the file on the fs that will be checked.
             This info includes name, type, path, and checksum.
+        chksum (str): Optional sha256sum of the file contents, computed when the
+            file was read from the artifact without being written to the fs.
 
     Raises:
         CollectionArtifactFileNotFound: If artifact_file is not found on the file system.
@@ -41,12 +43,15 @@ def check_artifact_file(path_prefix, artifact_file):
     """
     log.debug("artifact_file: %s", artifact_file)
 
-    artifact_file_path = os.path.join(path_prefix, artifact_file.name)
-    if not os.path.exists(artifact_file_path):
-        msg = f"The file ({artifact_file.name}) was not found"
-        raise exc.CollectionArtifactFileNotFound(missing_file=artifact_file.name, msg=msg)
+    if chksum is not None:
+        actual_chksum = chksum
+    else:
+        artifact_file_path = os.path.join(path_prefix, artifact_file.name)
+        if not os.path.exists(artifact_file_path):
+            msg = f"The file ({artifact_file.name}) was not found"
+            raise exc.CollectionArtifactFileNotFound(missing_file=artifact_file.name, msg=msg)
 
-    actual_chksum = sha256sum_from_path(artifact_file_path)
+        actual_chksum = sha256sum_from_path(artifact_file_path)
 
     if actual_chksum != artifact_file.chksum_sha256:
         err_msg = (
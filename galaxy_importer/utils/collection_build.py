@@ -0,0 +1,325 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Build a collection artifact from a collection source dir, like `ansible-galaxy collection build`.
+
+Files are read once: each one is hashed for FILES.json as it is written to a
+temporary, uncompressed tar stream. MANIFEST.json and FILES.json come first in the
+artifact, so they are written to the gzip stream before that tar stream is appended.
+"""
+
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tarfile
+import tempfile
+import time
+from typing import NamedTuple
+
+import yaml
+
+from galaxy_importer import exceptions as exc
+
+GALAXY_YML_FILENAMES = ("galaxy.yml", "galaxy.yaml")
+# galaxy.yml keys and their types, as normalized by ansible-galaxy, in MANIFEST.json order
+GALAXY_YML_KEYS = {
+    "namespace": str,
+    "name": str,
+    "version": str,
+    "authors": list,
+    "readme": str,
+    "tags": list,
+    "description": str,
+    "license": list,
+    "license_file": str,
+    "dependencies": dict,
+    "repository": str,
+    "documentation": str,
+    "homepage": str,
+    "issues": str,
+    "build_ignore": list,
+    "manifest": dict,
+}
+GALAXY_YML_REQUIRED_KEYS = ("namespace", "name", "version", "readme", "authors")
+DEFAULT_IGNORE_PATTERNS = (
+    "MANIFEST.json",
+    "FILES.json",
+    "galaxy.yml",
+    "galaxy.yaml",
+    ".git",
+    "*.pyc",
+    "*.retry",
+    "tests/output",
+)
+IGNORE_DIRS = frozenset(["CVS", ".bzr", ".hg", ".git", ".svn", "__pycache__", ".tox"])
+MANIFEST_FORMAT = 1
+READ_SIZE = 256 * 1024
+COMPRESS_LEVEL = 9
+FILE_MODE = 0o644
+EXEC_MODE = 0o755
+TAR_ENCODING = "utf-8"
+
+
+class UnsupportedBuildError(Exception):
+    """The collection uses build options only supported by `ansible-galaxy collection build`."""
+
+
+class BuiltCollection(NamedTuple):
+    filepath: str
+    # collection source dir
+    path: str
+    manifest: dict
+    file_manifest: dict
+    manifest_json: bytes
+    file_manifest_json: bytes
+
+
+def build_collection(collection_path, output_path):
+    """Build the collection in collection_path into an artifact in output_path.
+
+    :raises exc.ImporterError: When galaxy.yml is missing or invalid, or the artifact
+        file already exists.
+    :raises UnsupportedBuildError: When galaxy.yml has `manifest` directives.
+
+    :return: BuiltCollection, with the artifact filepath and its manifests.
+    """
+    collection_path = os.path.realpath(collection_path)
+    galaxy_yml = load_galaxy_yml(collection_path)
+    if galaxy_yml["manifest"] is not None:
+        raise UnsupportedBuildError("galaxy.yml 'manifest' directives are not supported")
+
+    filepath = os.path.join(
+        os.path.abspath(output_path),
+        "{namespace}-{name}-{version}.tar.gz".format(**galaxy_yml),
+    )
+    if os.path.exists(filepath):
+        raise exc.ImporterError(f"The file {filepath} already exists")
+
+    ignore_patterns = list(DEFAULT_IGNORE_PATTERNS)
+    ignore_patterns.append("{namespace}-{name}-*.tar.gz".format(**galaxy_yml))
+    ignore_patterns += galaxy_yml["build_ignore"]
+    entries = list(_walk(collection_path, ignore_patterns))
+
+    with tempfile.TemporaryFile(dir=os.path.dirname(filepath)) as body:
+        file_manifest = _write_members(collection_path, entries, body)
+        file_manifest_json = json.dumps(file_manifest, indent=True).encode("utf-8")
+        manifest = _make_manifest(galaxy_yml, hashlib.sha256(file_manifest_json).hexdigest())
+        manifest_json = json.dumps(manifest, indent=True).encode("utf-8")
+
+        body.seek(0)
+        with open(filepath, "xb") as f, gzip.GzipFile(
+            filename="", mode="wb", fileobj=f, compresslevel=COMPRESS_LEVEL
+        ) as gz:
+            mtime = int(time.time())
+            _write_member(gz, _make_tarinfo("MANIFEST.json", FILE_MODE, mtime), manifest_json)
+            _write_member(gz, _make_tarinfo("FILES.json", FILE_MODE, mtime), file_manifest_json)
+            shutil.copyfileobj(body, gz, READ_SIZE)
+            # tell() is the uncompressed size written so far
+            gz.write(_end_of_archive(gz.tell()))
+
+    return BuiltCollection(
+        filepath=filepath,
+        path=collection_path,
+        manifest=manifest,
+        file_manifest=file_manifest,
+        manifest_json=manifest_json,
+        file_manifest_json=file_manifest_json,
+    )
+
+
+def load_galaxy_yml(collection_path):
+    """Return galaxy.yml data, with missing keys set to their defaults."""
+    for filename in GALAXY_YML_FILENAMES:
+        path = os.path.join(collection_path, filename)
+        if os.path.isfile(path):
+            break
+    else:
+        raise exc.ImporterError(f"Could not find galaxy.yml in {collection_path}")
+
+    try:
+        with open(path) as f:
+            data = yaml.safe_load(f)
+    except yaml.YAMLError as e:
+        raise exc.ImporterError(f"Error parsing {filename}: {e}")
+    if not isinstance(data, dict):
+        raise exc.ImporterError(f"{filename} must be in the form of a yaml dictionary")
+
+    missing = [key for key in GALAXY_YML_REQUIRED_KEYS if data.get(key) is None]
+    if missing:
+        raise exc.ImporterError(
+            "{} is missing the required keys: {}".format(filename, ", ".join(missing))
+        )
+
+    galaxy_yml = {}
+    for key, key_type in GALAXY_YML_KEYS.items():
+        value = data.get(key)
+        if key_type is list:
+            value = [] if value is None else value if isinstance(value, list) else [value]
+        elif key_type is dict:
+            value = {} if value is None and key != "manifest" else value
+        elif value is not None:
+            value = str(value)
+        galaxy_yml[key] = value
+    return galaxy_yml
+
+
+def _make_manifest(galaxy_yml, file_manifest_chksum):
+    collection_info = {
+        key: galaxy_yml[key] for key in GALAXY_YML_KEYS if key not in ("build_ignore", "manifest")
+    }
+    collection_info["license_file"] = collection_info["license_file"] or None
+    return {
+        "collection_info": collection_info,
+        "file_manifest_file": {
+            "name": "FILES.json",
+            "ftype": "file",
+            "chksum_type": "sha256",
+            "chksum_sha256": file_manifest_chksum,
+            "format": MANIFEST_FORMAT,
+        },
+        "format": MANIFEST_FORMAT,
+    }
+
+
+def _make_entry(name, ftype, chksum=None):
+    return {
+        "name": name,
+        "ftype": ftype,
+        "chksum_type": "sha256" if chksum else None,
+        "chksum_sha256": chksum,
+        "format": MANIFEST_FORMAT,
+    }
+
+
+def _is_child_path(path, parent):
+    return path == parent or path.startswith(parent + os.sep)
+
+
+def _walk(collection_path, ignore_patterns, rel_dir=""):
+    """Yield (relative path, ftype) of the files and dirs to build, in sorted order.
+
+    Links to dirs are not followed, and are skipped when they point outside the
+    collection. Anything that is not a regular file or dir, after following links,
+    is skipped, such as dangling links, FIFOs and sockets.
+    """
+    for item in sorted(os.listdir(os.path.join(collection_path, rel_dir))):
+        rel_path = os.path.join(rel_dir, item)
+        path = os.path.join(collection_path, rel_path)
+        if any(fnmatch.fnmatch(rel_path, pattern) for pattern in ignore_patterns):
+            continue
+        if os.path.isfile(path):
+            yield rel_path, "file"
+            continue
+        if not os.path.isdir(path):
+            continue
+        if item in IGNORE_DIRS:
+            continue
+        if os.path.islink(path) and not _is_child_path(os.path.realpath(path), collection_path):
+            continue
+        yield rel_path, "dir"
+        if not os.path.islink(path):
+            yield from _walk(collection_path, ignore_patterns, rel_path)
+
+
+def _write_members(collection_path, entries, body):
+    """Write entries as tar members to body, returning the FILES.json data.
+
+    Links within the collection are written as symlinks, other links as the file
+    they point to. Regular files are hashed as they are written.
+    """
+    files = [_make_entry(".", "dir")]
+    for name, ftype in entries:
+        path = os.path.join(collection_path, name)
+        st = os.stat(path)
+        mtime = int(st.st_mtime)
+        mode = EXEC_MODE if ftype == "dir" or st.st_mode & stat.S_IXUSR else FILE_MODE
+        link_target = os.path.realpath(path) if os.path.islink(path) else None
+
+        if link_target and _is_child_path(link_target, collection_path):
+            tarinfo = _make_tarinfo(name, FILE_MODE, mtime, tarfile.SYMTYPE)
+            tarinfo.linkname = os.path.relpath(link_target, os.path.dirname(path))
+            _write_member(body, tarinfo)
+            chksum = _sha256_file(path) if ftype == "file" else None
+        elif ftype == "dir":
+            _write_member(body, _make_tarinfo(name, mode, mtime, tarfile.DIRTYPE))
+            chksum = None
+        else:
+            tarinfo = _make_tarinfo(name, mode, mtime)
+            tarinfo.size = st.st_size
+            with open(path, "rb") as f:
+                chksum = _write_file_member(body, tarinfo, f)
+        files.append(_make_entry(name, ftype, chksum))
+    return {"files": files, "format": MANIFEST_FORMAT}
+
+
+def _make_tarinfo(name, mode, mtime, member_type=tarfile.REGTYPE):
+    tarinfo = tarfile.TarInfo(name)
+    tarinfo.type = member_type
+    tarinfo.mode = mode
+    tarinfo.mtime = mtime
+    tarinfo.uid = tarinfo.gid = 0
+    tarinfo.uname = tarinfo.gname = ""
+    return tarinfo
+
+
+def _write_member(out, tarinfo, data=b""):
+    """Write a tar member with data bytes to out."""
+    tarinfo.size = len(data)
+    out.write(tarinfo.tobuf(tarfile.PAX_FORMAT, TAR_ENCODING, "surrogateescape"))
+    out.write(data)
+    out.write(_padding(len(data)))
+
+
+def _write_file_member(out, tarinfo, fileobj):
+    """Write a tar member with tarinfo.size bytes of fileobj to out, returning their sha256."""
+    out.write(tarinfo.tobuf(tarfile.PAX_FORMAT, TAR_ENCODING, "surrogateescape"))
+    sha256 = hashlib.sha256()
+    remaining = tarinfo.size
+    while remaining > 0:
+        block = fileobj.read(min(READ_SIZE, remaining))
+        if not block:
+            raise exc.ImporterError(f"File {tarinfo.name} changed during collection build")
+        sha256.update(block)
+        out.write(block)
+        remaining -= len(block)
+    out.write(_padding(tarinfo.size))
+    return sha256.hexdigest()
+
+
+def _padding(size):
+    remainder = size % tarfile.BLOCKSIZE
+    return tarfile.NUL * (tarfile.BLOCKSIZE - remainder) if remainder else b""
+
+
+def _end_of_archive(size):
+    """Return the end of archive blocks, padded to a whole record like tarfile."""
+    size += tarfile.BLOCKSIZE * 2
+    remainder = size % tarfile.RECORDSIZE
+    padding = tarfile.RECORDSIZE - remainder if remainder else 0
+    return tarfile.NUL * (tarfile.BLOCKSIZE * 2 + padding)
+
+
+def _sha256_file(path):
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(READ_SIZE), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
@@ -0,0 +1,197 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Stream a collection artifact from its url, without saving it to a local file."""
+
+import hashlib
+import logging
+import re
+import time
+
+import requests
+
+from galaxy_importer import exceptions as exc
+
+default_logger = logging.getLogger(__name__)
+
+READ_SIZE = 256 * 1024
+REQUEST_TIMEOUT_SECONDS = 60
+MAX_RETRIES = 5
+RETRY_DELAY_SECONDS = 1
+RETRY_MAX_DELAY_SECONDS = 30
+RETRY_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+CONTENT_RANGE_REGEXP = re.compile(r"^bytes (\d+)-\d+/(\d+|\*)$")
+
+
+def fetch_url(url, headers):
+    """Default fetcher of HttpArtifactReader, a streamed GET of url with requests."""
+    # identity, so requests does not decode a gzip Content-Encoding of the artifact
+    headers = {"Accept-Encoding": "identity", **headers}
+    return requests.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT_SECONDS)
+
+
+class HttpArtifactReader:
+    """Forward-only file object over the body of an artifact url.
+
+    The body is hashed as it is read, so sha256 is the artifact sha256 once it is
+    read to the end. When the connection fails or ends early, the download is
+    resumed from the last byte received with a Range request, up to max_retries
+    times in a row.
+
+    :param fetcher: callable taking the url and a dict of request headers, returning
+        a requests.Response like object with status_code, headers, iter_content()
+        and close(). Defaults to fetch_url.
+    """
+
+    def __init__(self, url, fetcher=None, max_retries=MAX_RETRIES, logger=None):
+        self.url = url
+        self.fetcher = fetcher or fetch_url
+        self.max_retries = max_retries
+        self.log = logger or default_logger
+        self._sha256 = hashlib.sha256()
+        self._response = None
+        self._chunks = None
+        self._buffer = b""
+        # bytes of the body received so far
+        self._received = 0
+        self._size = None
+        self._done = False
+
+    @property
+    def size(self):
+        """Size of the artifact from the response headers, None if not sent."""
+        if self._response is None and not self._done and not self._buffer:
+            self._buffer = self._next_chunk()
+        return self._size
+
+    @property
+    def sha256(self):
+        """sha256 hexdigest of the bytes received so far."""
+        return self._sha256.hexdigest()
+
+    def seekable(self):
+        return False
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while not self._done and (size < 0 or len(self._buffer) < size):
+            chunk = self._next_chunk()
+            if chunk:
+                self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def close(self):
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _next_chunk(self):
+        """Return the next chunk of the body, b"" when the body is complete."""
+        retries = 0
+        while True:
+            try:
+                if self._response is None:
+                    self._request()
+                chunk = next(self._chunks, None)
+            except _RETRY_EXCEPTIONS as e:
+                error = e
+            else:
+                if chunk is None and (self._size is None or self._received >= self._size):
+                    self._done = True
+                    self.close()
+                    return b""
+                if chunk is not None:
+                    self._add_chunk(chunk)
+                    return chunk
+                error = f"connection closed after {self._received} of {self._size} bytes"
+
+            self.close()
+            retries += 1
+            if retries > self.max_retries:
+                raise exc.ImporterError(f"Could not download {self.url}: {error}")
+            self.log.debug(f"Download of {self.url} interrupted, resuming: {error}")
+            time.sleep(min(RETRY_DELAY_SECONDS * 2 ** (retries - 1), RETRY_MAX_DELAY_SECONDS))
+
+    def _add_chunk(self, chunk):
+        self._sha256.update(chunk)
+        self._received += len(chunk)
+
+    def _request(self):
+        headers = {"Range": f"bytes={self._received}-"} if self._received else {}
+        response = self.fetcher(self.url, headers)
+        self._response = response
+        status = response.status_code
+        if status == requests.codes.range_not_satisfiable and self._received == self._size:
+            self._chunks = iter(())
+            return
+        if status not in (requests.codes.ok, requests.codes.partial_content):
+            self.close()
+            if status in RETRY_STATUS_CODES:
+                raise _RetryableStatusError(f"HTTP {status}")
+            raise exc.ImporterError(f"Could not download {self.url}: HTTP {status}")
+
+        chunks = response.iter_content(READ_SIZE)
+        if status == requests.codes.partial_content:
+            match = CONTENT_RANGE_REGEXP.match(response.headers.get("Content-Range", ""))
+            if not match or int(match.group(1)) != self._received:
+                self.close()
+                raise exc.ImporterError(
+                    f"Could not download {self.url}: unexpected Content-Range "
+                    f"{response.headers.get('Content-Range')}"
+                )
+            if match.group(2) != "*":
+                self._size = int(match.group(2))
+        else:
+            content_length = response.headers.get("Content-Length")
+            self._size = int(content_length) if content_length else None
+            if self._received:
+                # the server ignored the Range header and sent the whole body again
+                chunks = _skip_bytes(chunks, self._received)
+        self._chunks = chunks
+
+
+def _skip_bytes(chunks, count):
+    """Yield from the byte chunks after their first count bytes."""
+    for chunk in chunks:
+        if count >= len(chunk):
+            count -= len(chunk)
+            continue
+        yield chunk[count:]
+        count = 0
+
+
+class _RetryableStatusError(Exception):
+    pass
+
+
+_RETRY_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.Timeout,
+    _RetryableStatusError,
+)
@@ -0,0 +1,110 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Parse a JSON object from a stream one member at a time."""
+
+import codecs
+import json
+
+READ_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+# characters that may follow a complete key or value in an object
+VALUE_END = WHITESPACE + ",:}"
+
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """Text buffer over a utf-8 byte stream, holding only the text not yet parsed."""
+
+    def __init__(self, fileobj, read_size):
+        self.fileobj = fileobj
+        self.read_size = read_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def read_more(self):
+        """Read more of the stream, at least as much as is buffered, so reads grow."""
+        self.text = self.text[self.pos :]
+        self.pos = 0
+        data = self.fileobj.read(max(self.read_size, len(self.text)))
+        self.eof = not data
+        self.text += self._decoder.decode(data, final=self.eof)
+
+    def peek(self):
+        """Return the next non-whitespace character, "" at the end of the stream."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text) or self.eof:
+                return self.text[self.pos : self.pos + 1]
+            self.read_more()
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            expected = " or ".join(repr(c) for c in chars)
+            raise json.JSONDecodeError(f"Expecting {expected}", self.text, self.pos)
+        self.pos += 1
+        return char
+
+    def decode(self):
+        """Return the next JSON value, reading until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.read_more()
+                continue
+            # a value not followed by the end of a member may be a number cut short
+            if self.eof or (end < len(self.text) and self.text[end] in VALUE_END):
+                self.pos = end
+                return value
+            self.read_more()
+
+
+def iter_object_items(fileobj, read_size=READ_SIZE):
+    """Yield the (key, value) members of the JSON object in the utf-8 stream fileobj.
+
+    Members are yielded as they are parsed, so only the member being parsed is held
+    in memory, rather than the whole stream and the whole object.
+
+    :raises json.JSONDecodeError: When the stream is not a JSON object.
+    """
+    reader = _Reader(fileobj, read_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+    else:
+        while True:
+            key = reader.decode()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError(
+                    "Expecting property name enclosed in double quotes", reader.text, reader.pos
+                )
+            reader.expect(":")
+            yield key, reader.decode()
+            if reader.expect(",}") == "}":
+                break
+
+    if reader.peek():
+        raise json.JSONDecodeError("Extra data", reader.text, reader.pos)
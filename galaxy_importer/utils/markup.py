@@ -115,11 +115,14 @@ def get_doc_files(directory):
     return [_get_file(directory, f) for f in filenames]
 
 
-def get_html(doc_file):
+def get_html(doc_file, rendered_html=None):
     """Get html for a documentation file.
 
     :param doc_file: DocFile
+    :param rendered_html: Optional dict of html already rendered, by sha256 of the file
     """
+    if rendered_html and doc_file.hash in rendered_html:
+        return rendered_html[doc_file.hash]
     if doc_file.mimetype == "text/markdown":
         return _render_from_markdown(doc_file)
     return None
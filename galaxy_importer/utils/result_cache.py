@@ -0,0 +1,172 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Cache of collection import results, keyed by artifact and importer setup."""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from galaxy_importer import __version__
+from galaxy_importer.utils.lint_version import get_version_from_metadata
+
+default_logger = logging.getLogger(__name__)
+
+# Config values that can change the result of an import
+CACHE_KEY_CONFIG = (
+    "ansible_doc_chunk_size",
+    "ansible_test_local_image",
+    "check_required_tags",
+    "infra_osd",
+    "max_archive_compression_ratio",
+    "max_archive_file_size",
+    "max_archive_members",
+    "max_archive_size",
+    "offline_ansible_lint",
+    "require_v1_or_greater",
+    "run_ansible_doc",
+    "run_ansible_lint",
+    "run_ansible_test",
+    "run_flake8",
+)
+READ_SIZE = 1024 * 1024
+ENTRY_SUFFIX = ".json"
+
+
+def get_result_cache(cfg, logger=None):
+    """Return the DirectoryResultCache configured by cfg, or None when disabled."""
+    if not cfg.result_cache_dir:
+        return None
+    return DirectoryResultCache(cfg.result_cache_dir, cfg.result_cache_max_size, logger=logger)
+
+
+def get_cache_key(fileobj, filename, cfg):
+    """Return the cache key for importing the artifact in fileobj with cfg.
+
+    The key covers the artifact sha256, the expected filename, the versions of
+    galaxy-importer, ansible-core and ansible-lint, and config values in CACHE_KEY_CONFIG.
+    """
+    sha256 = hashlib.sha256()
+    fileobj.seek(0)
+    for block in iter(lambda: fileobj.read(READ_SIZE), b""):
+        sha256.update(block)
+    fileobj.seek(0)
+
+    key_data = {
+        "artifact_sha256": sha256.hexdigest(),
+        "filename": list(filename) if filename else None,
+        "galaxy_importer": __version__,
+        "ansible_core": get_version_from_metadata("ansible-core"),
+        "ansible_lint": get_version_from_metadata("ansible-lint"),
+        "config": {key: getattr(cfg, key, None) for key in CACHE_KEY_CONFIG},
+    }
+    key_json = json.dumps(key_data, sort_keys=True, default=str)
+    return hashlib.sha256(key_json.encode()).hexdigest()
+
+
+class DirectoryResultCache:
+    """Import results stored as JSON files in a directory, evicted least recently used.
+
+    Entries are written to a temporary file and renamed into place, so readers in
+    other processes never see a partial entry. Reading an entry updates its mtime,
+    which orders eviction once the entries are larger than max_size bytes.
+    """
+
+    def __init__(self, path, max_size, logger=None):
+        self.path = path
+        self.max_size = int(max_size)
+        self.log = logger or default_logger
+        os.makedirs(path, exist_ok=True)
+
+    def _entry_path(self, key):
+        return os.path.join(self.path, key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        """Return the result stored for key, or None."""
+        path = self._entry_path(key)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.log.warning(f"Ignoring unreadable import result cache entry {path}: {e}")
+            return None
+
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return result
+
+    def set(self, key, result):
+        """Store result for key, then evict entries beyond max_size.
+
+        The cache only saves work, so a result that can't be stored is logged as a
+        warning rather than failing the import that produced it.
+
+        :return: result as get() returns it once stored, after a JSON roundtrip that
+            turns tuples into lists and dict keys into strings, so fresh and cached
+            results are the same. result itself when it was not stored.
+        """
+        try:
+            data = json.dumps(result)
+        except (TypeError, ValueError) as e:
+            self.log.warning(f"Not caching import result that is not JSON serializable: {e}")
+            return result
+
+        path = self._entry_path(key)
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=".", suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException as e:
+            if tmp_path:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+            if not isinstance(e, OSError):
+                raise
+            self.log.warning(f"Could not write import result cache entry {path}: {e}")
+            return result
+
+        try:
+            self._evict()
+        except OSError as e:
+            self.log.warning(f"Could not evict import result cache entries: {e}")
+        return json.loads(data)
+
+    def _evict(self):
+        entries = []
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if not entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                with contextlib.suppress(FileNotFoundError):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            # another process may have evicted it already
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+            total_size -= size
@@ -0,0 +1,94 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Write import results as JSON, serialized once as they are written to streams."""
+
+import collections.abc
+import gzip
+import io
+import json
+
+import attr
+
+from galaxy_importer import exceptions as exc
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIONS = ("gzip", "zstd")
+FILE_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+WRITE_SIZE = 64 * 1024
+
+
+def write_result(result, *streams, indent=None):
+    """Write result as JSON to each of the text streams.
+
+    attrs objects in result are serialized from their fields, without copying them
+    to dicts first like attr.asdict(), and the JSON is written in chunks as it is
+    encoded, so it is never held in memory as a whole.
+
+    :param indent: Indent of the JSON, None for compact JSON.
+    """
+    separators = (",", ": ") if indent is not None else (",", ":")
+    encoder = json.JSONEncoder(indent=indent, separators=separators, default=_to_json)
+    chunks = []
+    size = 0
+    for chunk in encoder.iterencode(result):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= WRITE_SIZE:
+            _write(streams, "".join(chunks))
+            chunks = []
+            size = 0
+    _write(streams, "".join(chunks))
+
+
+def open_result_file(path, compression=None):
+    """Open path to write a result to, as a text stream compressed with compression.
+
+    :param compression: None, "gzip" or "zstd".
+
+    :raises exc.ImporterError: When compression is "zstd" and the zstandard package
+        is not installed.
+    """
+    if compression is None:
+        return open(path, "w", encoding="utf-8")
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8")
+    if compression == "zstd":
+        if zstandard is None:
+            raise exc.ImporterError("zstd compression requires the zstandard package")
+        fileobj = open(path, "wb")  # noqa: SIM115 - closed by closing the returned stream
+        writer = zstandard.ZstdCompressor().stream_writer(fileobj)
+        return io.TextIOWrapper(writer, encoding="utf-8")
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def _write(streams, data):
+    for stream in streams:
+        stream.write(data)
+
+
+def _to_json(obj):
+    if attr.has(type(obj)):
+        return {field.name: getattr(obj, field.name) for field in attr.fields(type(obj))}
+    # such as schema.CollectionArtifactFileList
+    if isinstance(obj, collections.abc.Sequence):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
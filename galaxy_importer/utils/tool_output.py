@@ -0,0 +1,118 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Parse ansible-lint and ansible-test sanity output into findings."""
+
+import collections
+import re
+
+from galaxy_importer import schema
+
+ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*m")
+# ansible-lint --format=pep8 --nocolor, for example:
+# playbooks/site.yml:8:15: jinja[spacing][/]: Jinja2 spacing could be improved: ... (warning)
+ANSIBLE_LINT_RE = re.compile(
+    r"^(?P<path>[^\s:][^:]*):(?P<line>\d+)(?::\d+)?: (?P<rule>[^\s:]+?)(?:\[/\])?: "
+    r"(?P<message>.*?)(?P<warning> \(warning\))?$"
+)
+# ansible-test sanity, for example:
+# ERROR: plugins/modules/foo.py:12:1: E302: expected 2 blank lines, found 1
+ANSIBLE_TEST_RE = re.compile(
+    r"^(?P<severity>ERROR|WARNING): (?P<path>[^\s:]+):(?P<line>\d+):\d+: "
+    r"(?P<code>[^\s:]+): (?P<message>.*)$"
+)
+ANSIBLE_TEST_RUNNING_RE = re.compile(r"^Running sanity test [\"'](?P<test>[^\"']+)[\"']")
+
+
+def parse_ansible_lint_line(line):
+    """Return the Finding on a line of ansible-lint pep8 output, or None."""
+    match = ANSIBLE_LINT_RE.match(ANSI_ESCAPE_RE.sub("", line).strip())
+    if not match:
+        return None
+    return schema.Finding(
+        rule=match["rule"],
+        path=match["path"],
+        line=int(match["line"]),
+        severity="warning" if match["warning"] else "error",
+        message=match["message"],
+    )
+
+
+class AnsibleTestOutputParser:
+    """Collect findings from ansible-test sanity output, fed one line at a time.
+
+    Findings are named after the sanity test and its error code, as in
+    ansible-test ignore files, for example "validate-modules:missing-gplv3-license".
+    """
+
+    def __init__(self):
+        self.findings = []
+        self._test = None
+
+    def feed(self, line):
+        """Parse a line of output, returning its Finding or None."""
+        line = ANSI_ESCAPE_RE.sub("", line).strip()
+        running = ANSIBLE_TEST_RUNNING_RE.match(line)
+        if running:
+            self._test = running["test"]
+            return None
+
+        match = ANSIBLE_TEST_RE.match(line)
+        if not match:
+            return None
+        rule = match["code"] if self._test is None else f"{self._test}:{match['code']}"
+        finding = schema.Finding(
+            rule=rule,
+            path=match["path"],
+            line=int(match["line"]),
+            severity=match["severity"].lower(),
+            message=match["message"],
+        )
+        self.findings.append(finding)
+        return finding
+
+
+def format_ansible_lint_finding(finding):
+    """Return finding as a line of ansible-lint pep8 output."""
+    line = f"{finding.path}:{finding.line}: {finding.rule}: {finding.message}"
+    if finding.severity == "warning":
+        line += " (warning)"
+    return line
+
+
+def build_report(findings, version=None, file_chksums=None):
+    """Return a ToolReport of findings, summarized by severity and rule."""
+    summary = {
+        "total": len(findings),
+        "severity": dict(collections.Counter(f.severity for f in findings)),
+        "rule": dict(collections.Counter(f.rule for f in findings).most_common()),
+    }
+    return schema.ToolReport(
+        findings=list(findings),
+        summary=summary,
+        version=version,
+        file_chksums=file_chksums or {},
+    )
+
+
+def format_summary(tool, report, max_rules=10):
+    """Return a single line summary of report, for the import log."""
+    rules = list(report.summary["rule"].items())
+    counts = ", ".join(f"{rule} ({count})" for rule, count in rules[:max_rules])
+    if len(rules) > max_rules:
+        counts += f", and {len(rules) - max_rules} more rules"
+    return f"{tool} reported {report.summary['total']} finding(s): {counts}"
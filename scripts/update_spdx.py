@@ -6,6 +6,7 @@ import requests
 # NOTE: This file should be run periodically to update the SPDX licenses.
 
 OUTPUT_PATH = "galaxy_importer/utils/spdx_licenses.json"
+LICENSE_IDS_OUTPUT_PATH = "galaxy_importer/utils/spdx_license_ids.py"
 SPDX_URL = "https://spdx.org/licenses/licenses.json"
 
 # Fetch licenses from spdx.org.
@@ -21,3 +22,15 @@ licenses = {
 # Write output.
 with open(OUTPUT_PATH, "w") as fh:
     json.dump(licenses, fh, indent=4, sort_keys=True)
+
+# Write the valid, non-deprecated license IDs as a python module, so they are
+# loaded from its cached bytecode instead of parsing the json in each process.
+valid_license_ids = sorted(
+    license_id for license_id, info in licenses.items() if not info["deprecated"]
+)
+with open(LICENSE_IDS_OUTPUT_PATH, "w") as fh:
+    fh.write("# Generated by scripts/update_spdx.py, do not edit.\n")
+    fh.write('"""Valid, non-deprecated SPDX license IDs."""\n\n')
+    fh.write("VALID_LICENSE_IDS = frozenset(\n    [\n")
+    fh.writelines(f"        {json.dumps(license_id)},\n" for license_id in valid_license_ids)
+    fh.write("    ]\n)\n")
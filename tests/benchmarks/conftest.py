@@ -0,0 +1,35 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import pytest
+
+from .helpers import build_artifact
+
+
+@pytest.fixture(scope="session")
+def artifact_factory(tmp_path_factory):
+    """Build artifacts once per session, keyed by file count."""
+    cache = {}
+
+    def factory(file_count, **kwargs):
+        key = (file_count, tuple(sorted(kwargs.items())))
+        if key not in cache:
+            path = tmp_path_factory.mktemp("artifacts") / f"bench-{file_count}.tar.gz"
+            cache[key] = str(build_artifact(str(path), file_count, **kwargs))
+        return cache[key]
+
+    return factory
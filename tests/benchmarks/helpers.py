@@ -0,0 +1,109 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Helpers shared by the benchmarks, run with `make test/benchmark`."""
+
+import hashlib
+import io
+import json
+import tarfile
+import time
+from contextlib import contextmanager
+
+MANIFEST_JSON = {
+    "collection_info": {
+        "namespace": "bench_namespace",
+        "name": "bench_collection",
+        "version": "1.0.0",
+        "authors": ["Jane Doe"],
+        "readme": "README.md",
+        "tags": [],
+        "description": "A collection for benchmarks",
+        "license": ["GPL-3.0-or-later"],
+        "license_file": None,
+        "dependencies": {},
+        "repository": "http://example.com/repository",
+        "documentation": None,
+        "homepage": None,
+        "issues": None,
+    },
+    "format": 1,
+}
+
+
+def _add_bytes(tf, name, data):
+    tarinfo = tarfile.TarInfo(name)
+    tarinfo.size = len(data)
+    tf.addfile(tarinfo, io.BytesIO(data))
+
+
+def _add_dir(tf, name):
+    tarinfo = tarfile.TarInfo(name)
+    tarinfo.type = tarfile.DIRTYPE
+    tarinfo.mode = 0o755
+    tf.addfile(tarinfo)
+
+
+def build_artifact(path, file_count, files_per_dir=500, file_size=64):
+    """Write a valid collection artifact with file_count files to path."""
+    files = [{"name": ".", "ftype": "dir", "chksum_type": None, "chksum_sha256": None, "format": 1}]
+    with tarfile.open(path, mode="w:gz") as tf:
+        readme = b"# bench collection\n"
+        _add_bytes(tf, "README.md", readme)
+        files.append(_file_entry("README.md", readme))
+
+        for ix in range(file_count):
+            dirname = f"plugins/dir_{ix // files_per_dir:04d}"
+            if ix % files_per_dir == 0:
+                if ix == 0:
+                    _add_dir(tf, "plugins")
+                    files.append(_dir_entry("plugins"))
+                _add_dir(tf, dirname)
+                files.append(_dir_entry(dirname))
+            name = f"{dirname}/file_{ix:06d}.txt"
+            data = (f"{name}\n".encode() * (file_size // 16 + 1))[:file_size]
+            _add_bytes(tf, name, data)
+            files.append(_file_entry(name, data))
+
+        files_json = json.dumps({"files": files, "format": 1}).encode()
+        manifest = dict(MANIFEST_JSON)
+        manifest["file_manifest_file"] = _file_entry("FILES.json", files_json)
+        _add_bytes(tf, "FILES.json", files_json)
+        _add_bytes(tf, "MANIFEST.json", json.dumps(manifest).encode())
+    return path
+
+
+def _file_entry(name, data):
+    return {
+        "name": name,
+        "ftype": "file",
+        "chksum_type": "sha256",
+        "chksum_sha256": hashlib.sha256(data).hexdigest(),
+        "format": 1,
+    }
+
+
+def _dir_entry(name):
+    return {"name": name, "ftype": "dir", "chksum_type": None, "chksum_sha256": None, "format": 1}
+
+
+@contextmanager
+def timed(label, results):
+    start = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - start
+    print(f"{label}: {results[label]:.3f}s")
@@ -0,0 +1,161 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import io
+import json
+import tracemalloc
+from copy import deepcopy
+
+from galaxy_importer import config
+from galaxy_importer.loaders import DocStringLoader
+from galaxy_importer.utils import json_stream
+
+from .helpers import timed
+
+# sized like the resource modules of network collections: a few dozen modules, each
+# with hundreds of options nested a few levels deep
+MODULE_COUNT = 30
+OPTIONS_PER_LEVEL = 6
+OPTION_DEPTH = 4
+
+
+def _options(depth, table_key):
+    options = {}
+    for ix in range(OPTIONS_PER_LEVEL):
+        option = {
+            "description": [f"Description of option {ix} at depth {depth}."] * 2,
+            "type": "dict" if depth > 1 else "str",
+            "choices": ["present", "absent", "merged", "replaced"],
+            "required": False,
+            "version_added": "1.0.0",
+        }
+        if depth > 1:
+            option[table_key] = _options(depth - 1, table_key)
+        options[f"option_{depth}_{ix}"] = option
+    return options
+
+
+def _ansible_doc_json():
+    """Return ansible-doc --json output for MODULE_COUNT modules."""
+    docs = {
+        f"bench_namespace.bench_collection.module_{ix}": {
+            "doc": {
+                "description": ["A benchmark module."],
+                "short_description": "A benchmark module",
+                "options": _options(OPTION_DEPTH, "suboptions"),
+            },
+            "return": _options(OPTION_DEPTH - 1, "contains"),
+            "examples": "- name: Example\n  module_0:\n",
+            "metadata": None,
+        }
+        for ix in range(MODULE_COUNT)
+    }
+    return json.dumps(docs)
+
+
+def _transform_doc_strings_deepcopy(data):
+    """The previous transform, copying each table row with deepcopy."""
+
+    def dict_to_named_list(dict_of_dict):
+        return [{"name": key, **deepcopy(dict_of_dict[key])} for key in dict_of_dict]
+
+    def handle_nested_tables(obj, table_key):
+        if table_key in obj and isinstance(obj[table_key], dict):
+            obj[table_key] = dict_to_named_list(obj[table_key])
+            for row in obj[table_key]:
+                handle_nested_tables(row, table_key)
+
+    doc = data["doc"]
+    doc["options"] = dict_to_named_list(doc["options"])
+    for d in doc["options"]:
+        handle_nested_tables(d, table_key="suboptions")
+    data["return"] = dict_to_named_list(data["return"])
+    for d in data["return"]:
+        handle_nested_tables(d, table_key="contains")
+    return data
+
+
+def _transform_all(func, doc_strings):
+    return {plugin: func(value) for plugin, value in doc_strings.items()}
+
+
+def _peak_memory(transform, doc_strings):
+    """Return the peak memory allocated transforming doc_strings, in bytes."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        _transform_all(transform, doc_strings)
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def test_transform_doc_strings():
+    output = _ansible_doc_json()
+    print(f"ansible-doc output: {len(output) / 1024 / 1024:.1f} MiB")
+
+    results = {}
+    peaks = {}
+    transformed = {}
+    for label, transform in [
+        ("deepcopy", _transform_doc_strings_deepcopy),
+        ("DocStringLoader", DocStringLoader._transform_doc_strings),
+    ]:
+        doc_strings = json.loads(output)
+        with timed(f"{label} time", results):
+            transformed[label] = _transform_all(transform, doc_strings)
+
+        peaks[label] = _peak_memory(transform, json.loads(output))
+        print(f"{label} peak memory: {peaks[label] / 1024 / 1024:.1f} MiB")
+
+    assert transformed["DocStringLoader"] == transformed["deepcopy"]
+    assert results["DocStringLoader time"] < results["deepcopy time"]
+    assert peaks["DocStringLoader"] < peaks["deepcopy"]
+
+
+def test_parse_ansible_doc_output():
+    output = _ansible_doc_json().encode()
+    print(f"ansible-doc output: {len(output) / 1024 / 1024:.1f} MiB")
+    loader = DocStringLoader(
+        path="/tmp/ansible_collections/bench_namespace/bench_collection",
+        fq_collection_name="bench_namespace.bench_collection",
+        cfg=config.Config(),
+    )
+
+    def parse_all(stdout):
+        return loader._process_doc_strings(json.loads(stdout.read()))
+
+    def parse_streamed(stdout):
+        return loader._process_doc_strings(json_stream.iter_object_items(stdout))
+
+    results = {}
+    peaks = {}
+    for label, parse in [("json.loads", parse_all), ("iter_object_items", parse_streamed)]:
+        with timed(f"{label} time", results):
+            parse(io.BytesIO(output))
+
+        stdout = io.BytesIO(output)
+        tracemalloc.start()
+        try:
+            parse(stdout)
+            peaks[label] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        print(f"{label} peak memory: {peaks[label] / 1024 / 1024:.1f} MiB")
+
+    assert peaks["iter_object_items"] < peaks["json.loads"]
@@ -0,0 +1,59 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import os
+
+import pytest
+
+from galaxy_importer.collection import _extract_archive, _extract_archive_pipelined
+from galaxy_importer.utils import chksums
+
+from .helpers import timed
+
+
+@pytest.mark.parametrize(
+    ("file_count", "file_size"),
+    [
+        (20000, 1024),
+        (200, 1024 * 1024),
+    ],
+)
+def test_extract_archive(artifact_factory, tmp_path, file_count, file_size):
+    artifact = artifact_factory(file_count, file_size=file_size)
+
+    results = {}
+    extracted = {}
+    for label, extract in [
+        ("tf.extractall", _extract_archive),
+        ("pipelined", _extract_archive_pipelined),
+    ]:
+        extract_dir = tmp_path / label
+        with open(artifact, "rb") as fh, timed(f"{label} {file_count}x{file_size}", results):
+            extracted[label] = extract(fileobj=fh, extract_dir=str(extract_dir))
+
+    # the pipelined extractor also hashes every file, which CollectionLoader would
+    # otherwise do by reading each file back for the FILES.json check
+    extract_dir = tmp_path / "tf.extractall"
+    with timed(f"tf.extractall sha256 read back {file_count}x{file_size}", results):
+        read_back = {
+            name: chksums.sha256sum_from_path(os.path.join(extract_dir, name))
+            for name in extracted["tf.extractall"].member_names
+            if os.path.isfile(os.path.join(extract_dir, name))
+        }
+
+    assert extracted["tf.extractall"].member_names == extracted["pipelined"].member_names
+    assert read_back == extracted["pipelined"].chksums
@@ -0,0 +1,99 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import hashlib
+import json
+import os
+import tracemalloc
+
+from galaxy_importer import schema
+from galaxy_importer.collection import _extract_archive
+from galaxy_importer.loaders import CollectionLoader
+
+from .helpers import timed
+
+FILE_COUNT = 50000
+PARSE_FILE_COUNT = 100000
+
+
+def test_check_file_manifest_extra_files(artifact_factory, tmp_path):
+    artifact = artifact_factory(FILE_COUNT)
+    extract_dir = str(tmp_path / "ansible_collections" / "placeholder_ns" / "placeholder_name")
+    os.makedirs(extract_dir)
+    with open(artifact, "rb") as fh:
+        archive_members = _extract_archive(fileobj=fh, extract_dir=extract_dir).member_names
+
+    results = {}
+    for label, members in [("file walk", None), ("archive members", archive_members)]:
+        loader = CollectionLoader(extract_dir, filename=None, archive_members=members)
+        manifest = loader._load_manifest()
+        file_manifest = loader._load_file_manifest(extract_dir, manifest.file_manifest_file)
+        with timed(label, results):
+            assert loader._check_file_manifest(extract_dir, file_manifest, "FILES.json")
+
+
+def _files_json(file_count):
+    files = [
+        {
+            "name": f"plugins/dir_{ix // 500:04d}/file_{ix:06d}.txt",
+            "ftype": "file",
+            "chksum_type": "sha256",
+            "chksum_sha256": hashlib.sha256(str(ix).encode()).hexdigest(),
+            "format": 1,
+        }
+        for ix in range(file_count)
+    ]
+    return json.dumps({"files": files, "format": 1})
+
+
+def _artifact_file_objects(data):
+    return [
+        schema.CollectionArtifactFile(
+            name=f["name"],
+            ftype=f["ftype"],
+            chksum_type=f.get("chksum_type"),
+            chksum_sha256=f.get("chksum_sha256"),
+        )
+        for f in json.loads(data)["files"]
+    ]
+
+
+def _measure(func, data):
+    tracemalloc.start()
+    try:
+        result = func(data)
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def test_parse_file_manifest():
+    data = _files_json(PARSE_FILE_COUNT)
+    results = {}
+    sizes = {}
+    for label, func in [
+        ("list of CollectionArtifactFile", _artifact_file_objects),
+        ("CollectionArtifactFileManifest.parse", schema.CollectionArtifactFileManifest.parse),
+    ]:
+        with timed(f"{label} time", results):
+            func(data)
+        result, sizes[label] = _measure(func, data)
+        print(f"{label} memory: {sizes[label] / 1024 / 1024:.1f} MiB")
+        del result
+
+    assert sizes["CollectionArtifactFileManifest.parse"] < sizes["list of CollectionArtifactFile"]
@@ -113,10 +113,66 @@ def test_build_image_with_artifact_exception(mocked_popen, mocker):
             Build._build_image_with_artifact(dirname=dir, container_engine="podman")
 
 
+@mock.patch("galaxy_importer.ansible_test.builders.local_image_build.run")
+def test_cleanup_keeps_base_image(mocked_run, build):
+    build.keep_image = True
+    build.cleanup()
+    assert not mocked_run.called
+
+
+def test_get_base_image_digest():
+    digest = Build.get_base_image_digest()
+    assert len(digest) == 16
+    assert digest == Build.get_base_image_digest()
+
+
+@mock.patch("galaxy_importer.ansible_test.builders.local_image_build.run")
+def test_image_exists(mocked_run):
+    mocked_run.return_value.returncode = 0
+    assert Build._image_exists("podman", "image:tag")
+    assert mocked_run.call_args.args[0] == ["podman", "image", "inspect", "image:tag"]
+    mocked_run.return_value.returncode = 125
+    assert not Build._image_exists("podman", "image:tag")
+
+
+def test_build_base_image(mocker, build):
+    mocker.patch.object(Build, "_image_exists", return_value=False)
+    mocker.patch.object(Build, "_build_image_with_artifact")
+
+    image = build.build_base_image()
+
+    assert image == f"localhost/galaxy-importer-ansible-test:{Build.get_base_image_digest()}"
+    assert build.keep_image
+    assert Build._build_image_with_artifact.call_args.kwargs["tag"] == image
+    with open(os.path.join(build.working_dir.name, "Dockerfile")) as f:
+        assert "archive.tar.gz" not in f.read()
+
+
+def test_build_base_image_cached(mocker, build):
+    mocker.patch.object(Build, "_image_exists", return_value=True)
+    mocker.patch.object(Build, "_build_image_with_artifact")
+
+    image = build.build_base_image()
+
+    assert image.startswith("localhost/galaxy-importer-ansible-test:")
+    assert not Build._build_image_with_artifact.called
+
+
+@mock.patch("galaxy_importer.ansible_test.builders.local_image_build.Popen")
+def test_build_image_with_artifact_tag(mocked_popen):
+    with tempfile.TemporaryDirectory() as dir:
+        mocked_popen.return_value.stdout = ["sha256:1234"]
+        mocked_popen.return_value.wait.return_value = 0
+        Build._build_image_with_artifact(dirname=dir, container_engine="podman", tag="img:tag")
+        assert mocked_popen.call_args.args[0][-2:] == ["--tag", "img:tag"]
+
+
 def test_copy_collection_file():
     with tempfile.TemporaryDirectory() as dir, tempfile.NamedTemporaryFile() as f:
         Build._copy_collection_file(dir, f.name)
         assert os.path.exists(os.path.join(dir, "archive.tar.gz"))
+        # on the same filesystem the archive is linked, not copied
+        assert os.path.samefile(f.name, os.path.join(dir, "archive.tar.gz"))
 
 
 @pytest.fixture
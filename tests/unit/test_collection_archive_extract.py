@@ -15,6 +15,7 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import hashlib
 import os
 import shutil
 import tarfile
@@ -22,8 +23,13 @@ import tempfile
 import unittest
 from io import BytesIO
 
-from galaxy_importer.collection import _extract_archive
-from galaxy_importer.exceptions import ImporterError
+from galaxy_importer.collection import (
+    ArchiveLimits,
+    _extract_archive,
+    _extract_archive_files,
+    _extract_archive_pipelined,
+)
+from galaxy_importer.exceptions import ArchiveLimitError, ImporterError
 
 
 class TestCollectionExtractArchive(unittest.TestCase):
@@ -155,3 +161,162 @@ class TestCollectionExtractArchive(unittest.TestCase):
 
         # Clean up the temporary extraction directory
         shutil.rmtree(extract_dir)
+
+    def test_returns_member_names(self):
+        archive_data = b"testfile content"
+        archive_file = BytesIO()
+        with tarfile.open(fileobj=archive_file, mode="w") as tf:
+            tarinfo = tarfile.TarInfo("./MANIFEST.json")
+            tarinfo.size = len(archive_data)
+            tf.addfile(tarinfo, BytesIO(archive_data))
+            tarinfo = tarfile.TarInfo("roles/my_role/tasks/main.yml")
+            tarinfo.size = len(archive_data)
+            tf.addfile(tarinfo, BytesIO(archive_data))
+        archive_file.seek(0)
+
+        extract_dir = tempfile.mkdtemp(prefix="collection-archive-extract-test-")
+
+        member_names = _extract_archive(archive_file, extract_dir).member_names
+
+        # implied parent dirs are included, to match a walk of extract_dir
+        self.assertEqual(
+            member_names,
+            {
+                "MANIFEST.json",
+                "roles",
+                "roles/my_role",
+                "roles/my_role/tasks",
+                "roles/my_role/tasks/main.yml",
+            },
+        )
+
+        shutil.rmtree(extract_dir)
+
+    def test_skip_dirs(self):
+        archive_data = b"testfile content"
+        archive_file = BytesIO()
+        with tarfile.open(fileobj=archive_file, mode="w") as tf:
+            for name in ["README.md", "tests/unit/test_x.py", "tests/sanity/ignore-2.15.txt"]:
+                tarinfo = tarfile.TarInfo(name)
+                tarinfo.size = len(archive_data)
+                tf.addfile(tarinfo, BytesIO(archive_data))
+        archive_file.seek(0)
+
+        extract_dir = tempfile.mkdtemp(prefix="collection-archive-extract-test-")
+
+        extracted = _extract_archive(archive_file, extract_dir, skip_dirs=("tests/unit/",))
+
+        self.assertIn("tests/unit/test_x.py", extracted.member_names)
+        self.assertEqual(
+            extracted.skipped_files,
+            {"tests/unit/test_x.py": hashlib.sha256(archive_data).hexdigest()},
+        )
+        self.assertTrue(os.path.isfile(os.path.join(extract_dir, "README.md")))
+        self.assertTrue(os.path.isfile(os.path.join(extract_dir, "tests/sanity/ignore-2.15.txt")))
+        self.assertFalse(os.path.exists(os.path.join(extract_dir, "tests/unit/test_x.py")))
+
+        # skipped files are extracted later when needed
+        _extract_archive_files(archive_file, extract_dir, extracted.skipped_files)
+        self.assertTrue(os.path.isfile(os.path.join(extract_dir, "tests/unit/test_x.py")))
+
+        shutil.rmtree(extract_dir)
+
+    def _build_archive(self, files, mode="w"):
+        archive_file = BytesIO()
+        with tarfile.open(fileobj=archive_file, mode=mode) as tf:
+            for name, data in files:
+                tarinfo = tarfile.TarInfo(name)
+                tarinfo.size = len(data)
+                tf.addfile(tarinfo, BytesIO(data))
+        archive_file.seek(0)
+        return archive_file
+
+    def test_archive_limits(self):
+        files = [("file_a", b"a" * 100), ("file_b", b"b" * 100)]
+        limits_and_messages = [
+            (ArchiveLimits(max_members=1), "more than the maximum of 1 files"),
+            (ArchiveLimits(max_file_size=99), "file_a is larger than the maximum of 99 bytes"),
+            (ArchiveLimits(max_size=150), "contents are larger than the maximum of 150 bytes"),
+        ]
+        for limits, message in limits_and_messages:
+            extract_dir = tempfile.mkdtemp(prefix="collection-archive-extract-test-")
+            with self.assertRaisesRegex(ArchiveLimitError, message):
+                _extract_archive(self._build_archive(files), extract_dir, limits=limits)
+            # nothing was written before the limit was hit
+            self.assertEqual(os.listdir(extract_dir), [])
+            shutil.rmtree(extract_dir)
+
+    def test_archive_limits_compression_ratio(self):
+        archive_file = self._build_archive([("zeros", b"\0" * 1024 * 1024)], mode="w:gz")
+        extract_dir = tempfile.mkdtemp(prefix="collection-archive-extract-test-")
+
+        with self.assertRaisesRegex(ArchiveLimitError, "compression ratio"):
+            _extract_archive(
+                archive_file, extract_dir, limits=ArchiveLimits(max_compression_ratio=100)
+            )
+
+        _extract_archive(archive_file, extract_dir, limits=ArchiveLimits())
+        self.assertTrue(os.path.isfile(os.path.join(extract_dir, "zeros")))
+        shutil.rmtree(extract_dir)
+
+    def test_pipelined(self):
+        archive_file = BytesIO()
+        with tarfile.open(fileobj=archive_file, mode="w:gz") as tf:
+            tarinfo = tarfile.TarInfo("roles")
+            tarinfo.type = tarfile.DIRTYPE
+            tarinfo.mode = 0o755
+            tf.addfile(tarinfo)
+            for name, data in [("README.md", b"readme"), ("tests/unit/test_x.py", b"test")]:
+                tarinfo = tarfile.TarInfo(name)
+                tarinfo.size = len(data)
+                tf.addfile(tarinfo, BytesIO(data))
+            tarinfo = tarfile.TarInfo("roles/link")
+            tarinfo.type = tarfile.SYMTYPE
+            tarinfo.linkname = "../README.md"
+            tf.addfile(tarinfo)
+        archive_file.seek(0)
+        extract_dir = tempfile.mkdtemp(prefix="collection-archive-extract-test-")
+
+        extracted = _extract_archive_pipelined(archive_file, extract_dir, skip_dirs=("tests/",))
+
+        self.assertEqual(
+            extracted.member_names,
+            {"roles", "README.md", "tests", "tests/unit", "tests/unit/test_x.py", "roles/link"},
+        )
+        self.assertEqual(
+            extracted.chksums,
+            {
+                "README.md": hashlib.sha256(b"readme").hexdigest(),
+                "tests/unit/test_x.py": hashlib.sha256(b"test").hexdigest(),
+            },
+        )
+        self.assertEqual(list(extracted.skipped_files), ["tests/unit/test_x.py"])
+        self.assertFalse(os.path.exists(os.path.join(extract_dir, "tests/unit/test_x.py")))
+        with open(os.path.join(extract_dir, "roles/link")) as f:
+            self.assertEqual(f.read(), "readme")
+
+        shutil.rmtree(extract_dir)
+
+    def test_pipelined_invalid_path(self):
+        archive_file = self._build_archive([("../invalid_path", b"data")])
+        extract_dir = tempfile.mkdtemp(prefix="collection-archive-extract-test-")
+
+        with self.assertRaisesRegex(ImporterError, "Invalid file paths detected"):
+            _extract_archive_pipelined(archive_file, extract_dir)
+
+        with self.assertRaises(ArchiveLimitError):
+            _extract_archive_pipelined(
+                self._build_archive([("a", b"a"), ("b", b"b")]),
+                extract_dir,
+                limits=ArchiveLimits(max_members=1),
+            )
+
+        shutil.rmtree(extract_dir)
+
+    def test_pipelined_corrupt_archive(self):
+        extract_dir = tempfile.mkdtemp(prefix="collection-archive-extract-test-")
+
+        with self.assertRaisesRegex(ImporterError, "Could not extract archive"):
+            _extract_archive_pipelined(BytesIO(b"\x1f\x8b" + b"garbage" * 100), extract_dir)
+
+        shutil.rmtree(extract_dir)
@@ -89,6 +89,7 @@ def test_no_config_data():
     assert cfg.infra_osd is False
     assert cfg.tmp_root_dir is None
     assert cfg.ansible_local_tmp == "~/.ansible/tmp"
+    assert cfg.max_archive_members == 250000
 
 
 def test_config_bad_ini_section(temp_config_file):
@@ -15,10 +15,13 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import hashlib
+import io
 import logging
 import os
 import tarfile
 import tempfile
+from types import SimpleNamespace
 
 from git import Repo
 import pytest
@@ -26,6 +29,8 @@ import pytest
 from galaxy_importer import collection
 from galaxy_importer import config
 from galaxy_importer import exceptions as exc
+from galaxy_importer import schema
+from galaxy_importer.utils import http_reader
 
 log = logging.getLogger(__name__)
 
@@ -52,6 +57,61 @@ def test_import_collection(mocker):
     assert collection._import_collection.called
 
 
+def test_import_collection_previous_result(mocker, mock__import_collection):
+    mocker.patch.object(collection, "_extract_archive")
+    previous_result = {"lint_report": None}
+    collection.import_collection(
+        file=io.BytesIO(b""), logger=logging, cfg=config.Config(), previous_result=previous_result
+    )
+    assert collection.CollectionLoader.call_args.kwargs["previous_result"] is previous_result
+
+
+def test_import_collection_result_cache(mocker, tmp_path):
+    mocker.patch.object(collection, "_import_collection", return_value={"metadata": {}})
+    cfg = config.Config(config_data={"result_cache_dir": str(tmp_path)})
+
+    first = collection.import_collection(file=io.BytesIO(b"artifact"), logger=logging, cfg=cfg)
+    second = collection.import_collection(file=io.BytesIO(b"artifact"), logger=logging, cfg=cfg)
+    assert first == second == {"metadata": {}}
+    assert collection._import_collection.call_count == 1
+
+    collection.import_collection(file=io.BytesIO(b"changed"), logger=logging, cfg=cfg)
+    assert collection._import_collection.call_count == 2
+
+
+def test_import_collection_result_cache_roundtrip(mocker, tmp_path):
+    mocker.patch.object(collection, "_import_collection", return_value={"tags": ("a", "b")})
+    cfg = config.Config(config_data={"result_cache_dir": str(tmp_path)})
+
+    fresh = collection.import_collection(file=io.BytesIO(b"artifact"), logger=logging, cfg=cfg)
+    cached = collection.import_collection(file=io.BytesIO(b"artifact"), logger=logging, cfg=cfg)
+    assert fresh == cached == {"tags": ["a", "b"]}
+
+
+def test_import_collection_as_dict(mocker, tmp_path):
+    mocker.patch.object(collection, "_import_collection", return_value={"metadata": {}})
+
+    collection.import_collection(file=io.BytesIO(b"artifact"), cfg=config.Config(), as_dict=False)
+    assert collection._import_collection.call_args.kwargs["as_dict"] is False
+
+    # the result cache stores dicts
+    cfg = config.Config(config_data={"result_cache_dir": str(tmp_path)})
+    collection.import_collection(file=io.BytesIO(b"artifact"), cfg=cfg, as_dict=False)
+    assert collection._import_collection.call_args.kwargs["as_dict"] is True
+
+
+def test_import_collection_result_cache_write_error(mocker, tmp_path, caplog):
+    mocker.patch.object(collection, "_import_collection", return_value={"metadata": {}})
+    mocker.patch.object(
+        collection.result_cache.tempfile, "mkstemp", side_effect=OSError("Read-only file system")
+    )
+    cfg = config.Config(config_data={"result_cache_dir": str(tmp_path)})
+
+    metadata = collection.import_collection(file=io.BytesIO(b"artifact"), logger=log, cfg=cfg)
+    assert metadata == {"metadata": {}}
+    assert "Could not write import result cache entry" in caplog.text
+
+
 def test_sync_collection(tmp_collection_root):
     git_url = "https://github.com/openshift/community.okd.git"
     Repo.clone_from(git_url, tmp_collection_root, depth=1)
@@ -59,12 +119,249 @@ def test_sync_collection(tmp_collection_root):
     assert "community-okd" in filepath
 
 
+def test_native_build_sync_collection(tmp_path):
+    src = tmp_path / "src"
+    _write_collection_src(src)
+    (src / "plugins/modules/alias.py").symlink_to("my_module.py")
+    cfg = config.Config(
+        config_data={
+            "native_collection_build": True,
+            "run_ansible_doc": False,
+            "check_changelog": False,
+        }
+    )
+
+    metadata, filepath = collection.sync_collection(str(src), str(tmp_path), logger=log, cfg=cfg)
+    assert filepath == str(tmp_path / "my_namespace-my_collection-1.0.0.tar.gz")
+    assert metadata["metadata"]["name"] == "my_collection"
+    assert sorted(c["name"] for c in metadata["contents"]) == ["alias", "my_module"]
+
+
+def test_native_build_sync_collection_source_changed(mocker, tmp_path):
+    src = tmp_path / "src"
+    _write_collection_src(src)
+    build_collection = collection.collection_build.build_collection
+
+    def build_then_change(*args):
+        built = build_collection(*args)
+        (src / "plugins/modules/my_module.py").write_text("# changed after the build\n")
+        return built
+
+    mocker.patch.object(
+        collection.collection_build, "build_collection", side_effect=build_then_change
+    )
+    cfg = config.Config(
+        config_data={
+            "native_collection_build": True,
+            "run_ansible_doc": False,
+            "check_changelog": False,
+        }
+    )
+
+    with pytest.raises(exc.CollectionArtifactFileChecksumError):
+        collection.sync_collection(str(src), str(tmp_path), logger=log, cfg=cfg)
+
+
+def test_import_collection_native_build_fallback(mocker, tmp_path):
+    mocker.patch.object(
+        collection.collection_build,
+        "build_collection",
+        side_effect=collection.collection_build.UnsupportedBuildError("manifest"),
+    )
+    mocker.patch.object(collection, "_build_collection", return_value=str(tmp_path / "a.tar.gz"))
+    mocker.patch.object(collection, "_import_collection", return_value={})
+    (tmp_path / "a.tar.gz").write_bytes(b"")
+    cfg = config.Config(config_data={"native_collection_build": True})
+
+    result = collection.import_collection(git_clone_path="src", output_path="out", cfg=cfg)
+    assert result == ({}, str(tmp_path / "a.tar.gz"))
+    assert collection._import_collection.call_args.kwargs["built"] is None
+
+
+def _write_collection_src(src):
+    (src / "plugins/modules").mkdir(parents=True)
+    (src / "meta").mkdir()
+    (src / "galaxy.yml").write_text(
+        "namespace: my_namespace\n"
+        "name: my_collection\n"
+        "version: 1.0.0\n"
+        "readme: README.md\n"
+        "authors: [Me]\n"
+        "license: [GPL-3.0-or-later]\n"
+        "tags: [tools]\n"
+        "repository: https://example.com/my_collection\n"
+    )
+    (src / "README.md").write_text("# my_collection\n")
+    (src / "meta/runtime.yml").write_text("requires_ansible: '>=2.15'\n")
+    (src / "plugins/modules/my_module.py").write_text("# module\n")
+
+
+@pytest.fixture
+def installed_collection_dir(tmp_path):
+    _write_collection_src(tmp_path / "src")
+    built = collection.collection_build.build_collection(str(tmp_path / "src"), str(tmp_path))
+    collection_dir = tmp_path / "ansible_collections/my_namespace/my_collection"
+    collection_dir.mkdir(parents=True)
+    with tarfile.open(built.filepath) as tf:
+        tf.extractall(collection_dir)
+    return collection_dir
+
+
+def test_import_collection_dir(installed_collection_dir):
+    cfg = config.Config(
+        config_data={"run_ansible_doc": False, "check_changelog": False, "run_ansible_test": True}
+    )
+    data = collection.import_collection_dir(str(installed_collection_dir), logger=log, cfg=cfg)
+    assert data["metadata"]["name"] == "my_collection"
+    assert [c["name"] for c in data["contents"]] == ["my_module"]
+    assert installed_collection_dir.is_dir()
+
+    (installed_collection_dir / "extra.txt").write_text("extra")
+    with pytest.raises(exc.FileNotInFileManifestError):
+        collection.import_collection_dir(str(installed_collection_dir), logger=log, cfg=cfg)
+    data = collection.import_collection_dir(
+        str(installed_collection_dir), logger=log, cfg=cfg, verify_files=False
+    )
+    assert data["metadata"]["name"] == "my_collection"
+
+    data = collection.import_collection_dir(
+        str(installed_collection_dir), logger=log, cfg=cfg, verify_files=False, as_dict=False
+    )
+    assert isinstance(data, schema.ImportResult)
+    assert data.metadata.name == "my_collection"
+
+
+def test_import_collection_dir_path_errors(installed_collection_dir):
+    cfg = config.Config(config_data={"run_ansible_doc": False, "check_changelog": False})
+    with pytest.raises(exc.ImporterError, match="of the form ansible_collections"):
+        collection.import_collection_dir(
+            str(installed_collection_dir / "plugins"), logger=log, cfg=cfg
+        )
+
+    renamed = installed_collection_dir.parent / "other_name"
+    installed_collection_dir.rename(renamed)
+    with pytest.raises(exc.ManifestValidationError, match="did not match metadata"):
+        collection.import_collection_dir(str(renamed), logger=log, cfg=cfg)
+    assert renamed.is_dir()
+
+
+def test_import_collection_file_url(mocker, tmp_path, caplog):
+    _write_collection_src(tmp_path / "src")
+    built = collection.collection_build.build_collection(str(tmp_path / "src"), str(tmp_path))
+    with open(built.filepath, "rb") as f:
+        data = f.read()
+    response = mocker.Mock(status_code=200, headers={"Content-Length": str(len(data))})
+    response.iter_content.return_value = iter([data[:1000], data[1000:]])
+    fetcher = mocker.Mock(return_value=response)
+    cfg = config.Config(
+        config_data={"run_ansible_doc": False, "run_ansible_lint": False, "check_changelog": False}
+    )
+
+    caplog.set_level(logging.INFO)
+    metadata = collection.import_collection(
+        file_url="https://example.com/a.tar.gz", logger=log, cfg=cfg, fetcher=fetcher
+    )
+    assert metadata["metadata"]["name"] == "my_collection"
+    assert fetcher.call_count == 1
+    assert f"sha256 {hashlib.sha256(data).hexdigest()}" in caplog.text
+
+
+def test__import_collection_stream_downloads_for_runner(mocker, tmp_path, mock__import_collection):
+    mocker.patch.object(collection, "_extract_archive")
+    collection.runners.get_runner.return_value.uses_archive_file = True
+    stream = mocker.Mock(size=3)
+    stream.seekable.return_value = False
+    stream.read.side_effect = [b"abc", b""]
+    cfg = config.Config(config_data={"tmp_root_dir": str(tmp_path)})
+
+    collection._import_collection(stream, None, None, logging, cfg)
+    file = collection._extract_archive.call_args.kwargs["fileobj"]
+    assert file.name.endswith("archive.tar.gz")
+    assert file.closed
+
+
+@pytest.fixture
+def url_stream(mocker):
+    """A forward-only stream of file_url, as passed to runners that use file_url."""
+    stream = mocker.Mock(spec=http_reader.HttpArtifactReader, size=3)
+    stream.seekable.return_value = False
+    return stream
+
+
+def test__import_collection_stream_for_file_url_runner(
+    mocker, tmp_path, mock__import_collection, url_stream
+):
+    mocker.patch.object(collection, "_extract_archive_pipelined")
+    runner = collection.runners.get_runner.return_value
+    runner.uses_archive_file = False
+    cfg = config.Config(config_data={"tmp_root_dir": str(tmp_path)})
+
+    collection._import_collection(url_stream, None, "https://example.com/a.tar.gz", logging, cfg)
+    assert collection._extract_archive_pipelined.call_args.kwargs["fileobj"] is url_stream
+    assert runner.call_args.kwargs["filepath"] is None
+    assert runner.call_args.kwargs["file_url"] == "https://example.com/a.tar.gz"
+    assert runner.return_value.run.called
+
+
+def test__import_collection_stream_for_concurrent_file_url_runner(
+    mocker, tmp_path, mock__import_collection, concurrent_loader, url_stream
+):
+    mocker.patch.object(collection, "_extract_archive_pipelined")
+    runner = collection.runners.get_runner.return_value
+    runner.uses_archive_file = False
+    cfg = config.Config(
+        config_data={"tmp_root_dir": str(tmp_path), "concurrent_ansible_test": True}
+    )
+
+    collection._import_collection(url_stream, None, "https://example.com/a.tar.gz", logging, cfg)
+    assert concurrent_loader.calls == ["metadata", "loaded"]
+    assert collection.runners.BackgroundTestRun.call_args.args == (runner.return_value,)
+    assert runner.call_args.kwargs["filepath"] is None
+
+
+def test_link_built_collection(mocker, tmp_path):
+    built = mocker.Mock(
+        path=str(tmp_path / "src"),
+        manifest_json=b"{}",
+        file_manifest_json=b"[]",
+        file_manifest={
+            "files": [
+                {"name": ".", "ftype": "dir", "chksum_sha256": None},
+                {"name": "plugins", "ftype": "dir", "chksum_sha256": None},
+                {"name": "plugins/a.py", "ftype": "file", "chksum_sha256": "1"},
+                {"name": "plugins/b.py", "ftype": "file", "chksum_sha256": "1"},
+            ]
+        },
+    )
+    (tmp_path / "src/plugins").mkdir(parents=True)
+    (tmp_path / "src/plugins/a.py").write_text("a")
+    (tmp_path / "src/plugins/b.py").symlink_to("a.py")
+    extract_dir = tmp_path / "extract"
+    extract_dir.mkdir()
+
+    extracted = collection._link_built_collection(built, str(extract_dir))
+    assert extracted.member_names == {
+        "MANIFEST.json",
+        "FILES.json",
+        "plugins",
+        "plugins/a.py",
+        "plugins/b.py",
+    }
+    # linked files are hashed when FILES.json is verified
+    assert set(extracted.chksums) == {"MANIFEST.json", "FILES.json"}
+    assert (extract_dir / "FILES.json").read_bytes() == b"[]"
+    assert (extract_dir / "plugins/a.py").read_text() == "a"
+    assert os.readlink(extract_dir / "plugins/b.py") == "a.py"
+
+
 @pytest.fixture
 def mock__import_collection(mocker):
     mocker.patch.object(collection, "CollectionLoader")
     mocked_runners = mocker.patch.object(collection, "runners")
     mocked_attr = mocker.patch.object(collection, "attr")
     mocked_runners.get_runner.return_value = mocker.stub()
+    mocked_runners.get_runner.return_value.uses_extracted_dir = False
+    mocked_runners.get_runner.return_value.uses_archive_file = True
     mocked_attr.asdict.return_value = None
 
 
@@ -78,6 +375,218 @@ def test__import_collection(mocker, tmp_collection_root, mock__import_collection
     assert collection._extract_archive.called
 
 
+def test__import_collection_extracts_skipped_files_for_runner(
+    mocker, tmp_collection_root, mock__import_collection
+):
+    mocker.patch.object(collection, "_extract_archive")
+    mocker.patch.object(collection, "_extract_archive_files")
+    collection._extract_archive.return_value = collection.ExtractedArchive(
+        member_names={"tests/unit/test_x.py"},
+        skipped_files={"tests/unit/test_x.py": "abc"},
+        chksums={"tests/unit/test_x.py": "abc"},
+    )
+    collection.runners.get_runner.return_value.uses_extracted_dir = True
+    metadata = collection.CollectionLoader.return_value.load.return_value.metadata
+    metadata.namespace, metadata.name = "my_namespace", "my_collection"
+
+    cfg = config.Config(config_data={"selective_extraction": True})
+    with open(os.path.join(tmp_collection_root, "test_file.tar.gz"), "ab") as f:
+        pass
+    with open(os.path.join(tmp_collection_root, "test_file.tar.gz"), "rb") as f:
+        collection._import_collection(file=f, filename="", file_url=None, logger=logging, cfg=cfg)
+
+    assert collection._extract_archive.call_args.kwargs["skip_dirs"] == (
+        "tests/integration/",
+        "tests/unit/",
+    )
+    _, collection_dir, names = collection._extract_archive_files.call_args.args
+    assert collection_dir.endswith("ansible_collections/my_namespace/my_collection")
+    assert names == {"tests/unit/test_x.py": "abc"}
+
+
+def _tar_gz(files):
+    fileobj = io.BytesIO()
+    with tarfile.open(fileobj=fileobj, mode="w:gz") as tf:
+        for name, data in files:
+            tarinfo = tarfile.TarInfo(name)
+            tarinfo.size = len(data)
+            tf.addfile(tarinfo, io.BytesIO(data))
+    return fileobj.getvalue()
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        (_tar_gz([("a", b"x" * 500), ("b", b"x" * 500)]), "memory"),
+        (_tar_gz([("a", b"x" * 500), ("b", b"x" * 501)]), "disk"),
+        # a few hundred bytes compressed, inflating far past memory_tmp_max_size
+        (_tar_gz([("zeros", bytes(256 * 1024))]), "disk"),
+        (b"x" * 1000, "disk"),
+        (b"x" * 1001, "disk"),
+    ],
+)
+def test__get_tmp_root_dir(tmp_path, data, expected):
+    dirs = {"memory": str(tmp_path / "memory"), "disk": str(tmp_path / "disk")}
+    os.makedirs(dirs["memory"])
+    cfg = config.Config(
+        config_data={
+            "tmp_root_dir": dirs["disk"],
+            "memory_tmp_root_dir": dirs["memory"],
+            "memory_tmp_max_size": "1000",
+        }
+    )
+    archive = io.BytesIO(data)
+    assert collection._get_tmp_root_dir(archive, cfg) == dirs[expected]
+    assert archive.tell() == 0
+
+
+def test__get_tmp_root_dir_stream(tmp_path, mocker):
+    os.makedirs(tmp_path / "memory")
+    cfg = config.Config(
+        config_data={"tmp_root_dir": "disk", "memory_tmp_root_dir": str(tmp_path / "memory")}
+    )
+    stream = mocker.Mock(spec=http_reader.HttpArtifactReader, size=10)
+    stream.seekable.return_value = False
+    assert collection._get_tmp_root_dir(stream, cfg) == "disk"
+
+
+class _ForwardOnlyStream:
+    """A generic forward-only stream, without the size of HttpArtifactReader."""
+
+    def __init__(self, data):
+        self._fileobj = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._fileobj.read(size)
+
+    def seekable(self):
+        return False
+
+
+class _FileWithoutSeekable:
+    def __init__(self, data):
+        self._fileobj = io.BytesIO(data)
+        self.read = self._fileobj.read
+        self.seek = self._fileobj.seek
+        self.tell = self._fileobj.tell
+
+
+def test__get_archive_size():
+    data = _tar_gz([("a", b"a")])
+    assert collection._get_archive_size(io.BytesIO(data)) == len(data)
+    assert collection._get_archive_size(_FileWithoutSeekable(data)) == len(data)
+    assert collection._get_archive_size(_ForwardOnlyStream(data)) is None
+
+
+def test__extract_archive_pipelined_generic_stream(tmp_path):
+    data = _tar_gz([("a.txt", b"a"), ("zeros", bytes(256 * 1024))])
+    extracted = collection._extract_archive_pipelined(
+        _ForwardOnlyStream(data),
+        str(tmp_path),
+        limits=collection.ArchiveLimits(max_compression_ratio=2),
+    )
+    assert extracted.member_names == {"a.txt", "zeros"}
+    assert (tmp_path / "a.txt").read_bytes() == b"a"
+
+
+def test__get_tmp_root_dir_missing_memory_dir(tmp_path):
+    cfg = config.Config(
+        config_data={"tmp_root_dir": None, "memory_tmp_root_dir": str(tmp_path / "missing")}
+    )
+    assert collection._get_tmp_root_dir(io.BytesIO(b""), cfg) is None
+
+
+def test__import_collection_copies_fileobj_for_runner(mocker, mock__import_collection):
+    mocker.patch.object(collection, "_extract_archive")
+    runner_args = {}
+
+    def runner(**kwargs):
+        with open(kwargs["filepath"], "rb") as f:
+            runner_args["archive"] = f.read()
+        return mocker.Mock()
+
+    runner.uses_extracted_dir = False
+    runner.uses_archive_file = True
+    collection.runners.get_runner.return_value = runner
+    cfg = config.Config(config_data={})
+
+    collection._import_collection(
+        file=io.BytesIO(b"artifact"), filename="", file_url=None, logger=logging, cfg=cfg
+    )
+    assert runner_args["archive"] == b"artifact"
+
+
+@pytest.fixture
+def concurrent_loader(mocker):
+    """CollectionLoader that reports metadata, then runs load_after_metadata."""
+    calls = []
+    load_after_metadata = mocker.Mock()
+
+    def loader(*args, on_metadata_loaded=None, **kwargs):
+        def load():
+            calls.append("metadata")
+            on_metadata_loaded("metadata")
+            load_after_metadata()
+            calls.append("loaded")
+            return mocker.Mock()
+
+        return mocker.Mock(load=load)
+
+    mocker.patch.object(collection, "CollectionLoader", side_effect=loader)
+    return SimpleNamespace(calls=calls, load_after_metadata=load_after_metadata)
+
+
+def test__import_collection_concurrent_ansible_test(
+    mocker, mock__import_collection, concurrent_loader
+):
+    mocker.patch.object(collection, "_extract_archive")
+    background_test = collection.runners.BackgroundTestRun
+
+    def start(runner):
+        concurrent_loader.calls.append("started")
+        return mocker.Mock(join=lambda: concurrent_loader.calls.append("joined"))
+
+    background_test.side_effect = start
+    runner = collection.runners.get_runner.return_value
+    cfg = config.Config(config_data={"concurrent_ansible_test": True})
+
+    collection._import_collection(
+        file=io.BytesIO(b"artifact"), filename="", file_url=None, logger=logging, cfg=cfg
+    )
+    assert concurrent_loader.calls == ["metadata", "started", "loaded", "joined"]
+    assert background_test.call_args.args == (runner.return_value,)
+    assert runner.call_args.kwargs["metadata"] == "metadata"
+    assert not runner.return_value.run.called
+
+
+def test__import_collection_concurrent_ansible_test_cancelled(
+    mocker, mock__import_collection, concurrent_loader
+):
+    mocker.patch.object(collection, "_extract_archive")
+    concurrent_loader.load_after_metadata.side_effect = exc.ImporterError("lint failed")
+    cfg = config.Config(config_data={"concurrent_ansible_test": True})
+
+    with pytest.raises(exc.ImporterError, match="lint failed"):
+        collection._import_collection(
+            file=io.BytesIO(b"artifact"), filename="", file_url=None, logger=logging, cfg=cfg
+        )
+    background_test = collection.runners.BackgroundTestRun.return_value
+    assert background_test.cancel.called
+    assert not background_test.join.called
+
+
+def test__import_collection_pipelined(mocker, tmp_collection_root, mock__import_collection):
+    mocker.patch.object(collection, "_extract_archive_pipelined")
+    cfg = config.Config(config_data={"pipelined_extraction": True})
+    with open(os.path.join(tmp_collection_root, "test_file.tar.gz"), "ab") as f:
+        pass
+    with open(os.path.join(tmp_collection_root, "test_file.tar.gz"), "rb") as f:
+        collection._import_collection(file=f, filename="", file_url=None, logger=logging, cfg=cfg)
+    assert collection._extract_archive_pipelined.called
+    file_chksums = collection.CollectionLoader.call_args.kwargs["file_chksums"]
+    assert file_chksums is collection._extract_archive_pipelined.return_value.chksums
+
+
 def test__build_collection(tmp_collection_root):
     git_url = "https://github.com/openshift/community.okd.git"
     Repo.clone_from(git_url, tmp_collection_root, depth=1)
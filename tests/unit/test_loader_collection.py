@@ -34,6 +34,7 @@ from galaxy_importer.collection import CollectionLoader
 from galaxy_importer.constants import ContentType, MIN_ANSIBLE_LINT_PATTERNS_VERSION
 from galaxy_importer import exceptions as exc
 from galaxy_importer import schema
+from galaxy_importer.loaders import collection as collection_loader_module
 from galaxy_importer.utils import chksums as chksums_utils
 from galaxy_importer.utils import markup as markup_utils
 from galaxy_importer.utils.lint_version import get_version_from_metadata
@@ -198,6 +199,18 @@ def test_check_artifact_file_bad_chksum(populated_collection_root, readme_artifa
         chksums_utils.check_artifact_file(populated_collection_root, readme_artifact_file)
 
 
+@pytest.mark.sha256("e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855")
+def test_check_artifact_file_precomputed_chksum(tmp_collection_root, readme_artifact_file):
+    # README.md is not on disk, the chksum computed at extraction is used instead
+    assert chksums_utils.check_artifact_file(
+        tmp_collection_root, readme_artifact_file, chksum=readme_artifact_file.chksum_sha256
+    )
+    with pytest.raises(exc.CollectionArtifactFileChecksumError):
+        chksums_utils.check_artifact_file(
+            tmp_collection_root, readme_artifact_file, chksum="deadbeef"
+        )
+
+
 @mock.patch("galaxy_importer.collection.CollectionLoader._build_docs_blob")
 def test_manifest_success(_build_docs_blob, populated_collection_root):  # noqa: PT019
     _build_docs_blob.return_value = {}
@@ -497,6 +510,31 @@ def test_changelog_fail(_build_docs_blob, populated_collection_root, caplog):  #
     )
 
 
+@mock.patch("galaxy_importer.collection.CollectionLoader._build_docs_blob")
+def test_on_metadata_loaded(_build_docs_blob, populated_collection_root):  # noqa: PT019
+    _build_docs_blob.return_value = {}
+    loaded = []
+
+    def on_metadata_loaded(metadata):
+        # called before ansible-doc and the docs blob
+        assert not _build_docs_blob.called
+        loaded.append(metadata)
+
+    filename = collection.CollectionFilename("my_namespace", "my_collection", "2.0.2")
+    data = CollectionLoader(
+        populated_collection_root,
+        filename,
+        cfg=SimpleNamespace(
+            run_ansible_doc=False,
+            run_ansible_lint=False,
+            check_changelog=False,
+            ansible_local_tmp=populated_collection_root,
+        ),
+        on_metadata_loaded=on_metadata_loaded,
+    ).load()
+    assert loaded == [data.metadata]
+
+
 def test_manifest_json_with_no_files_json_info(populated_collection_root):
     # Modify MANIFEST.json so it doesn't reference a FILES.json
     manifest_json_obj = json.loads(MANIFEST_JSON)
@@ -534,6 +572,36 @@ def test_unaccounted_for_files(populated_collection_root):
     assert "a.out" in excinfo.value.unexpected_files
 
 
+def test_unaccounted_for_files_from_archive_members(populated_collection_root):
+    archive_members = {".oops-a-secret", "LICENSE", "README.md", "meta", "meta/runtime.yml"}
+    archive_members.update({"MANIFEST.json", "FILES.json"})
+
+    with pytest.raises(exc.FileNotInFileManifestError) as excinfo:
+        CollectionLoader(
+            populated_collection_root,
+            filename=None,
+            cfg=SimpleNamespace(run_ansible_doc=True),
+            archive_members=archive_members,
+        ).load()
+    assert excinfo.value.unexpected_files == [".oops-a-secret"]
+
+
+@mock.patch("galaxy_importer.loaders.collection.FileWalker")
+def test_archive_members_skip_file_walk(mocked_file_walker, populated_collection_root):
+    archive_members = {"LICENSE", "README.md", "meta", "meta/runtime.yml"}
+    archive_members.update({"MANIFEST.json", "FILES.json"})
+
+    loader = CollectionLoader(
+        populated_collection_root, filename=None, archive_members=archive_members
+    )
+    manifest = loader._load_manifest()
+    file_manifest = loader._load_file_manifest(
+        populated_collection_root, manifest.file_manifest_file
+    )
+    assert loader._check_file_manifest(populated_collection_root, file_manifest, "FILES.json")
+    assert not mocked_file_walker.called
+
+
 ANSIBLELINT_TASK_WARN = """---
 - name: edit vimrc (lint says name should be uppercase)
   ansible.builtin.lineinfile:
@@ -572,6 +640,7 @@ def test_ansiblelint_playbook_errors(populated_collection_root, tmp_collection_r
             check_changelog=False,
             offline_ansible_lint=True,
             ansible_local_tmp=tmp_collection_root,
+            log_tool_output_lines=True,
         ),
     )
     collection_loader._lint_collection()
@@ -589,6 +658,7 @@ def test_ansiblelint_collection_pass(populated_collection_root, tmp_collection_r
             run_ansible_lint=True,
             offline_ansible_lint=True,
             ansible_local_tmp=tmp_collection_root,
+            log_tool_output_lines=True,
         ),
     )
     collection_loader._lint_collection()
@@ -606,6 +676,7 @@ def test_ansiblelint_true_loader(populated_collection_root, tmp_collection_root,
             check_changelog=False,
             offline_ansible_lint=True,
             ansible_local_tmp=tmp_collection_root,
+            log_tool_output_lines=True,
         ),
     )
     collection_loader.load()
@@ -628,6 +699,7 @@ def test_ansiblelint_collection_role_errors(populated_collection_root, tmp_colle
             run_ansible_lint=True,
             offline_ansible_lint=True,
             ansible_local_tmp=tmp_collection_root,
+            log_tool_output_lines=True,
         ),
     )
     collection_loader._lint_collection()
@@ -652,6 +724,7 @@ def test_ansiblelint_collection_meta_runtime_errors(
             run_ansible_lint=True,
             offline_ansible_lint=True,
             ansible_local_tmp=tmp_collection_root,
+            log_tool_output_lines=True,
         ),
     )
     collection_loader._lint_collection()
@@ -684,6 +757,7 @@ def test_ansiblelint_stderr_filter(mocked_popen, caplog):
             run_ansible_lint=True,
             offline_ansible_lint=True,
             ansible_local_tmp=tmp_collection_root,
+            log_tool_output_lines=True,
         ),
     )
     collection_loader._lint_collection()
@@ -707,6 +781,7 @@ def test_ansiblelint_warning_log(mocked_popen, caplog):
             run_ansible_lint=True,
             offline_ansible_lint=True,
             ansible_local_tmp=tmp_collection_root,
+            log_tool_output_lines=True,
         ),
     )
     collection_loader._lint_collection()
@@ -714,6 +789,300 @@ def test_ansiblelint_warning_log(mocked_popen, caplog):
     assert caplog.records[0].levelname == "WARNING"
 
 
+@mock.patch("galaxy_importer.loaders.collection.Popen")
+def test_ansiblelint_summary_log(mocked_popen, caplog):
+    stdout = (
+        "playbooks/site.yml:2:9: name[casing]: All names should start with an uppercase letter.\n"
+        "playbooks/site.yml:5:9: name[casing]: All names should start with an uppercase letter.\n"
+        "some ansible-lint violation output\n"
+    )
+    mocked_popen.return_value.communicate.return_value = (stdout, "")
+
+    collection_loader = CollectionLoader(
+        populated_collection_root,
+        filename=None,
+        cfg=SimpleNamespace(
+            run_ansible_doc=False,
+            run_ansible_lint=True,
+            offline_ansible_lint=True,
+            ansible_local_tmp=tmp_collection_root,
+            log_tool_output_lines=False,
+        ),
+    )
+    collection_loader._lint_collection()
+
+    assert [r.getMessage() for r in caplog.records] == [
+        "some ansible-lint violation output",
+        "ansible-lint reported 2 finding(s): name[casing] (2)",
+    ]
+    report = collection_loader.lint_report
+    assert report.summary["rule"] == {"name[casing]": 2}
+    assert [(f.path, f.line) for f in report.findings] == [
+        ("playbooks/site.yml", 2),
+        ("playbooks/site.yml", 5),
+    ]
+
+
+def _lint_finding(path, rule="name[casing]"):
+    return {
+        "rule": rule,
+        "path": path,
+        "line": 2,
+        "severity": "error",
+        "message": "All names should start with an uppercase letter.",
+    }
+
+
+def test_plan_incremental_lint():
+    previous_report = {
+        "version": "6.0.0",
+        "file_chksums": {
+            "roles/a/tasks/main.yml": "1",
+            "roles/a/handlers/main.yml": "2",
+            "roles/b/tasks/main.yml": "3",
+            "playbooks/site.yml": "4",
+            "playbooks/old.yml": "5",
+        },
+        "findings": [
+            _lint_finding("roles/a/tasks/main.yml"),
+            _lint_finding("roles/b/tasks/main.yml"),
+            _lint_finding("playbooks/site.yml"),
+            _lint_finding("playbooks/old.yml"),
+        ],
+    }
+    file_chksums = {
+        "roles/a/tasks/main.yml": "1",
+        "roles/a/handlers/main.yml": "changed",
+        "roles/b/tasks/main.yml": "3",
+        "playbooks/site.yml": "4",
+        "playbooks/new.yml": "6",
+    }
+    targets, reused = collection_loader_module._plan_incremental_lint(
+        previous_report, "6.0.0", file_chksums
+    )
+    assert targets == ["playbooks/new.yml", "roles/a"]
+    assert [f.path for f in reused] == ["roles/b/tasks/main.yml", "playbooks/site.yml"]
+
+    assert collection_loader_module._plan_incremental_lint(
+        previous_report, "6.1.0", file_chksums
+    ) == (None, [])
+    assert collection_loader_module._plan_incremental_lint(None, "6.0.0", file_chksums) == (
+        None,
+        [],
+    )
+
+    previous_report["file_chksums"][".ansible-lint"] = "7"
+    targets, reused = collection_loader_module._plan_incremental_lint(
+        previous_report, "6.0.0", {**file_chksums, ".ansible-lint": "7"}
+    )
+    assert targets == ["playbooks/new.yml", "roles/a"]
+    for lint_config_chksums in (
+        {".ansible-lint": "changed"},
+        {},
+        {".ansible-lint": "7", ".ansible-lint-ignore": "8"},
+    ):
+        assert collection_loader_module._plan_incremental_lint(
+            previous_report, "6.0.0", {**file_chksums, **lint_config_chksums}
+        ) == (None, [])
+
+
+def _incremental_lint_loader(previous_report, files=()):
+    loader = CollectionLoader(
+        populated_collection_root,
+        filename=None,
+        cfg=SimpleNamespace(
+            run_ansible_doc=False,
+            run_ansible_lint=True,
+            offline_ansible_lint=True,
+            ansible_local_tmp=tmp_collection_root,
+            log_tool_output_lines=True,
+        ),
+        previous_result={"lint_report": previous_report},
+    )
+    loader.file_manifest = schema.CollectionArtifactFileManifest(
+        files=[
+            {"name": "roles", "ftype": "dir"},
+            {"name": "roles/a/tasks/main.yml", "ftype": "file", "chksum_sha256": "1"},
+            {"name": "playbooks/site.yml", "ftype": "file", "chksum_sha256": "changed"},
+            {"name": "plugins/modules/m.py", "ftype": "file", "chksum_sha256": "3"},
+            *files,
+        ]
+    )
+    return loader
+
+
+@mock.patch("galaxy_importer.loaders.collection.get_version_from_metadata")
+@mock.patch("galaxy_importer.loaders.collection.Popen")
+def test_ansiblelint_incremental(mocked_popen, mocked_version, caplog):
+    mocked_version.return_value = "6.0.0"
+    stdout = "playbooks/site.yml:2: name[casing]: All names should start with an uppercase letter."
+    mocked_popen.return_value.communicate.return_value = (stdout, "")
+    loader = _incremental_lint_loader(
+        {
+            "version": "6.0.0",
+            "file_chksums": {"roles/a/tasks/main.yml": "1", "playbooks/site.yml": "2"},
+            "findings": [
+                _lint_finding("roles/a/tasks/main.yml"),
+                _lint_finding("playbooks/site.yml"),
+            ],
+        }
+    )
+    loader._lint_collection()
+
+    cmd = mocked_popen.call_args.args[0]
+    assert cmd[-1] == "playbooks/site.yml"
+    assert "roles/a" not in cmd
+    report = loader.lint_report
+    assert [f.path for f in report.findings] == ["roles/a/tasks/main.yml", "playbooks/site.yml"]
+    assert report.version == "6.0.0"
+    assert report.file_chksums == {"roles/a/tasks/main.yml": "1", "playbooks/site.yml": "changed"}
+    assert "roles/a/tasks/main.yml:2: name[casing]:" in caplog.text
+
+
+@mock.patch("galaxy_importer.loaders.collection.get_version_from_metadata")
+@mock.patch("galaxy_importer.loaders.collection.Popen")
+def test_ansiblelint_incremental_unchanged(mocked_popen, mocked_version):
+    mocked_version.return_value = "6.0.0"
+    loader = _incremental_lint_loader(
+        {
+            "version": "6.0.0",
+            "file_chksums": {"roles/a/tasks/main.yml": "1", "playbooks/site.yml": "changed"},
+            "findings": [_lint_finding("roles/a/tasks/main.yml")],
+        }
+    )
+    loader._lint_collection()
+
+    assert not mocked_popen.called
+    assert [f.path for f in loader.lint_report.findings] == ["roles/a/tasks/main.yml"]
+
+
+@mock.patch("galaxy_importer.loaders.collection.get_version_from_metadata")
+@mock.patch("galaxy_importer.loaders.collection.Popen")
+def test_ansiblelint_incremental_config_changed(mocked_popen, mocked_version):
+    mocked_version.return_value = "6.0.0"
+    mocked_popen.return_value.communicate.return_value = ("", "")
+    loader = _incremental_lint_loader(
+        {
+            "version": "6.0.0",
+            "file_chksums": {
+                "roles/a/tasks/main.yml": "1",
+                "playbooks/site.yml": "changed",
+                ".ansible-lint-ignore": "4",
+            },
+            "findings": [_lint_finding("roles/a/tasks/main.yml")],
+        },
+        files=[{"name": ".ansible-lint-ignore", "ftype": "file", "chksum_sha256": "changed"}],
+    )
+    loader._lint_collection()
+
+    cmd = mocked_popen.call_args.args[0]
+    assert cmd[-1] == "--offline"
+    assert loader.lint_report.findings == []
+    assert loader.lint_report.file_chksums[".ansible-lint-ignore"] == "changed"
+
+
+def _reusable_docs_loader(changed_files):
+    loader = CollectionLoader("/tmp/ansible_collections/my_ns/my_coll", filename=None)
+    loader.metadata = SimpleNamespace(namespace="my_ns", name="my_coll", readme="README.md")
+    files = {
+        "README.md": "1",
+        "docs/guide.md": "2",
+        "roles/my_role/README.md": "3",
+        "plugins/modules/a.py": "4",
+        "plugins/modules/b.py": "5",
+        "plugins/modules/b.yml": "6",
+        "plugins/doc_fragments/frag.py": "7",
+        "meta/runtime.yml": "8",
+    }
+    loader.file_manifest = schema.CollectionArtifactFileManifest(
+        files=[
+            {"name": name, "ftype": "file", "chksum_sha256": changed_files.get(name, chksum)}
+            for name, chksum in files.items()
+        ]
+    )
+
+    def module_doc(name):
+        return {
+            "content_name": name,
+            "content_type": "module",
+            "doc_strings": {
+                "doc": {
+                    "filename": f"/old/ansible_collections/my_ns/my_coll/plugins/modules/{name}.py"
+                }
+            },
+        }
+
+    loader.previous_result = {
+        "metadata": {"namespace": "my_ns", "name": "my_coll", "readme": "README.md"},
+        "ansible_core_version": get_version_from_metadata("ansible-core"),
+        "file_manifest": {
+            "files": [
+                {"name": name, "ftype": "file", "chksum_sha256": chksum}
+                for name, chksum in files.items()
+            ]
+        },
+        "docs_blob": {
+            "collection_readme": {"name": "README.md", "html": "<p>readme</p>"},
+            "documentation_files": [{"name": "guide.md", "html": "<p>guide</p>"}],
+            "contents": [
+                module_doc("a"),
+                module_doc("b"),
+                {
+                    "content_name": "my_role",
+                    "content_type": "role",
+                    "readme_file": "README.md",
+                    "readme_html": "<p>role</p>",
+                    "doc_strings": {},
+                },
+            ],
+        },
+    }
+    return loader
+
+
+def test_get_reusable_docs():
+    loader = _reusable_docs_loader({"plugins/modules/b.yml": "changed", "README.md": "changed"})
+    assert loader._is_previous_version()
+    doc_strings, rendered_html = loader._get_reusable_docs()
+
+    assert list(doc_strings["module"]) == ["my_ns.my_coll.a"]
+    assert doc_strings["module"]["my_ns.my_coll.a"]["doc"]["filename"] == (
+        "/tmp/ansible_collections/my_ns/my_coll/plugins/modules/a.py"
+    )
+    assert rendered_html == {"1": "<p>readme</p>", "2": "<p>guide</p>", "3": "<p>role</p>"}
+
+
+def test_get_reusable_docs_doc_fragment_changed():
+    loader = _reusable_docs_loader({"plugins/doc_fragments/frag.py": "changed"})
+    doc_strings, rendered_html = loader._get_reusable_docs()
+    assert doc_strings == {}
+    assert len(rendered_html) == 3
+
+    loader.previous_result["metadata"]["name"] = "other_coll"
+    assert not loader._is_previous_version()
+
+
+def test_get_reusable_docs_runtime_changed():
+    loader = _reusable_docs_loader({"meta/runtime.yml": "changed"})
+    doc_strings, rendered_html = loader._get_reusable_docs()
+    assert doc_strings == {}
+    assert len(rendered_html) == 3
+
+
+@mock.patch("galaxy_importer.loaders.collection.get_version_from_metadata")
+def test_get_reusable_docs_ansible_core_changed(mocked_version):
+    loader = _reusable_docs_loader({})
+    mocked_version.return_value = "2.18.0"
+    loader.previous_result["ansible_core_version"] = "2.17.0"
+    doc_strings, rendered_html = loader._get_reusable_docs()
+    assert doc_strings == {}
+    assert len(rendered_html) == 3
+
+    loader.previous_result["ansible_core_version"] = "2.18.0"
+    doc_strings, _ = loader._get_reusable_docs()
+    assert list(doc_strings["module"]) == ["my_ns.my_coll.a", "my_ns.my_coll.b"]
+
+
 @mock.patch("shutil.which")
 def test_no_ansible_lint_bin(mocked_shutil_which, tmp_collection_root, caplog):
     mocked_shutil_which.return_value = False
@@ -724,6 +1093,7 @@ def test_no_ansible_lint_bin(mocked_shutil_which, tmp_collection_root, caplog):
             run_ansible_doc=False,
             run_ansible_lint=True,
             ansible_local_tmp=tmp_collection_root,
+            log_tool_output_lines=True,
         ),
     )
     collection_loader._lint_collection()
@@ -800,6 +1170,7 @@ def test_lint_meta_patterns(
             run_ansible_lint=True,
             offline_ansible_lint=True,
             ansible_local_tmp=tmp_collection_root,
+            log_tool_output_lines=True,
         ),
     )
     collection_loader._lint_collection()
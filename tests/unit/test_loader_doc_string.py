@@ -15,6 +15,7 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import io
 import json
 from unittest import mock
 
@@ -73,23 +74,38 @@ def test_get_plugins_subdirs(doc_string_loader, tmpdir):
     assert plugins == ["my_namespace.my_collection.subdir1.subdir2.nested_plugin"]
 
 
+def _mock_ansible_doc(mocked_popen, stdout, returncode=0, stderr=b""):
+    """Have the mocked Popen run an ansible-doc writing stdout and stderr."""
+    proc = mock.Mock(stdout=io.BytesIO(stdout), returncode=returncode)
+    proc.wait.return_value = returncode
+
+    def popen(cmd, **kwargs):
+        kwargs["stderr"].write(stderr)
+        return proc
+
+    mocked_popen.side_effect = popen
+
+
 @mock.patch("galaxy_importer.loaders.doc_string.Popen")
 def test_run_ansible_doc(mocked_popen, doc_string_loader):
-    mocked_popen.return_value.communicate.return_value = ('"expected output"', "")
-    mocked_popen.return_value.returncode = 0
+    _mock_ansible_doc(mocked_popen, json.dumps(ANSIBLE_DOC_OUTPUT).encode())
     res = doc_string_loader._run_ansible_doc(plugin_type="", plugins=[])
-    assert res == "expected output"
+    assert [row["name"] for row in res["my_module"]["return"]] == ["message", "original_message"]
 
 
 @mock.patch("galaxy_importer.loaders.doc_string.Popen")
-def test_run_ansible_doc_exception(mocked_popen, doc_string_loader):
-    mocked_popen.return_value.communicate.return_value = (
-        "output",
-        "error that causes exception",
-    )
-    mocked_popen.return_value.returncode = 1
+def test_run_ansible_doc_exception(mocked_popen, doc_string_loader, caplog):
+    _mock_ansible_doc(mocked_popen, b"output", returncode=1, stderr=b"error that causes exception")
     res = doc_string_loader._run_ansible_doc(plugin_type="", plugins=[])
     assert not res
+    assert "error that causes exception" in caplog.text
+
+
+@mock.patch("galaxy_importer.loaders.doc_string.Popen")
+def test_run_ansible_doc_invalid_output(mocked_popen, doc_string_loader):
+    _mock_ansible_doc(mocked_popen, b'{"my_module": {"doc": {}}')
+    with pytest.raises(ValueError, match="Expecting"):
+        doc_string_loader._run_ansible_doc(plugin_type="", plugins=[])
 
 
 @mock.patch("galaxy_importer.loaders.doc_string.constants.ANSIBLE_DOC_SUPPORTED_TYPES", ["module"])
@@ -101,6 +117,97 @@ def test_ansible_doc_no_output(
     assert doc_string_loader.load() == {}
 
 
+@mock.patch("galaxy_importer.loaders.doc_string.shutil.which", return_value=True)
+@mock.patch("galaxy_importer.loaders.doc_string.constants.ANSIBLE_DOC_SUPPORTED_TYPES", ["module"])
+@mock.patch.object(loaders.DocStringLoader, "_run_ansible_doc_list")
+@mock.patch.object(loaders.DocStringLoader, "_run_ansible_doc")
+def test_ansible_doc_reusable_doc_strings(
+    mocked_run_ansible_doc, mocked_run_ansible_doc_list, mocked_which, doc_string_loader
+):
+    mocked_run_ansible_doc_list.return_value = {
+        "my_namespace.my_collection.changed": "",
+        "my_namespace.my_collection.unchanged": "",
+    }
+    mocked_run_ansible_doc.return_value = {"my_namespace.my_collection.changed": {"doc": {}}}
+    reused = {"doc": {"short_description": "reused"}}
+    doc_string_loader.reusable_doc_strings = {
+        "module": {"my_namespace.my_collection.unchanged": reused}
+    }
+
+    assert doc_string_loader.load() == {
+        "module": {
+            "my_namespace.my_collection.changed": {"doc": {}},
+            "my_namespace.my_collection.unchanged": reused,
+        }
+    }
+    mocked_run_ansible_doc.assert_called_once_with("module", ["my_namespace.my_collection.changed"])
+
+
+def test_load_doc_strings_chunks(doc_string_loader, caplog):
+    doc_string_loader.cfg = config.Config(
+        config_data={"ansible_doc_chunk_size": 3, "ansible_doc_workers": 2}
+    )
+    plugins = [f"my_namespace.my_collection.plugin_{ix}" for ix in range(8)]
+    bad_plugin = plugins[4]
+    calls = []
+
+    def exec_ansible_doc(plugin_type, chunk):
+        calls.append(chunk)
+        if bad_plugin in chunk:
+            return {}, f"Error running ansible-doc on {chunk}"
+        return {plugin: {"doc": {"plugin_type": plugin_type}} for plugin in chunk}, None
+
+    with mock.patch.object(doc_string_loader, "_exec_ansible_doc", side_effect=exec_ansible_doc):
+        res = doc_string_loader._load_doc_strings("module", plugins)
+
+    assert list(res) == [plugin for plugin in plugins if plugin != bad_plugin]
+    assert res[plugins[0]] == {"doc": {"plugin_type": "module"}}
+    # chunks of 3, and the failing chunk split down to the failing plugin
+    assert sorted(calls) == sorted(
+        [
+            plugins[0:3],
+            plugins[3:6],
+            plugins[6:8],
+            plugins[3:4],
+            plugins[4:6],
+            plugins[4:5],
+            plugins[5:6],
+        ]
+    )
+    errors = [r.message for r in caplog.records if r.levelname == "ERROR"]
+    assert errors == [f"Error running ansible-doc on {[bad_plugin]}"]
+
+
+def test_load_doc_strings_chunks_all_failing(doc_string_loader, caplog):
+    doc_string_loader.cfg = config.Config(
+        config_data={"ansible_doc_chunk_size": 8, "ansible_doc_workers": 1}
+    )
+    plugins = [f"my_namespace.my_collection.plugin_{ix}" for ix in range(8)]
+    exec_ansible_doc = mock.Mock(return_value=({}, "Error running ansible-doc"))
+
+    with mock.patch.object(doc_string_loader, "_exec_ansible_doc", exec_ansible_doc):
+        res = doc_string_loader._load_doc_strings("module", plugins)
+
+    assert res == {}
+    # the chunk and both its halves, rather than bisecting down to every plugin
+    assert [c.args[1] for c in exec_ansible_doc.call_args_list] == [
+        plugins,
+        plugins[:4],
+        plugins[4:],
+    ]
+    errors = [r.message for r in caplog.records if r.levelname == "ERROR"]
+    assert errors == [
+        "ansible-doc failed on both halves of the plugins, skipping them: "
+        "Error running ansible-doc"
+    ]
+
+
+@mock.patch.object(loaders.DocStringLoader, "_run_ansible_doc", return_value={"a": {}})
+def test_load_doc_strings_not_chunked(mocked_run_ansible_doc, doc_string_loader):
+    assert doc_string_loader._load_doc_strings("module", ["a", "b"]) == {"a": {}}
+    mocked_run_ansible_doc.assert_called_once_with("module", ["a", "b"])
+
+
 def test_process_doc_strings_not_dict(doc_string_loader):
     ansible_doc_output = """
         {
@@ -368,12 +475,27 @@ def test_transform_doc_strings_nested_suboptions(doc_string_loader):
     ]
 
 
+def test_transform_doc_strings_reuses_values(doc_string_loader):
+    description = ["If set to True..."]
+    choices = ["a", "b"]
+    suboptions = {"enabled": {"description": description, "choices": choices}}
+    data = {"doc": {"options": {"setting": {"suboptions": suboptions}}}}
+
+    transformed_data = doc_string_loader._transform_doc_strings(data)
+    (setting,) = transformed_data["doc"]["options"]
+    (enabled,) = setting["suboptions"]
+    assert enabled == {"name": "enabled", "description": description, "choices": choices}
+    assert enabled["description"] is description
+    assert enabled["choices"] is choices
+    # the parsed dicts the rows were made from are not changed
+    assert suboptions == {"enabled": {"description": description, "choices": choices}}
+
+
 @mock.patch("galaxy_importer.loaders.doc_string.constants.ANSIBLE_DOC_SUPPORTED_TYPES", ["module"])
 @mock.patch.object(loaders.DocStringLoader, "_run_ansible_doc_list", return_value={"my_module": {}})
-@mock.patch.object(loaders.DocStringLoader, "_run_ansible_doc", return_value=ANSIBLE_DOC_OUTPUT)
-def test_load_function(
-    mocked_run_ansible_doc_list, mocked_run_ansible_doc, doc_string_loader, tmpdir
-):
+@mock.patch("galaxy_importer.loaders.doc_string.Popen")
+def test_load_function(mocked_popen, mocked_run_ansible_doc_list, doc_string_loader, tmpdir):
+    _mock_ansible_doc(mocked_popen, json.dumps(ANSIBLE_DOC_OUTPUT).encode())
     doc_string_loader.path = str(tmpdir)
     tmpdir.mkdir("plugins").mkdir("modules").join("my_module.py").write("")
 
@@ -403,11 +525,7 @@ def test_load_function(
 @mock.patch.object(loaders.DocStringLoader, "_run_ansible_doc_list", return_value={"my_plugin": {}})
 @mock.patch("galaxy_importer.loaders.doc_string.Popen")
 def test_load_ansible_doc_error(mocked_popen, mocked_doc_list, doc_string_loader, tmpdir):
-    mocked_popen.return_value.communicate.return_value = (
-        "output",
-        "error that causes exception",
-    )
-    mocked_popen.return_value.returncode = 1
+    _mock_ansible_doc(mocked_popen, b"output", returncode=1, stderr=b"error that causes exception")
 
     doc_string_loader.path = str(tmpdir)
     tmpdir.mkdir("plugins").mkdir("inventory").join("my_plugin.py").write("")
@@ -15,9 +15,12 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
-import pytest
+import gzip
+import json
 import re
 
+import pytest
+
 from galaxy_importer import main
 
 
@@ -35,11 +38,49 @@ def test_parser():
     assert parser.git_clone_path == "/my/clone/path"
     assert parser.output_path == "/my/output/path"
 
+    parser = main.parse_args(["--collection-dir=/my/ansible_collections/ns/name"])
+    assert parser.collection_dir == "/my/ansible_collections/ns/name"
+    assert parser.verify_files
+
+    parser = main.parse_args(["--collection-dir=/my/collection", "--no-verify-files"])
+    assert not parser.verify_files
+
+    parser = main.parse_args(["my_file.tar.gz", "--compact-result", "--compress-result=gzip"])
+    assert parser.compact_result
+    assert parser.compress_result == "gzip"
+
     parser = main.parse_args(["--namespace", "my-namespace", "--legacy-role"])
     assert parser.namespace == "my-namespace"
     assert parser.legacy_role
 
 
+def test_write_output_file(tmp_path, capsys):
+    data = {"metadata": {"name": "my_collection"}, "contents": []}
+    output_file_path = str(tmp_path / "importer_result.json")
+
+    main.write_output_file(data, print_result=True, output_file_path=output_file_path)
+    output = (tmp_path / "importer_result.json").read_text()
+    assert output == json.dumps(data, indent=4)
+    assert capsys.readouterr().out == output + "\n"
+
+    main.write_output_file(data, indent=None, compression="gzip", output_file_path=output_file_path)
+    with gzip.open(tmp_path / "importer_result.json.gz", "rt") as f:
+        assert f.read() == '{"metadata":{"name":"my_collection"},"contents":[]}'
+    assert capsys.readouterr().out == ""
+
+
+def test_write_output_file_error(tmp_path):
+    output_file = tmp_path / "importer_result.json"
+    output_file.write_text("previous result")
+
+    with pytest.raises(TypeError, match="not JSON serializable"):
+        main.write_output_file(
+            {"metadata": {}, "contents": [object()]}, output_file_path=str(output_file)
+        )
+    assert output_file.read_text() == "previous result"
+    assert [p.name for p in tmp_path.iterdir()] == ["importer_result.json"]
+
+
 def test_main_no_args():
     with pytest.raises(
         TypeError, match=re.escape("expected str, bytes or os.PathLike object, not NoneType")
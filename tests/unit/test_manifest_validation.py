@@ -0,0 +1,124 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+import io
+import json
+import tarfile
+
+import pytest
+
+from galaxy_importer import config, manifest_validation, schema
+from galaxy_importer.utils import collection_build
+
+GALAXY_YML = """
+namespace: my_namespace
+name: my_collection
+version: {version}
+readme: README.md
+authors: Me
+license: GPL-3.0-or-later
+repository: https://github.com/my_namespace/my_collection
+"""
+
+
+@pytest.fixture
+def build_artifact(tmp_path):
+    def build(version="1.0.0"):
+        src = tmp_path / f"src-{version}"
+        (src / "plugins/modules").mkdir(parents=True)
+        (src / "galaxy.yml").write_text(GALAXY_YML.format(version=version))
+        (src / "README.md").write_text("# my_collection\n")
+        (src / "plugins/modules/my_module.py").write_text("# module\n")
+        return collection_build.build_collection(str(src), str(tmp_path)).filepath
+
+    return build
+
+
+def _write_tar(path, members):
+    with tarfile.open(path, "w:gz") as tf:
+        for name, data in members:
+            tarinfo = tarfile.TarInfo(name)
+            tarinfo.size = len(data)
+            tf.addfile(tarinfo, io.BytesIO(data))
+    return str(path)
+
+
+def test_validate_artifacts(build_artifact, tmp_path, mocker):
+    valid = build_artifact()
+    with tarfile.open(valid) as tf:
+        manifest_json = tf.extractfile("MANIFEST.json").read()
+        files_json = tf.extractfile("FILES.json").read()
+
+    bad_version = json.loads(manifest_json)
+    bad_version["collection_info"]["version"] = "not-a-version"
+    paths = [
+        valid,
+        _write_tar(tmp_path / "no_manifest.tar.gz", [("FILES.json", files_json)]),
+        _write_tar(tmp_path / "no_files.tar.gz", [("MANIFEST.json", manifest_json)]),
+        _write_tar(
+            tmp_path / "bad_chksum.tar.gz",
+            [("MANIFEST.json", manifest_json), ("FILES.json", files_json + b" ")],
+        ),
+        _write_tar(
+            tmp_path / "bad_version.tar.gz",
+            [("MANIFEST.json", json.dumps(bad_version).encode()), ("FILES.json", files_json)],
+        ),
+        str(tmp_path / "missing.tar.gz"),
+    ]
+    load = mocker.patch.object(config.ConfigFile, "load", return_value={})
+
+    results = list(manifest_validation.validate_artifacts(paths, processes=1))
+    assert load.call_count == 1
+    assert [r.path for r in results] == paths
+
+    assert results[0].valid
+    assert results[0].collection_info.label == "my_namespace.my_collection"
+    assert results[0].file_count == 5
+    assert "No manifest found" in results[1].error
+    assert "(FILES.json) was not found" in results[2].error
+    assert "sha256sum should be" in results[3].error
+    assert "semantic version format" in results[4].error
+    assert results[5].error
+    assert not any(r.valid for r in results[1:])
+    assert schema._validation_config is None
+
+
+def test_validate_artifacts_member_limit(build_artifact):
+    cfg = config.Config(config_data={"max_archive_file_size": 100})
+    (result,) = manifest_validation.validate_artifacts([build_artifact()], cfg=cfg, processes=1)
+    assert "MANIFEST.json is larger than the maximum file size" in result.error
+
+
+def test_validate_artifacts_process_pool(build_artifact):
+    paths = [build_artifact(version) for version in ("1.0.0", "0.1.0", "2.0.0")]
+    cfg = config.Config(config_data={"require_v1_or_greater": True})
+    results = list(manifest_validation.validate_artifacts(paths, cfg=cfg, processes=2, chunksize=1))
+    assert [r.path for r in results] == paths
+    assert [r.valid for r in results] == [True, False, True]
+    assert "1.0.0 or greater" in results[1].error
+    assert results[2].collection_info.version == "2.0.0"
+
+
+def test_validate_artifacts_in_process_restores_config(build_artifact, mocker):
+    mocker.patch.object(config.ConfigFile, "load", return_value={})
+    paths = [build_artifact("1.0.0"), build_artifact("1.0.1")]
+
+    results = manifest_validation.validate_artifacts(paths, processes=1)
+    assert next(results).valid
+    results.close()
+
+    assert manifest_validation._worker_config is None
+    assert schema._validation_config is None
@@ -50,6 +50,7 @@ TEXT_FORMATTING = """
 class DocFile(NamedTuple):
     text: str
     mimetype: str
+    hash: str = None
 
 
 class TestFindGetFiles(TestCase):
@@ -148,6 +149,14 @@ class TestHtmlRender(TestCase):
         html = markup_utils.get_html(doc_file)
         assert html is None
 
+    def test_get_html_rendered(self):
+        doc_file = DocFile(text=TEXT_SIMPLE, mimetype="text/markdown", hash="abc")
+        html = markup_utils.get_html(doc_file, rendered_html={"abc": "<p>previous</p>"})
+        assert html == "<p>previous</p>"
+
+        html = markup_utils.get_html(doc_file, rendered_html={"def": "<p>previous</p>"})
+        assert html == "<p>{}</p>".format(TEXT_SIMPLE)
+
     def test_render_simple(self):
         html = self.call_render(TEXT_SIMPLE, "text/markdown")
         assert html == "<p>{}</p>".format(TEXT_SIMPLE)
@@ -0,0 +1,96 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+import logging
+import threading
+
+import pytest
+
+from galaxy_importer import exceptions as exc
+from galaxy_importer.ansible_test.runners import BackgroundTestRun
+from galaxy_importer.ansible_test.runners.base import BaseTestRunner
+
+
+class _Runner(BaseTestRunner):
+    def __init__(self, logger, error=None):
+        super().__init__(logger=logger)
+        self.error = error
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def run(self):
+        self.log.info("ansible-test line %s", 1)
+        self.started.set()
+        self.release.wait(5)
+        if self.cancelled:
+            return
+        if self.error:
+            raise self.error
+
+
+def test_background_test_run_holds_logs_until_join(caplog):
+    caplog.set_level(logging.INFO)
+    log = logging.getLogger(__name__)
+    runner = _Runner(logger=log)
+    background_test = BackgroundTestRun(runner)
+    assert runner.started.wait(5)
+
+    log.info("loading collection")
+    runner.release.set()
+    background_test.join()
+
+    assert [r.getMessage() for r in caplog.records] == ["loading collection", "ansible-test line 1"]
+    assert runner.log is not log
+
+
+def test_background_test_run_raises_on_join():
+    runner = _Runner(logger=logging.getLogger(__name__), error=exc.AnsibleTestError("failed"))
+    background_test = BackgroundTestRun(runner)
+    runner.release.set()
+    with pytest.raises(exc.AnsibleTestError, match="failed"):
+        background_test.join()
+
+
+def test_background_test_run_cancel(caplog):
+    caplog.set_level(logging.INFO)
+    runner = _Runner(logger=logging.getLogger(__name__))
+    runner.cancel = lambda: (BaseTestRunner.cancel(runner), runner.release.set())
+    background_test = BackgroundTestRun(runner)
+    assert runner.started.wait(5)
+
+    background_test.cancel(timeout=5)
+    assert runner.cancelled
+    assert not background_test._thread.is_alive()
+    assert not caplog.records
+
+
+def test_runner_log_output_summary(caplog):
+    caplog.set_level(logging.INFO)
+    runner = _Runner(logger=logging.getLogger(__name__))
+    runner.log_output_lines = False
+    for line in [
+        'Running sanity test "pep8"',
+        "ERROR: plugins/modules/a.py:12:1: E302: expected 2 blank lines",
+        "ERROR: plugins/modules/b.py:3:1: E302: expected 2 blank lines",
+    ]:
+        runner._log_output_line(line)
+    runner._log_output_summary()
+
+    assert [r.getMessage() for r in caplog.records] == [
+        'Running sanity test "pep8"',
+        "ansible-test sanity reported 2 finding(s): pep8:E302 (2)",
+    ]
+    assert runner.report.summary["total"] == 2
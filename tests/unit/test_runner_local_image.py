@@ -16,8 +16,11 @@
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
 import logging
+import os
 import pytest
 import shutil
+import threading
+import time
 
 from galaxy_importer.ansible_test.builders.local_image_build import Build
 from galaxy_importer import exceptions as exc
@@ -55,6 +58,48 @@ def test_runner_run(mocked_shutil_which, metadata, mocker):
     assert Build.get_container_engine.called
 
 
+@mock.patch("shutil.which")
+def test_runner_run_reuse_image(mocked_shutil_which, metadata, mocker, monkeypatch, tmp_path):
+    monkeypatch.setenv("GALAXY_IMPORTER_LOCAL_IMAGE_REUSE", "True")
+    monkeypatch.setenv("GALAXY_IMPORTER_TMP_ROOT_DIR", str(tmp_path))
+    filepath = tmp_path / "uploaded.tar.gz"
+    filepath.write_bytes(b"artifact")
+    filepath.chmod(0o600)
+    runner = runners.local_image.LocalImageTestRunner(metadata=metadata, filepath=str(filepath))
+    mounted = {}
+
+    def run_image(archive_path, **kwargs):
+        mounted["path"] = archive_path
+        with open(archive_path, "rb") as f:
+            mounted["data"] = f.read()
+        mounted["mode"] = os.stat(archive_path).st_mode & 0o777
+        mounted["samefile"] = os.path.samefile(archive_path, filepath)
+
+    mocker.patch.object(Build, "build_image")
+    mocker.patch.object(Build, "build_base_image", return_value="base:1234")
+    mocker.patch.object(Build, "cleanup")
+    mocker.patch.object(Build, "get_container_engine", return_value="podman")
+    mocker.patch.object(runner, "_run_image", side_effect=run_image)
+    shutil.which.return_value = True
+
+    runner.run()
+
+    assert not Build.build_image.called
+    runner._run_image.assert_called_once_with(
+        image_id="base:1234",
+        container_engine="podman",
+        archive_path=mounted["path"],
+        cpus=None,
+        memory=None,
+    )
+    # a private copy is mounted, so the :Z relabel does not touch the caller's file
+    assert not mounted["samefile"]
+    assert mounted["data"] == b"artifact"
+    assert mounted["mode"] == 0o644
+    assert not os.path.exists(mounted["path"])
+    assert Build.cleanup.called
+
+
 @mock.patch("shutil.which")
 def test_runner_run_exits(mocked_shutil_which, metadata, mocker, caplog):
     caplog.set_level(logging.WARNING)
@@ -89,6 +134,109 @@ def test_run_image(mocked_popen, metadata):
     assert mocked_popen.called
 
 
+@mock.patch("galaxy_importer.ansible_test.runners.local_image.Popen")
+def test_run_image_mounts_archive(mocked_popen, metadata):
+    runner = runners.local_image.LocalImageTestRunner(metadata=metadata)
+    mocked_popen.return_value.stdout = []
+    mocked_popen.return_value.wait.return_value = 0
+
+    runner._run_image("1234", "podman", archive_path="/tmp/archive.tar.gz")
+
+    assert mocked_popen.call_args.args[0] == [
+        "podman",
+        "run",
+        "--rm",
+        "--volume",
+        "/tmp/archive.tar.gz:/archive/archive.tar.gz:ro,Z",
+        "1234",
+        "LOCAL_IMAGE_RUNNER",
+    ]
+
+
+@mock.patch("galaxy_importer.ansible_test.runners.local_image.Popen")
+def test_run_image_resource_limits(mocked_popen, metadata):
+    runner = runners.local_image.LocalImageTestRunner(metadata=metadata)
+    mocked_popen.return_value.stdout = []
+    mocked_popen.return_value.wait.return_value = 0
+
+    runner._run_image("1234", "podman", cpus="2", memory="2g")
+
+    assert mocked_popen.call_args.args[0] == [
+        "podman",
+        "run",
+        "--cpus",
+        "2",
+        "--memory",
+        "2g",
+        "1234",
+        "LOCAL_IMAGE_RUNNER",
+    ]
+
+
+def test_runner_pool(mocker):
+    running = []
+    max_running = []
+    lock = threading.Lock()
+
+    def run(self):
+        with lock:
+            running.append(self.metadata.name)
+            max_running.append(len(running))
+        self.log.info(f"log for {self.metadata.name}")
+        time.sleep(0.05)
+        with lock:
+            running.remove(self.metadata.name)
+        if self.metadata.name == "fails":
+            raise exc.AnsibleTestError("container failed")
+
+    mocker.patch.object(runners.LocalImageTestRunner, "run", run)
+    names = ["one", "two", "three", "fails"]
+    with runners.LocalImageTestRunnerPool(max_containers=2) as pool:
+        futures = {
+            name: pool.submit(
+                f"/tmp/{name}.tar.gz", SimpleNamespace(namespace="ns", name=name, version="1.0.0")
+            )
+            for name in names
+        }
+        results = {name: future.result() for name, future in futures.items()}
+
+    assert max(max_running) == 2
+    for name in names:
+        assert results[name][0].getMessage() == f"log for {name}"
+    assert results["fails"][-1].getMessage() == "container failed"
+    assert len(results["one"]) == 1
+
+
+def test_runner_pool_container_slots(mocker):
+    # the process-wide bound of 1 container must not apply to runners of the pool
+    mocker.patch.object(runners.local_image.config.ConfigFile, "load", return_value={})
+    mocker.patch.object(runners.local_image.shutil, "which", return_value=True)
+    mocker.patch.object(Build, "get_container_engine", return_value="podman")
+    mocker.patch.object(Build, "build_image", return_value="1234")
+    mocker.patch.object(Build, "cleanup")
+    barrier = threading.Barrier(2, timeout=5)
+
+    def run_image(self, **kwargs):
+        self.log.info(f"running {self.metadata.name}")
+        barrier.wait()
+
+    mocker.patch.object(runners.LocalImageTestRunner, "_run_image", run_image)
+    with runners.LocalImageTestRunnerPool(max_containers=2) as pool:
+        futures = [
+            pool.submit(
+                f"/tmp/{name}.tar.gz", SimpleNamespace(namespace="ns", name=name, version="1.0.0")
+            )
+            for name in ("one", "two")
+        ]
+        results = [future.result() for future in futures]
+
+    assert [[r.getMessage() for r in records] for records in results] == [
+        ["Running image...", "running one"],
+        ["Running image...", "running two"],
+    ]
+    assert not runners.local_image._job_records
+
+
 @mock.patch("galaxy_importer.ansible_test.runners.local_image.Popen")
 def test_run_image_exception(mocked_popen, metadata):
     runner = runners.local_image.LocalImageTestRunner(metadata=metadata)
@@ -15,7 +15,11 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 import requests
@@ -44,6 +48,7 @@ def test_runner_run(mocker, monkeypatch):
     mocker.patch.object(openshift_job.Job, "wait_on_pod_ready")
     mocker.patch.object(openshift_job.Job, "get_logs")
     mocker.patch.object(openshift_job.Job, "cleanup")
+    mocker.patch.object(openshift_job.Job, "close")
 
     openshift_job.Job.get_logs.return_value = ["log_entry", b"bytes_log_entry"]
     monkeypatch.setenv("IMPORTER_API_DOMAIN", "my_host")
@@ -55,6 +60,7 @@ def test_runner_run(mocker, monkeypatch):
     assert openshift_job.Job.wait_on_pod_ready.called
     assert openshift_job.Job.get_logs.called
     assert openshift_job.Job.cleanup.called
+    assert openshift_job.Job.close.called
 
 
 def test_runner_get_token(mocker, tmp_path):
@@ -75,23 +81,64 @@ def test_job_init(job):
     assert job.pods_url == "my_domain/api/v1/namespaces/my_ns/pods"
 
 
+def test_job_session(job):
+    assert job.session.headers["Authorization"] == "Bearer session_token"
+    assert job.session.verify == "ca_path"
+
+
 def test_job_create(mocker, job):
-    mocker.patch.object(requests, "post")
+    mocker.patch.object(requests.Session, "request")
 
-    requests.post.return_value = SimpleNamespace(status_code=201)
+    requests.Session.request.return_value = SimpleNamespace(status_code=201)
     job.create()
-    assert requests.post.called
+    assert requests.Session.request.call_args.args[:2] == ("POST", job.jobs_url)
 
-    requests.post.return_value = SimpleNamespace(status_code=500, reason="", text="")
+    requests.Session.request.return_value = SimpleNamespace(status_code=503, reason="", text="")
     with pytest.raises(exc.AnsibleTestError):
         job.create()
+    # creating a job is not retried
+    assert requests.Session.request.call_count == 2
+
+
+def test_job_request_retries_with_backoff(mocker, job):
+    mocker.patch.object(requests.Session, "request")
+    mocker.patch.object(openshift_job.time, "sleep")
+    unavailable = SimpleNamespace(status_code=503, close=lambda: None)
+    ok = SimpleNamespace(status_code=200)
+    requests.Session.request.side_effect = [requests.ConnectionError(), unavailable, ok]
+
+    assert job._request("GET", job.pods_url) is ok
+    assert requests.Session.request.call_count == 3
+    assert requests.Session.request.call_args.kwargs["timeout"] == (
+        openshift_job.API_REQUEST_TIMEOUT_SECONDS
+    )
+    first, second = (call.args[0] for call in openshift_job.time.sleep.call_args_list)
+    assert 0 < first <= openshift_job.API_CHECK_DELAY_SECONDS / 3
+    assert first / 2 < second
+
+
+def test_job_request_gives_up(mocker, job):
+    mocker.patch.object(requests.Session, "request")
+    mocker.patch.object(openshift_job.time, "sleep")
+    mocker.patch.object(openshift_job, "API_REQUEST_RETRIES", 1)
+    requests.Session.request.side_effect = requests.ConnectionError()
+
+    with pytest.raises(requests.ConnectionError):
+        job._request("GET", job.pods_url)
+    assert requests.Session.request.call_count == 2
+
+
+def test_backoff_delays():
+    delays = openshift_job._backoff_delays(1, maximum=8)
+    for delay in [1, 2, 4, 8, 8]:
+        assert delay / 2 <= next(delays) <= delay
 
 
 def test_job_wait_on_pod_ready(mocker, job):
     mocker.patch.object(openshift_job.Job, "get_pods")
     mocker.patch.object(openshift_job.Job, "cleanup")
-    mocker.patch.object(openshift_job, "API_CHECK_RETRIES")
-    openshift_job.API_CHECK_RETRIES = 1
+    mocker.patch.object(openshift_job, "POD_CREATE_TIMEOUT_SECONDS", 0)
+    mocker.patch.object(openshift_job, "POD_START_TIMEOUT_SECONDS", 0)
 
     openshift_job.Job.get_pods.return_value = [{"status": {"phase": "Running"}}]
     job.wait_on_pod_ready()
@@ -108,19 +155,134 @@ def test_job_wait_on_pod_ready(mocker, job):
     assert openshift_job.Job.cleanup.called
 
 
+class _PodsApiHandler(BaseHTTPRequestHandler):
+    """Stand-in for the pods list and watch endpoints of the API server."""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self.server.requests.append(query)
+        if query.get("watch") != ["true"]:
+            body = json.dumps(self.server.pods_list).encode()
+        elif self.server.watch_status != 200:
+            self.send_error(self.server.watch_status)
+            return
+        elif self.server.watch_responses:
+            events = self.server.watch_responses.pop(0)
+            body = "".join(json.dumps(event) + "\n" for event in events).encode()
+        else:
+            body = b""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def pods_api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PodsApiHandler)
+    server.requests = []
+    server.pods_list = {"metadata": {"resourceVersion": "100"}, "items": []}
+    server.watch_status = 200
+    server.watch_responses = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def api_job(pods_api, mocker):
+    mocker.patch.object(openshift_job.Job, "cleanup")
+    mocker.patch.object(openshift_job, "POD_CREATE_TIMEOUT_SECONDS", 2)
+    host, port = pods_api.server_address
+    return openshift_job.Job(
+        f"http://{host}:{port}", "my_ns", "session_token", None, "image", "job_template", None
+    )
+
+
+def _pod_event(event_type, phase, resource_version):
+    return {
+        "type": event_type,
+        "object": {
+            "metadata": {"name": "my_pod_name", "resourceVersion": resource_version},
+            "status": {"phase": phase},
+        },
+    }
+
+
+def test_job_watch_pod_ready(pods_api, api_job, mocker):
+    mocker.patch.object(openshift_job.Job, "_poll_pod_ready")
+    pods_api.watch_responses = [
+        [_pod_event("ADDED", "Pending", "101")],
+        [
+            {"type": "BOOKMARK", "object": {"metadata": {"resourceVersion": "102"}}},
+            _pod_event("MODIFIED", "Running", "103"),
+        ],
+    ]
+    api_job.wait_on_pod_ready()
+
+    watches = [query for query in pods_api.requests if query.get("watch") == ["true"]]
+    assert [query["resourceVersion"] for query in watches] == [["100"], ["101"]]
+    assert watches[0]["labelSelector"] == [f"job-name={api_job.name}"]
+    assert not openshift_job.Job._poll_pod_ready.called
+    assert not openshift_job.Job.cleanup.called
+
+
+def test_job_watch_resumes_after_stream_ends(pods_api, api_job):
+    pods_api.watch_responses = [
+        [{"type": "BOOKMARK", "object": {"metadata": {"resourceVersion": "105"}}}],
+        [_pod_event("ADDED", "Running", "106")],
+    ]
+    api_job.wait_on_pod_ready()
+
+    watches = [query for query in pods_api.requests if query.get("watch") == ["true"]]
+    assert [query["resourceVersion"] for query in watches] == [["100"], ["105"]]
+
+
+def test_job_watch_relists_on_gone(pods_api, api_job, mocker):
+    running_pod = _pod_event("ADDED", "Running", "107")["object"]
+    mocker.patch.object(
+        openshift_job.Job, "_list_pods", side_effect=[([], "100"), ([running_pod], "107")]
+    )
+    pods_api.watch_responses = [
+        [{"type": "ERROR", "object": {"kind": "Status", "code": 410, "message": "too old"}}],
+    ]
+    api_job.wait_on_pod_ready()
+    assert openshift_job.Job._list_pods.call_count == 2
+
+
+def test_job_watch_timeout(pods_api, api_job, mocker):
+    mocker.patch.object(openshift_job, "POD_CREATE_TIMEOUT_SECONDS", 0)
+    with pytest.raises(exc.AnsibleTestError, match="Could not create pod associated with job"):
+        api_job.wait_on_pod_ready()
+    assert openshift_job.Job.cleanup.called
+
+
+def test_job_watch_unavailable_falls_back_to_polling(pods_api, api_job, mocker):
+    mocker.patch.object(openshift_job.Job, "_poll_pod_ready")
+    pods_api.watch_status = 403
+    api_job.wait_on_pod_ready()
+    assert openshift_job.Job._poll_pod_ready.called
+
+
 def test_job_get_pods(mocker, job):
-    mocker.patch.object(requests, "get")
-    requests.get.return_value.json.return_value = {"items": []}
+    mocker.patch.object(requests.Session, "request")
+    requests.Session.request.return_value.json.return_value = {"items": []}
     job.get_pods()
-    assert requests.get.called
+    assert requests.Session.request.called
 
 
 def test_job_get_pods_fail(mocker, job):
-    mocker.patch.object(requests, "get")
-    requests.get.return_value.json.return_value = {}
+    mocker.patch.object(requests.Session, "request")
+    requests.Session.request.return_value.json.return_value = {}
     with pytest.raises(exc.AnsibleTestError, match=r"Could not access pod assocated with job"):
         job.get_pods()
-    assert requests.get.called
+    assert requests.Session.request.called
 
 
 def test_job_get_pod_name():
@@ -130,16 +292,16 @@ def test_job_get_pod_name():
 
 def test_job_get_logs(mocker, job):
     mocker.patch.object(openshift_job.Job, "get_pods")
-    mocker.patch.object(requests, "get")
+    mocker.patch.object(requests.Session, "request")
     openshift_job.Job.get_pods.return_value = [{"metadata": {"name": "my_pod_name"}}]
-    requests.get.iter_lines.return_value = {}
+    requests.Session.request.return_value.iter_lines.return_value = {}
     job.get_logs()
-    assert requests.get.called
+    assert requests.Session.request.call_args.kwargs["stream"]
 
 
 def test_job_cleanup(mocker, job):
     mocker.patch.object(openshift_job.Job, "get_pods")
-    mocker.patch.object(requests, "delete")
+    mocker.patch.object(requests.Session, "request")
     openshift_job.Job.get_pods.return_value = [
         {
             "metadata": {"name": "my_pod_name"},
@@ -147,12 +309,27 @@ def test_job_cleanup(mocker, job):
         }
     ]
     job.cleanup()
-    assert requests.delete.called
+    requests.Session.request.assert_called_once_with(
+        "DELETE",
+        job.job_name_url,
+        params={"propagationPolicy": "Background"},
+        timeout=openshift_job.API_REQUEST_TIMEOUT_SECONDS,
+    )
+
+
+def test_job_cleanup_get_pods_error(mocker, job):
+    mocker.patch.object(
+        openshift_job.Job, "get_pods", side_effect=exc.AnsibleTestError("bad response")
+    )
+    mocker.patch.object(openshift_job.Job, "delete")
+    with pytest.raises(exc.AnsibleTestError, match="bad response"):
+        job.cleanup()
+    assert openshift_job.Job.delete.called
 
 
 def test_job_cleanup_fail(mocker, job):
     mocker.patch.object(openshift_job.Job, "get_pods")
-    mocker.patch.object(requests, "delete")
+    mocker.patch.object(requests.Session, "request")
     openshift_job.Job.get_pods.return_value = [
         {
             "metadata": {"name": "my_pod_name"},
@@ -167,4 +344,28 @@ def test_job_cleanup_fail(mocker, job):
         match=r'Pod terminated with status: "Failed" and reason: "internal_error_123"',
     ):
         job.cleanup()
-    assert requests.delete.called
+    requests.Session.request.assert_called_once_with(
+        "DELETE",
+        job.job_name_url,
+        params={"propagationPolicy": "Background"},
+        timeout=openshift_job.API_REQUEST_TIMEOUT_SECONDS,
+    )
+
+
+def test_runner_cancel_deletes_job(mocker):
+    mocker.patch.object(openshift_job.Job, "delete")
+    runner = openshift_job.OpenshiftJobTestRunner()
+    runner.cancel()
+    assert runner.cancelled
+    assert not openshift_job.Job.delete.called
+
+    runner._job = openshift_job.Job("my_domain", "my_ns", "token", "ca_path", "image", "", None)
+    runner.cancel()
+    assert openshift_job.Job.delete.called
+
+
+def test_job_watch_cancelled(pods_api, api_job):
+    api_job.cancelled.set()
+    with pytest.raises(exc.AnsibleTestError, match="ansible-test job was cancelled"):
+        api_job.wait_on_pod_ready()
+    assert openshift_job.Job.cleanup.called
@@ -482,3 +482,38 @@ def test_max_length_license(collection_info):
     collection_info["license"].append("x" * (schema.MAX_LENGTH_LICENSE + 1))
     with pytest.raises(ValueError, match=r"license in 'licenses' list must not be greater"):
         CollectionInfo(**collection_info)
+
+
+def test_set_validation_config(collection_info, mocker):
+    load = mocker.patch.object(config.ConfigFile, "load", return_value={})
+    cfg = config.Config(config_data={"require_v1_or_greater": True})
+    schema.set_validation_config(cfg)
+    try:
+        collection_info["version"] = "0.1.0"
+        with pytest.raises(ValueError, match=r"requires version to be 1.0.0 or greater"):
+            CollectionInfo(**collection_info)
+        assert not load.called
+    finally:
+        schema.set_validation_config(None)
+
+    assert CollectionInfo(**collection_info).version == "0.1.0"
+    assert load.called
+
+
+def test_validation_config(mocker):
+    cfg = config.Config(config_data={"require_v1_or_greater": True})
+    config_set = []
+
+    def fail():
+        config_set.append(schema._get_validation_config())
+        raise ValueError("error")
+
+    with schema.validation_config(cfg), pytest.raises(ValueError, match="error"):
+        fail()
+    with pytest.raises(ValueError, match="error"), schema.validation_config(cfg):
+        fail()
+    assert config_set == [cfg, cfg]
+
+    load = mocker.patch.object(config.ConfigFile, "load", return_value={})
+    assert schema._get_validation_config() is not cfg
+    assert load.called
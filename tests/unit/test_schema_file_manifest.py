@@ -0,0 +1,104 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import json
+
+import pytest
+
+from galaxy_importer import exceptions as exc
+from galaxy_importer import schema
+
+CHKSUM = "a" * 64
+FILES = [
+    {"name": ".", "ftype": "dir", "chksum_type": None, "chksum_sha256": None, "format": 1},
+    {"name": "plugins", "ftype": "dir", "chksum_type": None, "chksum_sha256": None, "format": 1},
+    {
+        "name": "plugins/a.py",
+        "ftype": "file",
+        "chksum_type": "sha256",
+        "chksum_sha256": CHKSUM,
+        "format": 1,
+    },
+    {
+        "name": "plugins/b.py",
+        "ftype": "file",
+        "chksum_type": "sha256",
+        "chksum_sha256": "NOT-A-DIGEST",
+        "format": 1,
+    },
+    {"name": "plugins/c.py", "ftype": "file", "chksum_type": "sha256", "chksum_sha256": None},
+]
+
+
+def test_file_manifest_parse():
+    file_manifest = schema.CollectionArtifactFileManifest.parse(
+        json.dumps({"files": FILES, "format": 1})
+    )
+    files = file_manifest.files
+    assert isinstance(files, schema.CollectionArtifactFileList)
+    assert len(files) == 5
+    assert files.names == ["."] + [f["name"] for f in FILES[1:]]
+    assert files[2] == schema.CollectionArtifactFile(
+        name="plugins/a.py", ftype="file", chksum_type="sha256", chksum_sha256=CHKSUM
+    )
+    assert files[-2].chksum_sha256 == "NOT-A-DIGEST"
+    assert files[4].chksum_sha256 is None
+    assert files[1].chksum_type is None
+    assert [f.name for f in files[1:3]] == ["plugins", "plugins/a.py"]
+    with pytest.raises(IndexError):
+        files[5]
+
+    assert files.get_file_chksums() == {
+        "plugins/a.py": CHKSUM,
+        "plugins/b.py": "NOT-A-DIGEST",
+        "plugins/c.py": None,
+    }
+
+
+def test_file_list_equality():
+    artifact_files = [
+        schema.CollectionArtifactFile(
+            name=f["name"],
+            ftype=f["ftype"],
+            chksum_type=f["chksum_type"],
+            chksum_sha256=f["chksum_sha256"],
+        )
+        for f in FILES
+    ]
+    files = schema.CollectionArtifactFileList(FILES)
+    assert files == artifact_files
+    assert files == schema.CollectionArtifactFileList(artifact_files)
+    assert files != artifact_files[:-1]
+    assert schema.CollectionArtifactFileManifest(files=FILES) == (
+        schema.CollectionArtifactFileManifest(files=artifact_files)
+    )
+
+
+def test_file_list_keeps_other_fields():
+    artifact_file = schema.CollectionArtifactFile(
+        name="a.py", ftype="file", src_name="src/a.py", chksum_sha256=CHKSUM.upper()
+    )
+    files = schema.CollectionArtifactFileList([artifact_file])
+    assert files[0] is artifact_file
+    assert not hasattr(files[0], "__dict__")
+
+
+@pytest.mark.parametrize("field", ["ftype", "chksum_type"])
+def test_file_list_unhashable_field(field):
+    files_json = json.dumps({"files": [{**FILES[2], field: ["file"]}], "format": 1})
+    with pytest.raises(exc.ManifestValidationError, match=r"plugins/a\.py"):
+        schema.CollectionArtifactFileManifest.parse(files_json)
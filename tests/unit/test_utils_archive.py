@@ -0,0 +1,243 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import errno
+import gzip
+import hashlib
+import io
+import os
+import tarfile
+
+import pytest
+
+from galaxy_importer.utils import archive
+
+
+def _build_tar(files, hardlinks=()):
+    fileobj = io.BytesIO()
+    with tarfile.open(fileobj=fileobj, mode="w") as tf:
+        for name, data in files:
+            tarinfo = tarfile.TarInfo(name)
+            tarinfo.size = len(data)
+            tarinfo.mode = 0o644
+            tf.addfile(tarinfo, io.BytesIO(data))
+        for name, linkname in hardlinks:
+            tarinfo = tarfile.TarInfo(name)
+            tarinfo.type = tarfile.LNKTYPE
+            tarinfo.linkname = linkname
+            tf.addfile(tarinfo)
+    return fileobj.getvalue()
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_inflate_reader(compress):
+    data = os.urandom(100000)
+    raw = gzip.compress(data) if compress else data
+    reader = archive.InflateReader(io.BytesIO(raw), read_size=1000, max_chunks=2)
+    chunks = []
+    for chunk in iter(lambda: reader.read(777), b""):
+        chunks.append(chunk)
+    reader.close()
+    assert b"".join(chunks) == data
+
+
+def test_inflate_reader_concatenated_gzip():
+    raw = gzip.compress(b"first ") + gzip.compress(b"second")
+    reader = archive.InflateReader(io.BytesIO(raw))
+    assert reader.read() == b"first second"
+    reader.close()
+
+
+def test_inflate_reader_error():
+    reader = archive.InflateReader(io.BytesIO(b"\x1f\x8b" + b"not gzip" * 10))
+    with pytest.raises(tarfile.ReadError, match="Could not read archive"):
+        reader.read()
+    reader.close()
+
+
+def test_inflate_reader_close_unblocks_producer():
+    reader = archive.InflateReader(io.BytesIO(os.urandom(100000)), read_size=100, max_chunks=1)
+    reader.read(10)
+    reader.close()
+    assert not reader._thread.is_alive()
+
+
+def test_pipelined_extractor(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "MAX_BUFFERED_FILE_SIZE", 10)
+    files = [("small.txt", b"small"), ("dir/large.bin", b"x" * 100), ("skip/me.txt", b"skip")]
+    raw = gzip.compress(_build_tar(files, hardlinks=[("dir/hardlink", "small.txt")]))
+
+    extractor = archive.PipelinedExtractor(
+        skip_member=lambda item: item.name.startswith("skip/"), writer_threads=2
+    )
+    members = extractor.extract(io.BytesIO(raw), str(tmp_path))
+
+    assert [m.name for m in members] == [
+        "small.txt",
+        "dir/large.bin",
+        "skip/me.txt",
+        "dir/hardlink",
+    ]
+    assert extractor.chksums == {name: hashlib.sha256(data).hexdigest() for name, data in files}
+    assert list(extractor.skipped_files) == ["skip/me.txt"]
+    assert (tmp_path / "small.txt").read_bytes() == b"small"
+    assert (tmp_path / "dir" / "large.bin").read_bytes() == b"x" * 100
+    assert (tmp_path / "dir" / "hardlink").read_bytes() == b"small"
+    assert not (tmp_path / "skip" / "me.txt").exists()
+    assert oct((tmp_path / "small.txt").stat().st_mode & 0o777) == oct(0o644)
+
+
+@pytest.mark.parametrize("large", [False, True])
+def test_pipelined_extractor_duplicate_member(tmp_path, monkeypatch, large):
+    monkeypatch.setattr(archive, "BATCH_MAX_FILES", 1)
+    monkeypatch.setattr(archive, "MAX_BUFFERED_FILE_SIZE", 10 if large else 1000)
+    files = [("dup.txt", b"first")]
+    files += [(f"other_{ix}.txt", b"other" * ix) for ix in range(20)]
+    files += [("./dup.txt", b"second" * 5)]
+
+    extractor = archive.PipelinedExtractor(writer_threads=4)
+    extractor.extract(io.BytesIO(_build_tar(files)), str(tmp_path))
+
+    assert (tmp_path / "dup.txt").read_bytes() == b"second" * 5
+    assert extractor.chksums["dup.txt"] == hashlib.sha256(b"second" * 5).hexdigest()
+
+
+def _add_member(tf, name, type_, mode=0o644, linkname="", data=b""):
+    tarinfo = tarfile.TarInfo(name)
+    tarinfo.type = type_
+    tarinfo.mode = mode
+    tarinfo.linkname = linkname
+    tarinfo.size = len(data)
+    tf.addfile(tarinfo, io.BytesIO(data))
+
+
+def test_pipelined_extractor_duplicate_link(tmp_path):
+    fileobj = io.BytesIO()
+    with tarfile.open(fileobj=fileobj, mode="w") as tf:
+        _add_member(tf, "a.txt", tarfile.REGTYPE, data=b"a")
+        _add_member(tf, "b.txt", tarfile.REGTYPE, data=b"b")
+        for target in ("a.txt", "b.txt"):
+            _add_member(tf, "sym", tarfile.SYMTYPE, linkname=target)
+            _add_member(tf, "hard", tarfile.LNKTYPE, linkname=target)
+
+    extractor = archive.PipelinedExtractor()
+    extractor.extract(io.BytesIO(fileobj.getvalue()), str(tmp_path))
+
+    assert os.readlink(tmp_path / "sym") == "b.txt"
+    assert (tmp_path / "hard").read_bytes() == b"b"
+
+
+def test_pipelined_extractor_directory_mode(tmp_path):
+    fileobj = io.BytesIO()
+    with tarfile.open(fileobj=fileobj, mode="w") as tf:
+        _add_member(tf, "odd", tarfile.DIRTYPE, mode=0o6777)
+        _add_member(tf, "odd/private", tarfile.DIRTYPE, mode=0o500)
+        _add_member(tf, "odd/private/a.txt", tarfile.REGTYPE, data=b"a")
+
+    extractor = archive.PipelinedExtractor()
+    extractor.extract(io.BytesIO(fileobj.getvalue()), str(tmp_path / "pipelined"))
+    fileobj.seek(0)
+    with tarfile.open(fileobj=fileobj) as tf:
+        kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+        tf.extractall(tmp_path / "extractall", **kwargs)
+
+    for name in ("odd", "odd/private"):
+        assert (tmp_path / "pipelined" / name).stat().st_mode == (
+            tmp_path / "extractall" / name
+        ).stat().st_mode
+    assert (tmp_path / "pipelined" / "odd/private/a.txt").read_bytes() == b"a"
+
+
+def test_pipelined_extractor_check_member(tmp_path):
+    def check_member(item):
+        if item.name == "bad":
+            raise ValueError("bad member")
+
+    raw = _build_tar([("good", b"good"), ("bad", b"bad")])
+    extractor = archive.PipelinedExtractor(check_member=check_member)
+    with pytest.raises(ValueError, match="bad member"):
+        extractor.extract(io.BytesIO(raw), str(tmp_path))
+    assert not (tmp_path / "bad").exists()
+
+
+def test_link_or_copy_hardlink(tmp_path):
+    src = tmp_path / "src.tar.gz"
+    src.write_bytes(b"artifact")
+    dst = tmp_path / "dst.tar.gz"
+    archive.link_or_copy(str(src), str(dst))
+    assert os.path.samefile(src, dst)
+
+
+def test_link_or_copy_fallback(tmp_path, mocker):
+    mocker.patch.object(archive.os, "link", side_effect=OSError(errno.EXDEV, "cross-device"))
+    src = tmp_path / "src.tar.gz"
+    src.write_bytes(b"artifact" * 1000)
+    dst = tmp_path / "dst.tar.gz"
+    archive.link_or_copy(str(src), str(dst))
+    assert not os.path.samefile(src, dst)
+    assert dst.read_bytes() == b"artifact" * 1000
+
+
+def test_copy_fileobj_without_fileno(tmp_path):
+    fileobj = io.BytesIO(b"artifact")
+    fileobj.read(3)
+    archive.copy_fileobj(fileobj, str(tmp_path / "dst"))
+    assert (tmp_path / "dst").read_bytes() == b"artifact"
+    assert fileobj.tell() == 0
+
+
+def test_copy_fileobj_sendfile_fallback(tmp_path, mocker):
+    mocker.patch.object(archive, "fcntl", None)
+    mocker.patch.object(
+        archive.os, "copy_file_range", side_effect=OSError(errno.EXDEV, "cross-device")
+    )
+    sendfile = mocker.spy(archive.os, "sendfile")
+    src = tmp_path / "src"
+    src.write_bytes(b"artifact" * 1000)
+    with open(src, "rb") as fileobj:
+        archive.copy_fileobj(fileobj, str(tmp_path / "dst"))
+    assert sendfile.called
+    assert (tmp_path / "dst").read_bytes() == b"artifact" * 1000
+
+
+def test_copy_fileobj_short_copy_file_range(tmp_path, mocker):
+    copy_file_range = os.copy_file_range
+    calls = []
+
+    def short_copy_file_range(src, dst, count, offset):
+        calls.append(offset)
+        return copy_file_range(src, dst, 100, offset) if len(calls) == 1 else 0
+
+    mocker.patch.object(archive, "fcntl", None)
+    mocker.patch.object(archive.os, "copy_file_range", side_effect=short_copy_file_range)
+    sendfile = mocker.spy(archive.os, "sendfile")
+    src = tmp_path / "src"
+    src.write_bytes(b"artifact" * 1000)
+    with open(src, "rb") as fileobj:
+        archive.copy_fileobj(fileobj, str(tmp_path / "dst"))
+    assert calls == [0, 100]
+    assert sendfile.called
+    assert (tmp_path / "dst").read_bytes() == b"artifact" * 1000
+
+
+def test_copy_fileobj_no_kernel_copy(tmp_path, mocker):
+    mocker.patch.object(archive, "_copy_fd", return_value=False)
+    src = tmp_path / "src"
+    src.write_bytes(b"artifact")
+    with open(src, "rb") as fileobj:
+        archive.copy_fileobj(fileobj, str(tmp_path / "dst"))
+    assert (tmp_path / "dst").read_bytes() == b"artifact"
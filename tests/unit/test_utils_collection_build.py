@@ -0,0 +1,158 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+import hashlib
+import json
+import os
+import tarfile
+
+import pytest
+
+from galaxy_importer import exceptions as exc
+from galaxy_importer.utils import collection_build
+
+GALAXY_YML = """
+namespace: my_namespace
+name: my_collection
+version: 1.0.0
+readme: README.md
+authors: Me
+license: GPL-3.0-or-later
+build_ignore:
+  - "*.log"
+  - docs/drafts
+"""
+
+
+@pytest.fixture
+def collection_path(tmp_path):
+    path = tmp_path / "src"
+    (path / "plugins/modules").mkdir(parents=True)
+    (path / "docs/drafts").mkdir(parents=True)
+    (path / "tests/output").mkdir(parents=True)
+    (path / "__pycache__").mkdir()
+    (path / "galaxy.yml").write_text(GALAXY_YML)
+    (path / "README.md").write_text("# my_collection\n")
+    (path / "plugins/modules/my_module.py").write_text("#!/usr/bin/python\n" * 1000)
+    (path / "plugins/modules/my_module.py").chmod(0o700)
+    (path / "plugins/modules/alias.py").symlink_to("my_module.py")
+    (path / "plugins/modules/my_module.pyc").write_bytes(b"pyc")
+    (path / "docs/drafts/draft.md").write_text("draft")
+    (path / "tests/output/result.txt").write_text("result")
+    (path / "__pycache__/x.pyc").write_bytes(b"pyc")
+    (path / "build.log").write_text("log")
+    (path / "my_namespace-my_collection-0.9.0.tar.gz").write_bytes(b"old")
+    return path
+
+
+def test_build_collection(collection_path, tmp_path):
+    built = collection_build.build_collection(str(collection_path), str(tmp_path))
+    assert built.filepath == str(tmp_path / "my_namespace-my_collection-1.0.0.tar.gz")
+
+    file_names = [f["name"] for f in built.file_manifest["files"]]
+    assert file_names == [
+        ".",
+        "README.md",
+        "docs",
+        "plugins",
+        "plugins/modules",
+        "plugins/modules/alias.py",
+        "plugins/modules/my_module.py",
+        "tests",
+    ]
+    module_data = (collection_path / "plugins/modules/my_module.py").read_bytes()
+    chksums = {f["name"]: f["chksum_sha256"] for f in built.file_manifest["files"]}
+    assert chksums["plugins/modules/my_module.py"] == hashlib.sha256(module_data).hexdigest()
+    assert chksums["plugins/modules/alias.py"] == chksums["plugins/modules/my_module.py"]
+    assert chksums["plugins"] is None
+
+    collection_info = built.manifest["collection_info"]
+    assert collection_info["authors"] == ["Me"]
+    assert collection_info["license"] == ["GPL-3.0-or-later"]
+    assert collection_info["tags"] == []
+    assert collection_info["dependencies"] == {}
+    assert "build_ignore" not in collection_info
+
+    with tarfile.open(built.filepath) as tf:
+        assert tf.getnames()[:2] == ["MANIFEST.json", "FILES.json"]
+        assert tf.getnames()[2:] == file_names[1:]
+        manifest = json.load(tf.extractfile("MANIFEST.json"))
+        files_json = tf.extractfile("FILES.json").read()
+        assert json.loads(files_json) == built.file_manifest
+        assert manifest["file_manifest_file"]["chksum_sha256"] == (
+            hashlib.sha256(files_json).hexdigest()
+        )
+        assert tf.extractfile("plugins/modules/my_module.py").read() == module_data
+
+        module = tf.getmember("plugins/modules/my_module.py")
+        assert module.mode == 0o755
+        assert (module.uid, module.uname) == (0, "")
+        assert tf.getmember("README.md").mode == 0o644
+        alias = tf.getmember("plugins/modules/alias.py")
+        assert alias.issym()
+        assert alias.linkname == "my_module.py"
+
+    with pytest.raises(exc.ImporterError, match=r"file .+ already exists"):
+        collection_build.build_collection(str(collection_path), str(tmp_path))
+
+
+def test_build_collection_link_outside(collection_path, tmp_path):
+    (tmp_path / "outside").mkdir()
+    (tmp_path / "outside/data.txt").write_text("outside")
+    (collection_path / "data.txt").symlink_to(tmp_path / "outside/data.txt")
+    (collection_path / "outside_dir").symlink_to(tmp_path / "outside")
+
+    built = collection_build.build_collection(str(collection_path), str(tmp_path))
+    file_names = [f["name"] for f in built.file_manifest["files"]]
+    assert "data.txt" in file_names
+    assert "outside_dir" not in file_names
+    with tarfile.open(built.filepath) as tf:
+        assert tf.getmember("data.txt").isfile()
+        assert tf.extractfile("data.txt").read() == b"outside"
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs os.mkfifo")
+def test_build_collection_special_files(collection_path, tmp_path):
+    (collection_path / "dangling.txt").symlink_to(tmp_path / "missing.txt")
+    os.mkfifo(collection_path / "fifo")
+
+    built = collection_build.build_collection(str(collection_path), str(tmp_path))
+    file_names = [f["name"] for f in built.file_manifest["files"]]
+    assert "dangling.txt" not in file_names
+    assert "fifo" not in file_names
+    with tarfile.open(built.filepath) as tf:
+        assert "fifo" not in tf.getnames()
+
+
+def test_build_collection_manifest_directives(collection_path, tmp_path):
+    (collection_path / "galaxy.yml").write_text(
+        GALAXY_YML.replace("build_ignore:", "manifest:\n  directives: []\nbuild_ignore:")
+    )
+    with pytest.raises(collection_build.UnsupportedBuildError):
+        collection_build.build_collection(str(collection_path), str(tmp_path))
+
+
+def test_load_galaxy_yml_errors(tmp_path):
+    with pytest.raises(exc.ImporterError, match=r"Could not find galaxy\.yml"):
+        collection_build.load_galaxy_yml(str(tmp_path))
+
+    (tmp_path / "galaxy.yml").write_text("namespace: my_namespace\nname: my_collection\n")
+    with pytest.raises(exc.ImporterError, match="missing the required keys: version, readme"):
+        collection_build.load_galaxy_yml(str(tmp_path))
+
+    (tmp_path / "galaxy.yml").write_text("- a list")
+    with pytest.raises(exc.ImporterError, match="yaml dictionary"):
+        collection_build.load_galaxy_yml(str(tmp_path))
@@ -0,0 +1,140 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+import hashlib
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from galaxy_importer import exceptions as exc
+from galaxy_importer.utils import http_reader
+
+ARTIFACT = bytes(range(256)) * 4096
+
+
+class _ArtifactHandler(BaseHTTPRequestHandler):
+    """Stand-in for artifact storage, serving ARTIFACT with Range support."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append(self.headers.get("Range"))
+        if self.server.statuses:
+            self.send_error(self.server.statuses.pop(0))
+            return
+
+        start = 0
+        match = re.match(r"bytes=(\d+)-$", self.headers.get("Range") or "")
+        if match and not self.server.ignore_range:
+            start = int(match.group(1))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(ARTIFACT) - 1}/{len(ARTIFACT)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(ARTIFACT) - start))
+        self.end_headers()
+
+        body = ARTIFACT[start:]
+        if self.server.drop_after:
+            # close the connection part way through the body
+            body = body[: self.server.drop_after.pop(0)]
+            self.close_connection = True
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def artifact_server(monkeypatch):
+    monkeypatch.setattr(http_reader, "RETRY_DELAY_SECONDS", 0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ArtifactHandler)
+    server.requests = []
+    server.statuses = []
+    server.drop_after = []
+    server.ignore_range = False
+    host, port = server.server_address
+    server.url = f"http://{host}:{port}/my_namespace-my_collection-1.0.0.tar.gz"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _read_all(reader, size=100000):
+    return b"".join(iter(lambda: reader.read(size), b""))
+
+
+def test_read(artifact_server):
+    with http_reader.HttpArtifactReader(artifact_server.url) as reader:
+        assert not reader.seekable()
+        assert reader.size == len(ARTIFACT)
+        assert _read_all(reader) == ARTIFACT
+        assert reader.read(10) == b""
+    assert reader.sha256 == hashlib.sha256(ARTIFACT).hexdigest()
+    assert artifact_server.requests == [None]
+
+
+def test_read_resumes_with_range(artifact_server):
+    artifact_server.drop_after = [300000, 200000]
+    with http_reader.HttpArtifactReader(artifact_server.url) as reader:
+        assert _read_all(reader) == ARTIFACT
+    assert reader.sha256 == hashlib.sha256(ARTIFACT).hexdigest()
+    assert artifact_server.requests[0] is None
+    assert artifact_server.requests[1].startswith("bytes=")
+    assert len(artifact_server.requests) == 3
+
+
+def test_read_range_ignored(artifact_server):
+    artifact_server.drop_after = [300000]
+    artifact_server.ignore_range = True
+    with http_reader.HttpArtifactReader(artifact_server.url) as reader:
+        assert _read_all(reader, 4096) == ARTIFACT
+    assert reader.sha256 == hashlib.sha256(ARTIFACT).hexdigest()
+
+
+def test_read_retries_status(artifact_server):
+    artifact_server.statuses = [503, 502]
+    with http_reader.HttpArtifactReader(artifact_server.url) as reader:
+        assert _read_all(reader) == ARTIFACT
+    assert len(artifact_server.requests) == 3
+
+
+def test_read_errors(artifact_server):
+    artifact_server.statuses = [404]
+    with pytest.raises(exc.ImporterError, match="HTTP 404"):
+        http_reader.HttpArtifactReader(artifact_server.url).read(10)
+    assert len(artifact_server.requests) == 1
+
+    artifact_server.drop_after = [1000] * 3
+    reader = http_reader.HttpArtifactReader(artifact_server.url, max_retries=2)
+    with pytest.raises(exc.ImporterError, match="Could not download"):
+        _read_all(reader)
+
+
+def test_fetcher(mocker):
+    response = mocker.Mock(status_code=200, headers={})
+    response.iter_content.return_value = iter([b"abc", b"def"])
+    fetcher = mocker.Mock(return_value=response)
+
+    reader = http_reader.HttpArtifactReader("https://example.com/a.tar.gz", fetcher=fetcher)
+    assert reader.size is None
+    assert reader.read() == b"abcdef"
+    fetcher.assert_called_once_with("https://example.com/a.tar.gz", {})
+    assert response.close.called
@@ -0,0 +1,65 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+import io
+import json
+
+import pytest
+
+from galaxy_importer.utils import json_stream
+
+DOCUMENT = """ {
+    "my_ns.my_col.a": {"doc": {"options": {"state": {"choices": ["present", "absent"]}}}},
+    "my_ns.my_col.b" : {"doc": null, "version": 12345678, "ratio": -1.5e+10},
+    "my_ns.my_col.c":{"description": "h\\u00e9 中 \U0001f600", "flags": [true, false]}
+}
+"""
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 7, 64, json_stream.READ_SIZE])
+def test_iter_object_items(read_size):
+    items = json_stream.iter_object_items(io.BytesIO(DOCUMENT.encode()), read_size=read_size)
+    assert list(items) == list(json.loads(DOCUMENT).items())
+
+
+def test_iter_object_items_empty():
+    assert list(json_stream.iter_object_items(io.BytesIO(b" {\n} "))) == []
+
+
+def test_iter_object_items_reads_incrementally():
+    document = json.dumps({f"plugin_{ix}": {"doc": list(range(100))} for ix in range(100)})
+    fileobj = io.BytesIO(document.encode())
+    items = json_stream.iter_object_items(fileobj, read_size=1024)
+    assert next(items) == ("plugin_0", {"doc": list(range(100))})
+    assert fileobj.tell() < len(document) / 10
+
+
+@pytest.mark.parametrize(
+    ("document", "error"),
+    [
+        ("", "Expecting '{'"),
+        ("[]", "Expecting '{'"),
+        ('{"a": 1', "Expecting ',' or '}'"),
+        ('{"a" 1}', "Expecting ':'"),
+        ("{1: 2}", "Expecting property name"),
+        ('{"a": 1,}', "Expecting value"),
+        ('{"a": 1.x}', "Expecting ',' or '}'"),
+        ('{"a": 1} {}', "Extra data"),
+    ],
+)
+def test_iter_object_items_errors(document, error):
+    with pytest.raises(json.JSONDecodeError, match=error):
+        list(json_stream.iter_object_items(io.BytesIO(document.encode()), read_size=2))
@@ -0,0 +1,111 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+import errno
+import io
+import json
+import os
+
+from galaxy_importer import config
+from galaxy_importer.collection import CollectionFilename
+from galaxy_importer.utils import result_cache
+
+
+def test_get_result_cache(tmp_path):
+    assert result_cache.get_result_cache(config.Config()) is None
+
+    cfg = config.Config(config_data={"result_cache_dir": str(tmp_path / "cache")})
+    cache = result_cache.get_result_cache(cfg)
+    assert cache.path == str(tmp_path / "cache")
+    assert os.path.isdir(cache.path)
+
+
+def test_get_cache_key(mocker):
+    cfg = config.Config()
+    filename = CollectionFilename("my_namespace", "my_collection", "1.0.0")
+    artifact = io.BytesIO(b"artifact")
+    key = result_cache.get_cache_key(artifact, filename, cfg)
+    assert artifact.tell() == 0
+    assert key == result_cache.get_cache_key(io.BytesIO(b"artifact"), filename, cfg)
+
+    assert key != result_cache.get_cache_key(io.BytesIO(b"other"), filename, cfg)
+    assert key != result_cache.get_cache_key(io.BytesIO(b"artifact"), None, cfg)
+    lint_off = config.Config(config_data={"run_ansible_lint": False})
+    assert key != result_cache.get_cache_key(io.BytesIO(b"artifact"), filename, lint_off)
+    log_level = config.Config(config_data={"log_level_main": "DEBUG"})
+    assert key == result_cache.get_cache_key(io.BytesIO(b"artifact"), filename, log_level)
+
+    mocker.patch.object(result_cache, "get_version_from_metadata", return_value="0.0.1")
+    assert key != result_cache.get_cache_key(io.BytesIO(b"artifact"), filename, cfg)
+
+
+def test_result_cache_get_set(tmp_path):
+    cache = result_cache.DirectoryResultCache(str(tmp_path), max_size=1024)
+    assert cache.get("abc") is None
+
+    cache.set("abc", {"metadata": {"name": "my_collection"}})
+    assert cache.get("abc") == {"metadata": {"name": "my_collection"}}
+    assert os.listdir(tmp_path) == ["abc.json"]
+
+
+def test_result_cache_unreadable_entry(tmp_path, caplog):
+    (tmp_path / "abc.json").write_text("{")
+    cache = result_cache.DirectoryResultCache(str(tmp_path), max_size=1024)
+    assert cache.get("abc") is None
+    assert "Ignoring unreadable import result cache entry" in caplog.text
+
+
+def test_result_cache_set_roundtrips_result(tmp_path):
+    cache = result_cache.DirectoryResultCache(str(tmp_path), max_size=1024)
+    stored = cache.set("abc", {"tags": ("a", "b"), "counts": {1: 2}})
+    assert stored == {"tags": ["a", "b"], "counts": {"1": 2}}
+    assert cache.get("abc") == stored
+
+
+def test_result_cache_failed_write(tmp_path, caplog):
+    cache = result_cache.DirectoryResultCache(str(tmp_path), max_size=1024)
+    cache.set("abc", {"version": 1})
+    result = {"not_json": object()}
+    assert cache.set("abc", result) is result
+    assert "Not caching import result that is not JSON serializable" in caplog.text
+    assert cache.get("abc") == {"version": 1}
+    assert os.listdir(tmp_path) == ["abc.json"]
+
+
+def test_result_cache_failed_write_os_error(tmp_path, mocker, caplog):
+    cache = result_cache.DirectoryResultCache(str(tmp_path), max_size=1024)
+    mocker.patch.object(
+        result_cache.os, "replace", side_effect=OSError(errno.ENOSPC, "No space left on device")
+    )
+    result = {"version": 1}
+    assert cache.set("abc", result) is result
+    assert "Could not write import result cache entry" in caplog.text
+    assert os.listdir(tmp_path) == []
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    result = {"data": "x" * 100}
+    entry_size = len(json.dumps(result))
+    cache = result_cache.DirectoryResultCache(str(tmp_path), max_size=entry_size * 2)
+    cache.set("a", result)
+    cache.set("b", result)
+    os.utime(tmp_path / "a.json", ns=(1, 1))
+    os.utime(tmp_path / "b.json", ns=(2, 2))
+
+    # reading "a" makes "b" the least recently used
+    assert cache.get("a") == result
+    cache.set("c", result)
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json"]
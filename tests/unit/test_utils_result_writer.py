@@ -0,0 +1,93 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+import gzip
+import io
+import json
+
+import attr
+import pytest
+
+from galaxy_importer import constants, schema
+from galaxy_importer import exceptions as exc
+from galaxy_importer.utils import result_writer
+
+
+@pytest.fixture
+def import_result():
+    return schema.ImportResult(
+        metadata=schema.CollectionInfo(
+            namespace="my_namespace",
+            name="my_collection",
+            version="1.0.0",
+            license=["MIT"],
+            authors=["Me"],
+            repository="https://example.com/my_collection",
+            readme="README.md",
+        ),
+        docs_blob={"collection_readme": {"html": "<h1>my_collection</h1>"}},
+        contents=[
+            schema.ResultContentItem(
+                name="my_module",
+                content_type=constants.ContentType.MODULE,
+                description="A module with ünïcode",
+            )
+        ],
+        requires_ansible=">=2.14",
+    )
+
+
+@pytest.mark.parametrize("indent", [None, 4])
+def test_write_result(import_result, indent, monkeypatch):
+    monkeypatch.setattr(result_writer, "WRITE_SIZE", 10)
+    stream = io.StringIO()
+    result_writer.write_result(import_result, stream, indent=indent)
+
+    expected = attr.asdict(import_result)
+    assert json.loads(stream.getvalue()) == json.loads(json.dumps(expected))
+    if indent:
+        assert stream.getvalue() == json.dumps(expected, indent=4)
+    else:
+        assert stream.getvalue() == json.dumps(expected, separators=(",", ":"))
+
+
+def test_write_result_streams(import_result):
+    streams = [io.StringIO(), io.StringIO()]
+    result_writer.write_result(attr.asdict(import_result), *streams, indent=4)
+    assert streams[0].getvalue() == streams[1].getvalue()
+    assert json.loads(streams[0].getvalue())["metadata"]["name"] == "my_collection"
+
+
+def test_write_result_not_serializable():
+    with pytest.raises(TypeError, match="Object of type object is not JSON serializable"):
+        result_writer.write_result({"a": object()}, io.StringIO())
+
+
+def test_open_result_file(import_result, tmp_path):
+    path = tmp_path / "importer_result.json.gz"
+    with result_writer.open_result_file(str(path), "gzip") as f:
+        result_writer.write_result(import_result, f)
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert json.load(f)["contents"][0]["description"] == "A module with ünïcode"
+
+    with pytest.raises(ValueError, match="Unknown compression"):
+        result_writer.open_result_file(str(path), "lzma")
+
+
+def test_open_result_file_zstd_missing(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_writer, "zstandard", None)
+    with pytest.raises(exc.ImporterError, match="requires the zstandard package"):
+        result_writer.open_result_file(str(tmp_path / "importer_result.json.zst"), "zstd")
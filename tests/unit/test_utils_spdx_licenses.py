@@ -0,0 +1,47 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+import json
+from importlib.resources import files
+
+import pytest
+
+from galaxy_importer.utils import spdx_licenses
+from galaxy_importer.utils.spdx_license_ids import VALID_LICENSE_IDS
+
+
+@pytest.mark.parametrize(
+    ("license_id", "valid"),
+    [
+        ("MIT", True),
+        ("GPL-3.0-or-later", True),
+        ("GPL-3.0", False),
+        ("mit", False),
+        ("", False),
+        (None, False),
+    ],
+)
+def test_is_valid_license_id(license_id, valid):
+    assert spdx_licenses.is_valid_license_id(license_id) is valid
+
+
+def test_license_ids_match_licenses_json():
+    with (files("galaxy_importer.utils") / "spdx_licenses.json").open("rb") as f:
+        licenses = json.load(f)
+    valid_license_ids = {
+        license_id for license_id, info in licenses.items() if not info["deprecated"]
+    }
+    assert valid_license_ids == VALID_LICENSE_IDS
@@ -0,0 +1,120 @@
+# (c) 2012-2026, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+import pytest
+
+from galaxy_importer import schema
+from galaxy_importer.utils import tool_output
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        (
+            "playbooks/site.yml:2:9: name[casing][/]: All names should start with an uppercase"
+            " letter.",
+            schema.Finding(
+                rule="name[casing]",
+                path="playbooks/site.yml",
+                line=2,
+                severity="error",
+                message="All names should start with an uppercase letter.",
+            ),
+        ),
+        (
+            "roles/a/tasks/main.yml:8:15: jinja[spacing]: Jinja2 spacing could be improved:"
+            " {{x}} -> {{ x }} (warning)",
+            schema.Finding(
+                rule="jinja[spacing]",
+                path="roles/a/tasks/main.yml",
+                line=8,
+                severity="warning",
+                message="Jinja2 spacing could be improved: {{x}} -> {{ x }}",
+            ),
+        ),
+        (
+            "playbooks/site.yml:9: no-changed-when: Commands should not change things.",
+            schema.Finding(
+                rule="no-changed-when",
+                path="playbooks/site.yml",
+                line=9,
+                severity="error",
+                message="Commands should not change things.",
+            ),
+        ),
+        ("some ansible-lint violation output", None),
+        ("", None),
+    ],
+)
+def test_parse_ansible_lint_line(line, expected):
+    assert tool_output.parse_ansible_lint_line(line) == expected
+
+
+def test_ansible_test_output_parser():
+    parser = tool_output.AnsibleTestOutputParser()
+    lines = [
+        "ERROR: plugins/modules/a.py:1:1: E302: before any test",
+        'Running sanity test "pep8"',
+        "\x1b[91mERROR: plugins/modules/a.py:12:1: E302: expected 2 blank lines\x1b[0m",
+        "ERROR: Found 1 pep8 issue(s) which need to be resolved:",
+        "Running sanity test 'validate-modules' with Python 3.11",
+        "WARNING: plugins/modules/a.py:0:0: missing-gplv3-license: GPLv3 license not found",
+    ]
+    results = [parser.feed(line) for line in lines]
+
+    assert [f.rule for f in results if f] == [
+        "E302",
+        "pep8:E302",
+        "validate-modules:missing-gplv3-license",
+    ]
+    assert results[1] is None
+    assert results[3] is None
+    assert parser.findings == [f for f in results if f]
+    assert parser.findings[1] == schema.Finding(
+        rule="pep8:E302",
+        path="plugins/modules/a.py",
+        line=12,
+        severity="error",
+        message="expected 2 blank lines",
+    )
+    assert parser.findings[2].severity == "warning"
+
+
+def test_build_report():
+    findings = [
+        schema.Finding(rule="a", severity="warning"),
+        schema.Finding(rule="b"),
+        schema.Finding(rule="b"),
+    ]
+    report = tool_output.build_report(findings)
+    assert report.findings == findings
+    assert report.summary == {
+        "total": 3,
+        "severity": {"warning": 1, "error": 2},
+        "rule": {"b": 2, "a": 1},
+    }
+    assert list(report.summary["rule"]) == ["b", "a"]
+
+
+def test_format_summary():
+    findings = [schema.Finding(rule=f"rule-{i}") for i in range(3)]
+    report = tool_output.build_report(findings + findings[:1])
+    assert tool_output.format_summary("ansible-lint", report) == (
+        "ansible-lint reported 4 finding(s): rule-0 (2), rule-1 (1), rule-2 (1)"
+    )
+    assert tool_output.format_summary("ansible-lint", report, max_rules=1) == (
+        "ansible-lint reported 4 finding(s): rule-0 (2), and 2 more rules"
+    )